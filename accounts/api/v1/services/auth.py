@@ -1,14 +1,76 @@
+import uuid
 
 from ninja.security import HttpBearer
 from ninja.errors import  HttpError
 import jwt
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.core.cache import cache as shared_cache
 
+from accounts.api.v1.utils.cache import TwoTierCache, MISSING
 from accounts.api.v1.utils.exceptions import UnauthorizedError
 
+import logging
+logger = logging.getLogger("api")
+
 User = get_user_model()
 
+# Authenticated principals keyed by (user_id, version). The version stamp lives
+# in the shared cache only and is replaced whenever the user row changes, so a
+# deactivation or tenant move invalidates every worker's copy on the next request.
+principal_cache = TwoTierCache(
+    "jwt-principal",
+    maxsize=getattr(settings, "JWT_PRINCIPAL_CACHE_MAXSIZE", 4096),
+    local_ttl=getattr(settings, "JWT_PRINCIPAL_CACHE_LOCAL_TTL", 30),
+    shared_ttl=getattr(settings, "JWT_PRINCIPAL_CACHE_TTL", 600),
+)
+
+def _version_key(user_id) -> str:
+    return f"jwt-principal-version:{user_id}"
+
+def get_user_version(user_id) -> str:
+    """Current version stamp for `user_id`, minted on first use."""
+    key = _version_key(user_id)
+    version = shared_cache.get(key)
+    if version is None:
+        shared_cache.add(key, uuid.uuid4().hex, None)
+        version = shared_cache.get(key)
+    return version
+
+def bump_user_version(*user_ids) -> None:
+    """Invalidate every cached principal of `user_ids`. Never raises: user saves must not depend on the cache."""
+    if not user_ids:
+        return
+    try:
+        shared_cache.set_many({_version_key(user_id): uuid.uuid4().hex for user_id in user_ids}, None)
+    except Exception as e:
+        logger.warning(f"Principal version bump failed for users {list(user_ids)}: {e}")
+
+def load_principal(user_id):
+    """
+    Return the user for `user_id`, served from the principal cache when the
+    version stamp still matches. Raises User.DoesNotExist for unknown ids.
+    """
+    try:
+        key = (user_id, get_user_version(user_id))
+    except Exception as e:
+        logger.warning(f"Principal version lookup failed for user {user_id}: {e}")
+        return User.objects.select_related("tenant").get(id=user_id)
+
+    user = principal_cache.get(key)
+    if user is not MISSING:
+        return user
+
+    user = User.objects.select_related("tenant").get(id=user_id)
+    principal_cache.set(key, user)
+    return user
+
+def get_principal_cache_stats() -> dict:
+    stats = dict(principal_cache.stats)
+    lookups = sum(stats.values())
+    stats["hit_ratio"] = round((stats["local_hits"] + stats["shared_hits"]) / lookups, 4) if lookups else None
+    return stats
+
 class JWTAuth(HttpBearer):
     def authenticate(self, request, token):
         try:
@@ -17,13 +79,15 @@ class JWTAuth(HttpBearer):
             if not user_id:
                 return UnauthorizedError("Missing user_id in token")
             try:
-                user = User.objects.get(id=user_id)
+                user = load_principal(user_id)
             except User.DoesNotExist:
                 return HttpError(401, "Invalid user")
+            if not user.is_active:
+                raise HttpError(401, "User is inactive")
             request.user = user  # Attach to request (like Django/DRF)
             request.jwt_payload = payload  # Optional: add the payload
             return user
         except jwt.ExpiredSignatureError:
             raise HttpError(401, "Token expired")
         except jwt.InvalidTokenError:
-            raise HttpError(401, "Invalid token")
\ No newline at end of file
+            raise HttpError(401, "Invalid token")
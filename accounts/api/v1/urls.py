@@ -3,11 +3,14 @@
 from django.urls import path
 from ninja import NinjaAPI
 from accounts.api.v1.utils.exceptions import register_custom_exception_handlers
+from accounts.api.v1.utils.renderers import FastJSONRenderer
 from accounts.api.v1.views.login import router as login_api
+from accounts.api.v1.views.cache import router as cache_api
 
-api = NinjaAPI(title="Accounts Main API", version="1.0", urls_namespace="accounts_api")
+api = NinjaAPI(title="Accounts Main API", version="1.0", urls_namespace="accounts_api", renderer=FastJSONRenderer())
 
 api.add_router("/login/", login_api)
+api.add_router("/cache/", cache_api)
 
 register_custom_exception_handlers(api)
 urlpatterns = [
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable
+
+from django.core.cache import cache as shared_cache
+
+import logging
+logger = logging.getLogger("api")
+
+MISSING = object()
+
+
+class TwoTierCache:
+    """
+    Process-local LRU in front of the shared Django cache.
+
+    The local tier answers warm lookups without any network or DB round-trip;
+    its short TTL bounds how long another process' invalidation can go unseen.
+    The shared tier (``django.core.cache``) survives across workers.
+    `None` is a valid cached value, use `MISSING` to detect a miss.
+    """
+
+    def __init__(self, prefix: str, maxsize: int = 2048, local_ttl: float = 5, shared_ttl: int = 300):
+        self.prefix = prefix
+        self.maxsize = maxsize
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"local_hits": 0, "shared_hits": 0, "misses": 0}
+
+    def _key(self, key) -> str:
+        if isinstance(key, (tuple, list)):
+            key = ":".join(str(k) for k in key)
+        return f"{self.prefix}:{key}"
+
+    def _get_local(self, full_key: str) -> Any:
+        with self._lock:
+            entry = self._local.get(full_key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._local[full_key]
+                return MISSING
+            self._local.move_to_end(full_key)
+            return value
+
+    def _set_local(self, full_key: str, value: Any) -> None:
+        with self._lock:
+            self._local[full_key] = (value, time.monotonic() + self.local_ttl)
+            self._local.move_to_end(full_key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def get(self, key) -> Any:
+        full_key = self._key(key)
+        value = self._get_local(full_key)
+        if value is not MISSING:
+            self.stats["local_hits"] += 1
+            return value
+        try:
+            value = shared_cache.get(full_key, MISSING)
+        except Exception as e:
+            # A broken shared cache must never take the API down with it
+            logger.warning(f"Shared cache read failed for {full_key}: {e}")
+            value = MISSING
+        if value is MISSING:
+            self.stats["misses"] += 1
+            return MISSING
+        self.stats["shared_hits"] += 1
+        self._set_local(full_key, value)
+        return value
+
+    def set(self, key, value: Any) -> None:
+        full_key = self._key(key)
+        self._set_local(full_key, value)
+        try:
+            shared_cache.set(full_key, value, self.shared_ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {full_key}: {e}")
+
+    def set_many(self, mapping: Dict[Any, Any]) -> None:
+        data = {self._key(k): v for k, v in mapping.items()}
+        for full_key, value in data.items():
+            self._set_local(full_key, value)
+        try:
+            shared_cache.set_many(data, self.shared_ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {self.prefix}: {e}")
+
+    def delete(self, *keys) -> None:
+        full_keys = [self._key(k) for k in keys]
+        with self._lock:
+            for full_key in full_keys:
+                self._local.pop(full_key, None)
+        try:
+            shared_cache.delete_many(full_keys)
+        except Exception as e:
+            logger.warning(f"Shared cache delete failed for {self.prefix}: {e}")
+
+    def delete_many(self, keys: Iterable) -> None:
+        self.delete(*keys)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
@@ -1,6 +1,8 @@
-from ninja.responses import Response
+from django.http import JsonResponse
 from starlette.status import HTTP_200_OK
 
+from accounts.api.v1.utils.renderers import FastJSONEncoder, prepare
+
 def api_response(
     data=None,
     message=None,
@@ -19,10 +21,13 @@ def api_response(
     if meta is not None:
         response_data["meta"] = meta
 
-    return Response(
-        {
+    # Same bytes as ninja's Response, with models dumped in batches up front
+    return JsonResponse(
+        prepare({
             "success": success,
             **response_data
-        },
+        }),
+        encoder=FastJSONEncoder,
+        safe=False,
         status=status_code
     )
@@ -0,0 +1,19 @@
+from ninja import Router
+from ninja.errors import HttpError
+
+from accounts.api.v1.services.auth import JWTAuth, get_principal_cache_stats
+from ..utils.response import api_response
+
+router = Router(tags=["Cache"])
+auth = JWTAuth()
+
+
+@router.get("/stats", auth=auth)
+def cache_stats(request):
+    """Per-process hit/miss counters of the JWT principal cache (staff only)."""
+    if not request.user.is_staff:
+        raise HttpError(403, "Staff access required.")
+    return api_response(
+        data={"jwt_principal": get_principal_cache_stats()},
+        message="Cache stats fetched"
+    )
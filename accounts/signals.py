@@ -0,0 +1,25 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.api.v1.services.auth import bump_user_version
+from accounts.models import CustomUser, Tenant
+
+# Any change to the user row (is_active, tenant, ...) must reach every
+# cached JWT principal immediately. The bump waits for the commit: bumped
+# earlier, a concurrent authentication could cache the old row under the
+# new stamp.
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def _invalidate_principal(sender, instance, **kwargs):
+    transaction.on_commit(partial(bump_user_version, instance.pk))
+
+# Principals carry their tenant; refresh them when it is renamed
+@receiver(post_save, sender=Tenant)
+def _invalidate_tenant_principals(sender, instance, created, **kwargs):
+    if created:
+        return
+    user_ids = list(CustomUser.objects.filter(tenant=instance).values_list("pk", flat=True))
+    transaction.on_commit(partial(bump_user_version, *user_ids))
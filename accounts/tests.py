@@ -1,3 +1,82 @@
-from django.test import TestCase
+import datetime
+import decimal
+import json
+import uuid
+from typing import List, Optional
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from ninja import Schema
+from ninja.responses import NinjaJSONEncoder
+
+from accounts.api.v1.services.auth import get_user_version
+from accounts.api.v1.utils.renderers import dumps
+from accounts.api.v1.utils.response import api_response
+from accounts.models import CustomUser, Tenant
+
+
+class PrincipalVersionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        cls.user = CustomUser.objects.create_user("dev@acme.test", "dev", "pw", tenant=cls.tenant)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_deactivation_bumps_the_version_after_commit(self):
+        before = get_user_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            self.assertEqual(get_user_version(self.user.pk), before)
+        self.assertNotEqual(get_user_version(self.user.pk), before)
+
+    def test_user_saves_survive_a_cache_outage(self):
+        with mock.patch("accounts.api.v1.services.auth.shared_cache.set_many", side_effect=ConnectionError):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.name = "Dev"
+                self.user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, "Dev")
+
+
+class _Owner(Schema):
+    id: int
+    email: str
+
+
+class _Row(Schema):
+    id: uuid.UUID
+    amount: decimal.Decimal
+    due: Optional[datetime.date] = None
+    at: datetime.datetime
+    owner: Optional[_Owner] = None
+    tags: List[str] = []
+
+
+class FastJSONTests(SimpleTestCase):
+    def payload(self):
+        utc = datetime.timezone.utc
+        rows = [
+            _Row(id=uuid.uuid4(), amount=decimal.Decimal("1.50"), at=datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=utc),
+                 owner=_Owner(id=1, email="dev@acme.test"), tags=["a"]),
+            _Row(id=uuid.uuid4(), amount=decimal.Decimal("0"), due=datetime.date(2026, 2, 1),
+                 at=datetime.datetime(2026, 1, 2, tzinfo=datetime.timezone(datetime.timedelta(hours=5, minutes=45)))),
+        ]
+        return {
+            "data": rows,
+            "mixed": [rows[0], _Owner(id=2, email="ops@acme.test"), {"nested": rows[1]}],
+            "meta": {"when": datetime.time(9, 30), "took": datetime.timedelta(seconds=3), "empty": []},
+        }
+
+    def test_output_is_byte_identical_to_the_ninja_encoder(self):
+        payload = self.payload()
+        self.assertEqual(dumps(payload), json.dumps(payload, cls=NinjaJSONEncoder))
+
+    def test_api_response_renders_models_like_ninja(self):
+        payload = self.payload()
+        response = api_response(data=payload["data"], message="ok", meta=payload["meta"])
+        expected = {"success": True, "data": payload["data"], "message": "ok", "meta": payload["meta"]}
+        self.assertEqual(response.content.decode(), json.dumps(expected, cls=NinjaJSONEncoder))
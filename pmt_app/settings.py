@@ -13,6 +13,7 @@ import os
 from pathlib import Path
 
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from decouple import config, Csv
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'daphne',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'channels',
     'corsheaders',
     'tinymce',
@@ -66,6 +68,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'accounts.middleware.current_user.CurrentUserMiddleware',
+    'projects.middleware.audit_buffer.AuditBufferMiddleware',
 ]
 
 ROOT_URLCONF = 'pmt_app.urls'
@@ -178,15 +181,65 @@ LOGIN_REDIRECT_URL = 'invoices_home'
 LOGOUT_REDIRECT_URL = 'invoices_home'
 
 # Redis
+# Shared by every worker: invalidating cached principals, permission snapshots
+# and version stamps only reaches other processes through it. REDIS_URL= (empty)
+# falls back to per-process memory, which is allowed with DEBUG only.
+REDIS_URL = config('REDIS_URL', default='redis://127.0.0.1:6379/0')
+if not REDIS_URL and not DEBUG:
+    raise ImproperlyConfigured("REDIS_URL is required when DEBUG is off: caches must be shared by all workers.")
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
         "CONFIG": {
-            "hosts": [("127.0.0.1", 6379)],
+            "hosts": [REDIS_URL or ("127.0.0.1", 6379)],
         },
     },
 }
 
+# Cache
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'pmt',
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'pmt-default',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# API response cache: fresh for RESPONSE_CACHE_TTL seconds, then served stale
+# (and refreshed in the background) for up to RESPONSE_CACHE_STALE_TTL more
+RESPONSE_CACHE_TTL = config('RESPONSE_CACHE_TTL', default=30, cast=int)
+RESPONSE_CACHE_STALE_TTL = config('RESPONSE_CACHE_STALE_TTL', default=300, cast=int)
+
+# List endpoints read pages through the ORM and validate them into their schemas; with
+# FAST_READ_VALUES, pages whose schema maps onto plain columns are read with .values() instead
+FAST_READ_VALUES = config('FAST_READ_VALUES', default=False, cast=bool)
+
+# Activity log entries are written once per request after commit; with AUDIT_LOG_ASYNC a
+# background thread writes them, holding at most AUDIT_LOG_QUEUE_SIZE pending batches
+AUDIT_LOG_ASYNC = config('AUDIT_LOG_ASYNC', default=False, cast=bool)
+AUDIT_LOG_QUEUE_SIZE = config('AUDIT_LOG_QUEUE_SIZE', default=1000, cast=int)
+
+# Activity log lifecycle (manage.py rollover_activity_logs): entries move to the archive table
+# after ACTIVITY_LOG_HOT_DAYS, archived update diffs are compacted after
+# ACTIVITY_LOG_COMPACT_AFTER_DAYS and deleted after ACTIVITY_LOG_RETENTION_DAYS (0: never)
+ACTIVITY_LOG_HOT_DAYS = config('ACTIVITY_LOG_HOT_DAYS', default=90, cast=int)
+ACTIVITY_LOG_COMPACT_AFTER_DAYS = config('ACTIVITY_LOG_COMPACT_AFTER_DAYS', default=365, cast=int)
+ACTIVITY_LOG_RETENTION_DAYS = config('ACTIVITY_LOG_RETENTION_DAYS', default=0, cast=int)
+# manage.py checkpoint_activity snapshots objects with at least this many entries since their
+# last checkpoint, which bounds the diffs replayed to reconstruct their history
+ACTIVITY_CHECKPOINT_INTERVAL = config('ACTIVITY_CHECKPOINT_INTERVAL', default=50, cast=int)
+
 
 # logging
 
@@ -1,8 +1,10 @@
 from django.contrib import admin
+from django.contrib.postgres.search import SearchQuery
+from projects.api.v1.services.search import SEARCH_CONFIG
 from .models import (
     Project, ProjectMember,
     Board, Sprint, Label,
-    Task, Comment, ActivityLog
+    Task, Comment, ActivityLog, ActivityLogArchive, ActivityCheckpoint
 )
 
 # --------------------------
@@ -61,6 +63,12 @@ class TaskAdmin(admin.ModelAdmin):
 
     filter_horizontal = ('labels',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the GIN-indexed search vector instead of icontains scans
+        if not search_term:
+            return queryset, False
+        return queryset.filter(search_vector=SearchQuery(search_term, search_type="websearch", config=SEARCH_CONFIG)), False
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -82,3 +90,24 @@ class ActivityLogAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     list_per_page = 20
     list_select_related = ('actor', 'project')
+
+
+@admin.register(ActivityLogArchive)
+class ActivityLogArchiveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'actor', 'action', 'target_type', 'merged_count', 'created_at')
+    list_display_links = ('id', 'actor', 'action')
+    search_fields = ('actor__email', 'action', 'target_type')
+    list_filter = ('action', 'target_type')
+    ordering = ('-created_at',)
+    list_per_page = 20
+    list_select_related = ('actor', 'project')
+    show_full_result_count = False  # COUNT(*) over the archive is the slow part of the changelist
+
+
+@admin.register(ActivityCheckpoint)
+class ActivityCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('id', 'target_content_type', 'target_object_id', 'project', 'taken_at')
+    list_filter = ('target_content_type',)
+    ordering = ('-taken_at',)
+    list_per_page = 20
+    list_select_related = ('target_content_type', 'project')
@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Any, Optional, List, Dict
 from ninja import Schema
 from datetime import datetime, date
 
@@ -100,6 +100,33 @@ class SprintOut(Schema):
     created_at: datetime
     updated_at: datetime
 
+class SprintBurnPointOut(Schema):
+    date: date
+    total_points: int
+    completed_points: int
+    remaining_points: int
+    total_tasks: int
+    completed_tasks: int
+    ideal_points: Optional[float] = None  # burndown only
+
+class SprintBurnOut(Schema):
+    sprint_id: int
+    committed_points: int
+    points: List[SprintBurnPointOut]
+
+class SprintVelocityOut(Schema):
+    sprint_id: int
+    name: str
+    start_date: date
+    end_date: date
+    committed_points: int
+    completed_points: int
+
+class BoardVelocityOut(Schema):
+    board_id: int
+    average_velocity: float
+    sprints: List[SprintVelocityOut]
+
 
 # -------------------- Task Schemas --------------------
 
@@ -139,6 +166,13 @@ class TaskPatchIn(Schema):
     completed_at: Optional[datetime] = None
 
 
+class TaskRollupOut(Schema):
+    task_count: int = 0
+    story_points: int = 0
+    completed_points: int = 0
+    status_counts: Dict[str, int] = {}
+    completion_percent: float = 0.0
+
 class TaskOut(Schema):
     id: int
     title: str = Field(..., min_length=1, max_length=255)
@@ -154,9 +188,99 @@ class TaskOut(Schema):
     due_date: Optional[date] = None
     start_date: Optional[date] = None
     completed_at: Optional[datetime] = None
+    rollup: Optional[TaskRollupOut] = None  # totals of all subtasks, None without children
     created_at: datetime
     updated_at: datetime  # Fixed missing type annotation
 
+    @staticmethod
+    def resolve_label_ids(obj):
+        # Served from prefetch_related("labels") when the caller planned it
+        if isinstance(obj, dict):
+            return obj.get("label_ids") or []
+        return [label.pk for label in obj.labels.all()]
+
+
+class TaskFilterIn(Schema):
+    status: Optional[List[str]] = None
+    priority: Optional[List[str]] = None
+    task_type: Optional[List[str]] = None
+    assignee_id: Optional[List[int]] = None
+    sprint_id: Optional[int] = None
+    in_backlog: Optional[bool] = None  # true: no sprint, false: in any sprint
+    parent_id: Optional[int] = None
+    labels_any: Optional[List[int]] = None  # has at least one of these labels
+    labels_all: Optional[List[int]] = None  # has every one of these labels
+    due_after: Optional[date] = None
+    due_before: Optional[date] = None
+
+class TaskTreeNodeOut(Schema):
+    id: int
+    parent_id: Optional[int] = None
+    title: str
+    status: str
+    task_type: str
+    story_points: Optional[int] = None
+    assignee_id: Optional[int] = None
+    depth: int
+    children: List["TaskTreeNodeOut"] = []
+
+class TaskSubtreeOut(Schema):
+    root: TaskTreeNodeOut
+    rollup: TaskRollupOut
+    max_depth_reached: bool = False
+
+
+# -------------------- Bulk Task Schemas --------------------
+
+class TaskBulkCreateIn(Schema):
+    tasks: List[TaskIn] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskBulkPatchItem(Schema):
+    id: int
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    task_type: Optional[str] = Field(None, pattern="^(task|bug|story|epic|subtask)$")
+    status: Optional[str] = Field(None, pattern="^(todo|in_progress|done|blocked)$")
+    priority: Optional[str] = Field(None, pattern="^(low|medium|high|urgent)$")
+    assignee_id: Optional[int] = None
+    label_ids: Optional[List[int]] = None
+    sprint_id: Optional[int] = None
+    parent_id: Optional[int] = None
+    story_points: Optional[int] = None
+    due_date: Optional[date] = None
+    start_date: Optional[date] = None
+    completed_at: Optional[datetime] = None
+
+
+class TaskBulkPatchIn(Schema):
+    tasks: List[TaskBulkPatchItem] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskBulkMoveIn(Schema):
+    task_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    sprint_id: Optional[int] = None  # send null to move tasks back to the backlog
+    status: Optional[str] = Field(None, pattern="^(todo|in_progress|done|blocked)$")
+
+
+class TaskBulkResultOut(Schema):
+    updated: int
+    task_ids: List[int]
+
+
+class TaskImportErrorOut(Schema):
+    row: int  # 1-based record number in the input
+    errors: List[str]
+
+
+class TaskImportResultOut(Schema):
+    created: int
+    failed: int
+    chunks: int
+    task_ids: List[int]
+    errors: List[TaskImportErrorOut]  # first MAX_REPORTED_ERRORS only
+    parse_error: Optional[str] = None  # input was malformed from this point on; nothing after it was read
+
 
 class LabelIn(Schema):
     name: str
@@ -171,6 +295,34 @@ class LabelOut(Schema):
     name: str
     color: str
 
+# -------------------- Board Snapshot Schemas --------------------
+class TaskCardOut(Schema):
+    id: int
+    title: str
+    task_type: str
+    priority: str
+    assignee_id: Optional[int] = None
+    story_points: Optional[int] = None
+    due_date: Optional[date] = None
+    sprint_id: Optional[int] = None
+    parent_id: Optional[int] = None
+    label_ids: List[int] = []
+
+class BoardColumnOut(Schema):
+    count: int
+    story_points: int
+    tasks: List[TaskCardOut]
+    has_more: bool
+
+class BoardSnapshotOut(Schema):
+    board_id: int
+    name: str
+    project_id: Optional[int] = None
+    sprint_id: Optional[int] = None
+    columns: Dict[str, BoardColumnOut]  # keyed by task status
+    sprints: List[SprintOut]
+    labels: List[LabelOut]
+
 # -------------------- Comment Schemas --------------------
 class CommentIn(Schema):
     content: str = ""
@@ -188,4 +340,49 @@ class CommentOut(Schema):
     parent_id: Optional[int] = None
     created_at: datetime
     edited_at: Optional[datetime] = None
-    is_edited: bool
\ No newline at end of file
+    is_edited: bool
+    depth: int = 0
+
+class CommentThreadOut(CommentOut):
+    reply_count: int = 0
+    replies: List[CommentOut] = []
+    replies_cursor: Optional[str] = None  # pass to .../replies/ to load the rest
+
+# -------------------- Search Schemas --------------------
+class SearchHitOut(Schema):
+    kind: str  # task | comment | project
+    id: int
+    rank: float
+    title: str
+    highlight: str
+    project_id: Optional[int] = None
+    board_id: Optional[int] = None
+    task_id: Optional[int] = None
+    created_at: datetime
+
+# -------------------- Activity Schemas --------------------
+class ActivityTargetOut(Schema):
+    type: str  # project | board | sprint | task | label | comment | projectmember
+    id: Optional[int] = None
+    repr: str = ""
+    exists: bool = False  # False once the target is deleted (or soft-deleted)
+    board_id: Optional[int] = None
+    task_id: Optional[int] = None
+
+class ActivityOut(Schema):
+    id: int
+    action: str
+    actor: Optional[UsersDetail] = None
+    target: ActivityTargetOut
+    changed_fields: Optional[Dict[str, Any]] = None
+    created_at: datetime
+
+class ObjectStateOut(Schema):
+    type: str
+    id: int
+    at: datetime
+    exists: bool  # False before it was created or after it was deleted
+    state: Optional[Dict[str, Any]] = None  # column values by attname
+    source: str  # checkpoint | current: where the replay started
+    checkpoint_at: Optional[datetime] = None
+    replayed: int = 0  # activity entries undone to get here
@@ -0,0 +1,438 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery
+from django.utils import timezone
+from ninja.errors import HttpError
+
+from projects.api.v1.utils.pagination import paginate_keyset
+from projects.api.v1.utils.versioning import bump_version
+from projects.models import (
+    ActivityCheckpoint, ActivityLog, ActivityLogArchive, Board, Comment, Label, Project, ProjectMember, Sprint, Task,
+)
+
+ACTIVITY_LOG_HOT_DAYS = getattr(settings, "ACTIVITY_LOG_HOT_DAYS", 90)
+# 0 keeps archived entries forever
+ACTIVITY_LOG_RETENTION_DAYS = getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", 0)
+# 0 disables compaction
+ACTIVITY_LOG_COMPACT_AFTER_DAYS = getattr(settings, "ACTIVITY_LOG_COMPACT_AFTER_DAYS", 365)
+ARCHIVE_BATCH_SIZE = 5000
+ACTIVITY_CHECKPOINT_INTERVAL = getattr(settings, "ACTIVITY_CHECKPOINT_INTERVAL", 50)
+CHECKPOINT_BATCH_SIZE = 1000
+
+UPDATE_ACTION = "updated"
+CREATE_ACTION = "created"
+DELETE_ACTION = "deleted"
+FEED_ORDERING = ("-created_at", "-id")
+# Target types a feed can be filtered by, and the columns read to describe them
+FEED_TARGET_TYPES = {
+    "project": Project, "board": Board, "sprint": Sprint, "task": Task,
+    "label": Label, "comment": Comment, "projectmember": ProjectMember,
+}
+FEED_TARGET_PATTERN = "^(" + "|".join(FEED_TARGET_TYPES) + ")$"
+TARGET_FIELDS = {
+    Project: ("name",),
+    Board: ("name",),
+    Sprint: ("name", "board_id"),
+    Label: ("name",),
+    Task: ("title", "board_id", "is_deleted"),
+    Comment: ("content", "task_id"),
+    ProjectMember: ("user_id",),
+}
+TARGET_REPR_LENGTH = 80
+# Columns shared by the hot and archive tables, including the id, which is kept on the move
+LOG_COLUMNS = tuple(field.attname for field in ActivityLog._meta.concrete_fields)
+
+
+def day_cutoff(days: int, now: Optional[datetime] = None) -> datetime:
+    """Midnight (UTC) `days` days ago, so whole days are processed together."""
+    now = now or timezone.now()
+    cutoff = now.astimezone(dt_timezone.utc) - timedelta(days=days)
+    return cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def merge_changes(diffs: Iterable[Optional[Dict]]) -> Optional[Dict]:
+    """
+    Fold consecutive {field: {"old", "new"}} diffs into one: each field keeps
+    its first old and its last new value, and fields that end where they
+    started are dropped. None if a diff is not in that shape.
+    """
+    merged = {}
+    for diff in diffs:
+        if not isinstance(diff, dict):
+            return None
+        for field, change in diff.items():
+            if not isinstance(change, dict) or not {"old", "new"} <= change.keys():
+                return None
+            if field in merged:
+                merged[field]["new"] = change["new"]
+            else:
+                merged[field] = {"old": change["old"], "new": change["new"]}
+    return {field: change for field, change in merged.items() if change["old"] != change["new"]}
+
+
+class ActivityArchiveService:
+    """
+    Hot/cold lifecycle of the activity log: aged entries move from
+    ActivityLog to ActivityLogArchive, old update diffs are compacted and
+    archived entries past retention are deleted. Every step works in
+    bounded batches, one transaction each.
+    """
+
+    @staticmethod
+    def rollover(cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        """Move entries created before `cutoff` to the archive."""
+        moved = 0
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    ActivityLog.objects.filter(created_at__lt=cutoff)
+                    .order_by("id")
+                    .select_for_update(skip_locked=True)
+                    .values(*LOG_COLUMNS)[:batch_size]
+                )
+                if not rows:
+                    return moved
+                ActivityLogArchive.objects.bulk_create(
+                    [ActivityLogArchive(**row) for row in rows], batch_size=batch_size, ignore_conflicts=True
+                )
+                ActivityLog.objects.filter(id__in=[row["id"] for row in rows]).delete()
+            moved += len(rows)
+            # Moved entries leave the (hot) activity feeds
+            bump_version("activity", *{row["project_id"] for row in rows})
+
+    @staticmethod
+    def purge(cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        """Delete archived entries created before `cutoff`, and the checkpoints only they could use."""
+        ActivityCheckpoint.objects.filter(taken_at__lt=cutoff).delete()
+        deleted = 0
+        while True:
+            ids = list(
+                ActivityLogArchive.objects.filter(created_at__lt=cutoff).order_by("id").values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            deleted += ActivityLogArchive.objects.filter(id__in=ids).delete()[0]
+
+    @staticmethod
+    def _runs(rows: Iterable[Dict]) -> Iterable[List[Dict]]:
+        """
+        Group rows (ordered by target, then time) into runs of consecutive
+        updates of one target by one actor on one day. Any other action on
+        the target ends the run.
+        """
+        run = []
+        for row in rows:
+            key = (
+                row["target_content_type_id"], row["target_object_id"], row["actor_id"],
+                row["created_at"].astimezone(dt_timezone.utc).date(),
+            )
+            if row["action"] != UPDATE_ACTION:
+                if run:
+                    yield run
+                run = []
+                yield [row]
+                continue
+            if run and run[0]["_key"] != key:
+                yield run
+                run = []
+            row["_key"] = key
+            run.append(row)
+        if run:
+            yield run
+
+    @staticmethod
+    def compact(cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Merge runs of archived "updated" entries created before `cutoff`
+        into their last entry (first old value and last new value of each
+        field), then mark everything scanned as compacted. Runs that net
+        out to no change are removed.
+        """
+        rows = (
+            ActivityLogArchive.objects.filter(created_at__lt=cutoff, compacted=False)
+            .order_by("target_content_type_id", "target_object_id", "created_at", "id")
+            .values("id", "target_content_type_id", "target_object_id", "actor_id", "action",
+                    "created_at", "changed_fields", "merged_count")
+        )
+        stats = {"scanned": 0, "merged": 0, "deleted": 0}
+        updates, deletes, scanned = [], [], []
+
+        def write():
+            with transaction.atomic():
+                ActivityLogArchive.objects.bulk_update(updates, ["changed_fields", "merged_count"], batch_size=batch_size)
+                ActivityLogArchive.objects.filter(id__in=deletes).delete()
+                ActivityLogArchive.objects.filter(id__in=scanned).update(compacted=True)
+            updates.clear()
+            deletes.clear()
+            scanned.clear()
+
+        for run in ActivityArchiveService._runs(rows.iterator(chunk_size=batch_size)):
+            stats["scanned"] += len(run)
+            last = run[-1]
+            merged = merge_changes(row["changed_fields"] for row in run) if len(run) > 1 else None
+            if merged is None:
+                scanned.extend(row["id"] for row in run)
+            elif merged:
+                updates.append(ActivityLogArchive(
+                    id=last["id"], changed_fields=merged, merged_count=sum(row["merged_count"] for row in run),
+                ))
+                deletes.extend(row["id"] for row in run[:-1])
+                scanned.append(last["id"])
+                stats["merged"] += len(run) - 1
+            else:
+                deletes.extend(row["id"] for row in run)
+                stats["deleted"] += len(run)
+            if len(scanned) + len(deletes) >= batch_size:
+                write()
+        write()
+        return stats
+
+
+class ActivityFeedService:
+    """
+    Activity feeds of a project, optionally narrowed to one actor or one
+    target, over the hot ActivityLog table. Pages are keyset-paginated on
+    (created_at, id); actors are joined in and targets are loaded with one
+    query per content type on the page instead of a GenericForeignKey
+    lookup per row.
+    """
+
+    @staticmethod
+    def queryset(
+        project_id: int,
+        tenant,
+        actor_id: Optional[int] = None,
+        target: Optional[Tuple[str, int]] = None,
+        actions: Optional[List[str]] = None,
+    ) -> QuerySet:
+        qs = ActivityLog.objects.filter(tenant=tenant, project_id=project_id)
+        if actor_id is not None:
+            qs = qs.filter(actor_id=actor_id)
+        if target is not None:
+            target_type, target_id = target
+            content_type = ContentType.objects.get_for_model(FEED_TARGET_TYPES[target_type])
+            qs = qs.filter(target_content_type=content_type, target_object_id=target_id)
+        if actions:
+            qs = qs.filter(action__in=actions)
+        return qs
+
+    @staticmethod
+    def page(
+        queryset: QuerySet,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        queryset = queryset.select_related("actor").only(
+            "id", "action", "created_at", "changed_fields", "target_content_type_id",
+            "target_object_id", "target_type", "target_repr",
+            "actor__id", "actor__name", "actor__username", "actor__email",
+        )
+        rows, meta = paginate_keyset(queryset, cursor, limit, ordering=FEED_ORDERING)
+        targets = ActivityFeedService.resolve_targets(rows)
+        data = [
+            {
+                "id": row.pk,
+                "action": row.action,
+                "actor": row.actor,
+                "target": targets[row.pk],
+                "changed_fields": row.changed_fields,
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ]
+        return data, meta
+
+    @staticmethod
+    def _describe(values: Dict[str, Any]) -> Dict[str, Any]:
+        text = next((values[field] for field in ("name", "title", "content") if field in values), None)
+        return {
+            "repr": text[:TARGET_REPR_LENGTH] if text else None,
+            "exists": not values.get("is_deleted", False),
+            "board_id": values.get("board_id"),
+            "task_id": values.get("task_id"),
+        }
+
+    @staticmethod
+    def resolve_targets(rows: List[ActivityLog]) -> Dict[int, Dict[str, Any]]:
+        """Describe the target of each row (by row id), loading each content type once."""
+        wanted: Dict[int, set] = {}
+        for row in rows:
+            if row.target_content_type_id and row.target_object_id:
+                wanted.setdefault(row.target_content_type_id, set()).add(row.target_object_id)
+
+        found: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for content_type_id, ids in wanted.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model not in TARGET_FIELDS:
+                continue
+            for values in model._default_manager.filter(pk__in=ids).values("pk", *TARGET_FIELDS[model]):
+                found[content_type_id, values["pk"]] = ActivityFeedService._describe(values)
+
+        targets = {}
+        for row in rows:
+            live = found.get((row.target_content_type_id, row.target_object_id), {})
+            targets[row.pk] = {
+                "type": row.target_type.lower(),
+                "id": row.target_object_id,
+                # Deleted targets keep the description stored with the entry
+                "repr": live.get("repr") or row.target_repr,
+                "exists": live.get("exists", False),
+                "board_id": live.get("board_id"),
+                "task_id": live.get("task_id"),
+            }
+        return targets
+
+
+def json_state(values: Dict[str, Any]) -> Dict[str, Any]:
+    """`values` as they read back from a JSONField, so they compare equal to logged diffs."""
+    return json.loads(json.dumps(values, cls=DjangoJSONEncoder))
+
+
+class ActivityHistoryService:
+    """
+    Point-in-time state of a tracked object, rebuilt from ActivityLog diffs.
+
+    Replay starts from the earliest checkpoint taken at or after the
+    requested time, or from the current row when there is none, and walks
+    back through the entries in between (hot and archive tables), restoring
+    each field's old value. A "created" entry means the object did not
+    exist yet; a "deleted" entry carries the final values, so deleted
+    objects can be rebuilt too. Checkpoints bound the walk to about
+    ACTIVITY_CHECKPOINT_INTERVAL entries however long the object has lived.
+    Archived updates merged by compaction are undone at the time of the
+    last update of their run.
+    """
+
+    @staticmethod
+    def _entries(content_type_id: int, object_id: int, after: datetime, until: Optional[datetime]) -> List[Dict]:
+        """Entries of the object in (after, until], newest first."""
+        entries = []
+        for model in (ActivityLog, ActivityLogArchive):
+            qs = model.objects.filter(
+                target_content_type_id=content_type_id, target_object_id=object_id, created_at__gt=after
+            )
+            if until is not None:
+                qs = qs.filter(created_at__lte=until)
+            entries.extend(qs.values("id", "action", "changed_fields", "created_at"))
+        entries.sort(key=lambda entry: (entry["created_at"], entry["id"]), reverse=True)
+        return entries
+
+    @staticmethod
+    def _in_project(model, object_id: int, project_id: int, row: Optional[Dict]) -> bool:
+        if model is Project:
+            return object_id == project_id
+        if row is not None:
+            return row.get("project_id") == project_id
+        # Deleted since: its entries tell where it lived
+        return any(
+            log_model.objects.filter(
+                target_content_type=ContentType.objects.get_for_model(model),
+                target_object_id=object_id, project_id=project_id,
+            ).exists()
+            for log_model in (ActivityLog, ActivityLogArchive)
+        )
+
+    @staticmethod
+    def reconstruct(target_type: str, object_id: int, at: datetime, project_id: int) -> Dict[str, Any]:
+        model = FEED_TARGET_TYPES[target_type]
+        now = timezone.now()
+        at = min(at, now)
+        if ACTIVITY_LOG_RETENTION_DAYS and at < day_cutoff(ACTIVITY_LOG_RETENTION_DAYS, now):
+            raise HttpError(400, f"Activity older than {ACTIVITY_LOG_RETENTION_DAYS} days is not retained.")
+
+        attnames = model.tracked_attnames()
+        row = model._default_manager.filter(pk=object_id).values(*attnames).first()
+        if not ActivityHistoryService._in_project(model, object_id, project_id, row):
+            raise HttpError(404, f"{model.__name__} not found in this project.")
+
+        content_type = ContentType.objects.get_for_model(model)
+        checkpoint = (
+            ActivityCheckpoint.objects.filter(
+                target_content_type=content_type, target_object_id=object_id, taken_at__gte=at
+            )
+            .order_by("taken_at")
+            .values("state", "taken_at")
+            .first()
+        )
+        if checkpoint:
+            state, until = dict(checkpoint["state"]), checkpoint["taken_at"]
+        else:
+            state, until = (json_state(row) if row is not None else None), None
+
+        entries = ActivityHistoryService._entries(content_type.pk, object_id, at, until)
+        for entry in entries:
+            if entry["action"] == CREATE_ACTION:
+                state = None
+                break
+            if entry["action"] == DELETE_ACTION and state is None:
+                state = {}
+            changes = entry["changed_fields"]
+            if state is None or not isinstance(changes, dict):
+                continue
+            for attname, change in changes.items():
+                # Summary entries (e.g. "imported") carry keys that are not columns
+                if attname in attnames and isinstance(change, dict) and "old" in change:
+                    state[attname] = change["old"]
+
+        return {
+            "type": target_type,
+            "id": object_id,
+            "at": at,
+            "exists": state is not None,
+            "state": state,
+            "source": "checkpoint" if checkpoint else "current",
+            "checkpoint_at": until,
+            "replayed": len(entries),
+        }
+
+    @staticmethod
+    def due(model, interval: int = ACTIVITY_CHECKPOINT_INTERVAL) -> QuerySet:
+        """Ids of `model` objects with at least `interval` hot entries since their last checkpoint."""
+        content_type = ContentType.objects.get_for_model(model)
+        last_checkpoint = (
+            ActivityCheckpoint.objects.filter(target_content_type=content_type, target_object_id=OuterRef("target_object_id"))
+            .order_by("-taken_at")
+            .values("taken_at")[:1]
+        )
+        return (
+            ActivityLog.objects.filter(target_content_type=content_type, target_object_id__isnull=False)
+            .annotate(last_checkpoint=Subquery(last_checkpoint))
+            .filter(Q(last_checkpoint__isnull=True) | Q(created_at__gt=F("last_checkpoint")))
+            .values("target_object_id")
+            .annotate(entries=Count("id"))
+            .filter(entries__gte=interval)
+            .order_by("target_object_id")
+            .values_list("target_object_id", flat=True)
+        )
+
+    @staticmethod
+    def checkpoint(model, interval: int = ACTIVITY_CHECKPOINT_INTERVAL, batch_size: int = CHECKPOINT_BATCH_SIZE) -> int:
+        """Snapshot every due object of `model`; returns the number of checkpoints written."""
+        content_type = ContentType.objects.get_for_model(model)
+        attnames = model.tracked_attnames()
+        object_ids = list(ActivityHistoryService.due(model, interval))
+        written = 0
+        for start in range(0, len(object_ids), batch_size):
+            # Taken before the read: entries up to here are reflected in the rows
+            taken_at = timezone.now()
+            rows = model._default_manager.filter(pk__in=object_ids[start:start + batch_size]).values(*attnames)
+            checkpoints = [
+                ActivityCheckpoint(
+                    tenant_id=row.get("tenant_id"),
+                    project_id=row["id"] if model is Project else row.get("project_id"),
+                    target_content_type=content_type,
+                    target_object_id=row["id"],
+                    state=json_state(row),
+                    taken_at=taken_at,
+                )
+                for row in rows
+            ]
+            ActivityCheckpoint.objects.bulk_create(checkpoints, batch_size=batch_size)
+            written += len(checkpoints)
+        return written
@@ -0,0 +1,125 @@
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import List
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+
+from projects.api.v1.utils.versioning import bump_version
+from projects.models import ActivityLog
+
+import logging
+logger = logging.getLogger("api")
+
+AUDIT_BATCH_SIZE = 500
+AUDIT_LOG_ASYNC = getattr(settings, "AUDIT_LOG_ASYNC", False)
+AUDIT_LOG_QUEUE_SIZE = getattr(settings, "AUDIT_LOG_QUEUE_SIZE", 1000)
+
+_scope = Local()
+
+
+def write_entries(entries: List[ActivityLog]) -> None:
+    """Insert `entries` in one bulk_create. Failures are logged, never raised: the audited writes are committed."""
+    try:
+        ActivityLog.objects.bulk_create(entries, batch_size=AUDIT_BATCH_SIZE)
+    except DatabaseError as e:
+        logger.error(f"Failed to write {len(entries)} activity log entries: {e}")
+        return
+    # Activity feeds are cached per project
+    bump_version("activity", *{entry.project_id for entry in entries})
+
+
+class AuditWriter:
+    """
+    Background thread that writes flushed batches. The queue is bounded;
+    when it is full the caller writes the batch itself, so entries are
+    slowed down under pressure but never dropped.
+    """
+
+    def __init__(self, maxsize: int = AUDIT_LOG_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _run(self) -> None:
+        while True:
+            entries = self.queue.get()
+            try:
+                close_old_connections()
+                write_entries(entries)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, entries: List[ActivityLog]) -> bool:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+        try:
+            self.queue.put_nowait(entries)
+            return True
+        except queue.Full:
+            return False
+
+    def drain(self) -> None:
+        """Block until every queued batch is written."""
+        if self._thread is not None:
+            self.queue.join()
+
+
+audit_writer = AuditWriter()
+atexit.register(audit_writer.drain)
+
+
+def flush(entries: List[ActivityLog]) -> None:
+    if not entries:
+        return
+    if AUDIT_LOG_ASYNC and audit_writer.submit(entries):
+        return
+    write_entries(entries)
+
+
+def _committed_many(entries: List[ActivityLog]) -> None:
+    pending = getattr(_scope, "pending", None)
+    if pending is None:
+        flush(entries)
+    else:
+        pending.extend(entries)
+
+
+def record_many(entries: List[ActivityLog]) -> None:
+    """`record` for a batch: accepted together when the transaction commits."""
+    entries = list(entries)
+    if entries:
+        transaction.on_commit(partial(_committed_many, entries))
+
+
+def record(entry: ActivityLog) -> None:
+    """
+    Queue an unsaved ActivityLog. It is accepted only when the surrounding
+    transaction commits (at once in autocommit), so entries of rolled-back
+    work, savepoints included, are never written. Inside an `audit_scope`
+    accepted entries are held and written together when the scope ends.
+    """
+    transaction.on_commit(partial(_committed_many, [entry]))
+
+
+@contextmanager
+def audit_scope():
+    """
+    Collect the activity log entries committed inside the block and write
+    them with one bulk_create on exit. Nested scopes join the outermost one.
+    """
+    if getattr(_scope, "pending", None) is not None:
+        yield
+        return
+    _scope.pending = []
+    try:
+        yield
+    finally:
+        pending, _scope.pending = _scope.pending, None
+        flush(pending)
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+
+from projects.api.v1.schemas.projects import BoardSnapshotOut, LabelOut, SprintOut
+from projects.api.v1.utils.permissions import warm_board_resolution
+from projects.api.v1.utils.versioning import get_versions
+from projects.models import Board, Label, Sprint, Task
+
+SNAPSHOT_CACHE_TTL = 60 * 60
+CARD_FIELDS = ("id", "title", "task_type", "priority", "assignee_id", "story_points", "due_date", "sprint_id", "parent_id")
+
+TaskLabel = Task.labels.through
+
+
+class BoardSnapshotService:
+    """
+    Board view in a constant number of queries: one aggregate for every
+    column's counts and story points, one windowed query for the first
+    `per_column` cards of each column, plus card labels, sprints and labels.
+    """
+
+    @staticmethod
+    def cache_key(board: Board, sprint_id: Optional[int], per_column: int) -> str:
+        versions = get_versions(("board", board.pk), ("project", board.project_id))
+        return (
+            f"board-snapshot:{board.pk}:{versions[('board', board.pk)]}:"
+            f"{versions[('project', board.project_id)]}:{sprint_id}:{per_column}"
+        )
+
+    @staticmethod
+    def get_snapshot(board: Board, sprint_id: Optional[int] = None, per_column: int = 50) -> Dict:
+        key = BoardSnapshotService.cache_key(board, sprint_id, per_column)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = BoardSnapshotService.build(board, sprint_id, per_column)
+            cache.set(key, snapshot, SNAPSHOT_CACHE_TTL)
+            # Clients open cards and sprints from here next; resolve their projects in bulk once per board version
+            warm_board_resolution(board.pk)
+        return snapshot
+
+    @staticmethod
+    def build(board: Board, sprint_id: Optional[int] = None, per_column: int = 50) -> Dict:
+        tasks = Task.objects.filter(board=board, tenant_id=board.tenant_id, is_deleted=False)
+        if sprint_id is not None:
+            tasks = tasks.filter(sprint_id=sprint_id)
+        statuses = [status for status, _ in Task.STATUS_CHOICES]
+
+        aggregates = {}
+        for status in statuses:
+            aggregates[f"{status}__count"] = Count("id", filter=Q(status=status))
+            aggregates[f"{status}__points"] = Sum("story_points", filter=Q(status=status))
+        totals = tasks.aggregate(**aggregates)
+
+        cards = list(
+            tasks.annotate(
+                column_position=Window(
+                    RowNumber(),
+                    partition_by=[F("status")],
+                    order_by=[F("created_at").desc(), F("id").desc()],
+                )
+            )
+            .filter(column_position__lte=per_column)
+            .order_by("status", "column_position")
+            .values("status", *CARD_FIELDS)
+        )
+
+        labels_by_task = defaultdict(list)
+        for task_id, label_id in TaskLabel.objects.filter(
+            task_id__in=[card["id"] for card in cards]
+        ).values_list("task_id", "label_id"):
+            labels_by_task[task_id].append(label_id)
+
+        cards_by_status: Dict[str, List[dict]] = defaultdict(list)
+        for card in cards:
+            status = card.pop("status")
+            card["label_ids"] = labels_by_task.get(card["id"], [])
+            cards_by_status[status].append(card)
+
+        columns = {}
+        for status in statuses:
+            count = totals[f"{status}__count"] or 0
+            columns[status] = {
+                "count": count,
+                "story_points": totals[f"{status}__points"] or 0,
+                "tasks": cards_by_status.get(status, []),
+                "has_more": count > per_column,
+            }
+
+        sprints = Sprint.objects.filter(board=board).exclude(status="closed").order_by("start_date", "id")
+        labels = Label.objects.filter(project_id=board.project_id, tenant_id=board.tenant_id).order_by("name")
+
+        return BoardSnapshotOut.model_validate({
+            "board_id": board.pk,
+            "name": board.name,
+            "project_id": board.project_id,
+            "sprint_id": sprint_id,
+            "columns": columns,
+            "sprints": [SprintOut.model_validate(sprint) for sprint in sprints],
+            "labels": [LabelOut.model_validate(label) for label in labels],
+        }).model_dump()
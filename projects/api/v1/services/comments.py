@@ -0,0 +1,171 @@
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Count, F, Max, Q, Value, Window
+from django.db.models.functions import Concat, RowNumber, Substr
+from ninja.errors import HttpError
+
+from projects.api.v1.utils.pagination import cursor_after, paginate_keyset
+from projects.models import Comment
+
+PATH_SEGMENT_WIDTH = 10
+PATH_SEPARATOR = "."
+THREAD_ORDERING = ("-created_at", "-id")
+REPLY_ORDERING = ("path",)
+# Deepest reply whose path still fits Comment.path (segments plus separators)
+MAX_COMMENT_DEPTH = (Comment._meta.get_field("path").max_length + 1) // (PATH_SEGMENT_WIDTH + len(PATH_SEPARATOR)) - 1
+
+
+def path_segment(pk: int) -> str:
+    return str(pk).zfill(PATH_SEGMENT_WIDTH)
+
+
+def build_path(parent_path: Optional[str], pk: int) -> str:
+    return f"{parent_path}{PATH_SEPARATOR}{path_segment(pk)}" if parent_path else path_segment(pk)
+
+
+class CommentThreadService:
+    """
+    Comment threads over a materialized path: a page of top-level comments
+    and the first replies of each come from two indexed queries, however
+    many comments the task has.
+    """
+
+    @staticmethod
+    def assign_path(comment: Comment) -> None:
+        """(Re)compute `comment`'s path from its parent and carry its subtree along."""
+        parent_path = None
+        if comment.parent_id:
+            parent_path = Comment.objects.filter(pk=comment.parent_id).values_list("path", flat=True).first()
+        path = build_path(parent_path, comment.pk)
+        depth = path.count(PATH_SEPARATOR)
+        old_path = comment.path
+        if path == old_path and depth == comment.depth:
+            return
+
+        Comment.objects.filter(pk=comment.pk).update(path=path, depth=depth)
+        if old_path:
+            # Re-prefix the descendants of a re-parented comment in one UPDATE
+            Comment.objects.filter(task_id=comment.task_id, path__startswith=old_path + PATH_SEPARATOR).update(
+                path=Concat(Value(path), Substr("path", len(old_path) + 1)),
+                depth=F("depth") + (depth - comment.depth),
+            )
+        comment.path, comment.depth = path, depth
+
+    @staticmethod
+    def rebuild_paths(task_id: Optional[int] = None, under: Optional[str] = None) -> int:
+        """
+        Recompute every path (of one task, or all; only below the path `under`
+        if given) from parent links; returns rows changed.
+        """
+        comments = Comment.objects.order_by("id")
+        if task_id is not None:
+            comments = comments.filter(task_id=task_id)
+        if under:
+            comments = comments.filter(path__startswith=under + PATH_SEPARATOR)
+        rows = {row["id"]: row for row in comments.values("id", "parent_id", "path", "depth")}
+
+        paths: Dict[int, str] = {}
+
+        def resolve(pk: int) -> str:
+            # Walk up to the first ancestor with a known path; a missing or cyclic parent makes a root
+            chain = []
+            node = pk
+            while node not in paths:
+                chain.append(node)
+                parent_id = rows[node]["parent_id"]
+                if parent_id not in rows or parent_id in chain:
+                    paths[chain.pop()] = path_segment(node)
+                    break
+                node = parent_id
+            for child in reversed(chain):
+                paths[child] = build_path(paths[rows[child]["parent_id"]], child)
+            return paths[pk]
+
+        changed = []
+        for pk, row in rows.items():
+            path = resolve(pk)
+            depth = path.count(PATH_SEPARATOR)
+            if row["path"] != path or row["depth"] != depth:
+                changed.append(Comment(pk=pk, path=path, depth=depth))
+        Comment.objects.bulk_update(changed, ["path", "depth"], batch_size=500)
+        return len(changed)
+
+    @staticmethod
+    def validate_parent(comment: Comment, parent_id: Optional[int]) -> None:
+        if parent_id is None:
+            return
+        parent = Comment.objects.filter(pk=parent_id, task_id=comment.task_id).values("path", "depth").first()
+        if parent is None:
+            raise HttpError(400, "Parent comment not found on this task.")
+        if comment.pk and (parent_id == comment.pk or parent["path"].startswith(comment.path + PATH_SEPARATOR)):
+            raise HttpError(400, "A comment cannot be moved under itself.")
+        # A moved comment carries its replies along, so the deepest of them must still fit
+        subtree_height = 0
+        if comment.pk and comment.path:
+            deepest = Comment.objects.filter(
+                task_id=comment.task_id, path__startswith=comment.path + PATH_SEPARATOR
+            ).aggregate(deepest=Max("depth"))["deepest"]
+            subtree_height = deepest - comment.depth if deepest is not None else 0
+        if parent["depth"] + 1 + subtree_height > MAX_COMMENT_DEPTH:
+            raise HttpError(400, f"Replies can be nested at most {MAX_COMMENT_DEPTH} levels deep.")
+
+    @staticmethod
+    def _first_replies(roots: List[Comment], per_thread: int) -> Dict[str, Tuple[List[Comment], int]]:
+        """{root path: (first `per_thread` replies in thread order, total replies)}."""
+        if not roots:
+            return {}
+        thread = Substr("path", 1, PATH_SEGMENT_WIDTH)
+        replies = (
+            Comment.objects.filter(task_id=roots[0].task_id, depth__gt=0)
+            .filter(reduce(or_, (Q(path__startswith=root.path + PATH_SEPARATOR) for root in roots)))
+        )
+        if per_thread < 1:
+            # Counts only
+            counts = replies.annotate(thread=thread).values("thread").annotate(total=Count("id")).order_by()
+            return {row["thread"]: ([], row["total"]) for row in counts}
+        replies = (
+            replies.annotate(
+                thread=thread,
+                position=Window(RowNumber(), partition_by=[thread], order_by=F("path").asc()),
+                thread_size=Window(Count("id"), partition_by=[thread]),
+            )
+            .filter(position__lte=per_thread)
+            .order_by("path")
+        )
+        grouped: Dict[str, Tuple[List[Comment], int]] = {}
+        for reply in replies:
+            grouped.setdefault(reply.thread, ([], reply.thread_size))[0].append(reply)
+        return grouped
+
+    @staticmethod
+    def threads(task_id: int, tenant, cursor: Optional[str] = None, limit: int = 20, replies: int = 3) -> Tuple[List[Dict], Dict]:
+        roots, meta = paginate_keyset(
+            Comment.objects.filter(task_id=task_id, tenant=tenant, depth=0),
+            cursor=cursor,
+            limit=limit,
+            ordering=THREAD_ORDERING,
+        )
+        first_replies = CommentThreadService._first_replies(roots, replies)
+        threads = []
+        for root in roots:
+            shown, total = first_replies.get(root.path, ([], 0))
+            threads.append({
+                "comment": root,
+                "replies": shown,
+                "reply_count": total,
+                # After the root itself when no reply is shown: its path sorts before all of them
+                "replies_cursor": cursor_after((shown or [root])[-1], REPLY_ORDERING) if len(shown) < total else None,
+            })
+        return threads, meta
+
+    @staticmethod
+    def replies(comment: Comment, cursor: Optional[str] = None, limit: int = 20) -> Tuple[List[Comment], Dict]:
+        """All descendants of `comment` in thread order, a keyset page at a time."""
+        return paginate_keyset(
+            Comment.objects.filter(task_id=comment.task_id, path__startswith=comment.path + PATH_SEPARATOR),
+            cursor=cursor,
+            limit=limit,
+            ordering=REPLY_ORDERING,
+        )
@@ -0,0 +1,168 @@
+import csv
+import zlib
+from typing import Dict, Iterable, Iterator
+
+from django.conf import settings
+from django.db.models import Prefetch, QuerySet
+
+from accounts.api.v1.utils.renderers import FastJSONEncoder
+from projects.api.v1.utils.filters import apply_task_filters
+from projects.models import Label, Task
+
+EXPORT_CHUNK_SIZE = getattr(settings, "TASK_EXPORT_CHUNK_SIZE", 2000)
+# Rendered lines are buffered up to this many bytes before being handed to the server
+EXPORT_FLUSH_BYTES = 64 * 1024
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv)$"
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+TASK_EXPORT_FIELDS = (
+    "id", "title", "description", "task_type", "status", "priority", "story_points",
+    "due_date", "start_date", "completed_at", "parent_id", "created_at", "updated_at",
+)
+CSV_COLUMNS = TASK_EXPORT_FIELDS + (
+    "board_id", "board_name", "sprint_id", "sprint_name", "sprint_status",
+    "assignee_id", "assignee_username", "assignee_email", "label_ids", "label_names",
+)
+# Spreadsheet apps evaluate cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object whose write() hands back the line csv.writer rendered."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class TaskExportService:
+    """
+    Project-wide task export that streams instead of paginating.
+
+    Tasks are read through `.iterator(chunk_size=...)` (a server-side cursor
+    on Postgres) with the board, sprint and assignee joined in and labels
+    prefetched once per chunk, so memory stays flat whatever the project size.
+    """
+
+    @staticmethod
+    def queryset(project_id: int, tenant) -> QuerySet:
+        return (
+            Task.objects.filter(project_id=project_id, tenant=tenant, is_deleted=False)
+            .select_related("board", "sprint", "assignee")
+            .only(
+                *TASK_EXPORT_FIELDS, "parent", "board__id", "board__name",
+                "sprint__id", "sprint__name", "sprint__status",
+                "assignee__id", "assignee__username", "assignee__email",
+            )
+            .prefetch_related(
+                Prefetch("labels", queryset=Label.objects.only("id", "name", "color").order_by("id"))
+            )
+            .order_by("id")
+        )
+
+    @staticmethod
+    def serialize(task: Task) -> Dict:
+        row = {field: getattr(task, field) for field in TASK_EXPORT_FIELDS}
+        row["board"] = {"id": task.board.pk, "name": task.board.name} if task.board_id else None
+        row["sprint"] = (
+            {"id": task.sprint.pk, "name": task.sprint.name, "status": task.sprint.status}
+            if task.sprint_id else None
+        )
+        row["assignee"] = (
+            {"id": task.assignee.pk, "username": task.assignee.username, "email": task.assignee.email}
+            if task.assignee_id else None
+        )
+        row["labels"] = [{"id": label.pk, "name": label.name, "color": label.color} for label in task.labels.all()]
+        return row
+
+    @staticmethod
+    def rows(queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict]:
+        for task in queryset.iterator(chunk_size=chunk_size):
+            yield TaskExportService.serialize(task)
+
+    # ---------------- Renderers -----------------
+
+    @staticmethod
+    def ndjson_lines(rows: Iterable[Dict]) -> Iterator[str]:
+        encoder = FastJSONEncoder()
+        for row in rows:
+            yield encoder.encode(row) + "\n"
+
+    @staticmethod
+    def _csv_cell(value) -> str:
+        if value is None:
+            return ""
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    @staticmethod
+    def flatten(row: Dict) -> Dict:
+        board = row["board"] or {}
+        sprint = row["sprint"] or {}
+        assignee = row["assignee"] or {}
+        flat = {field: row[field] for field in TASK_EXPORT_FIELDS}
+        flat.update(
+            board_id=board.get("id"),
+            board_name=board.get("name"),
+            sprint_id=sprint.get("id"),
+            sprint_name=sprint.get("name"),
+            sprint_status=sprint.get("status"),
+            assignee_id=assignee.get("id"),
+            assignee_username=assignee.get("username"),
+            assignee_email=assignee.get("email"),
+            label_ids=";".join(str(label["id"]) for label in row["labels"]),
+            label_names=";".join(label["name"] for label in row["labels"]),
+        )
+        return flat
+
+    @staticmethod
+    def csv_lines(rows: Iterable[Dict]) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(CSV_COLUMNS)
+        for row in rows:
+            flat = TaskExportService.flatten(row)
+            yield writer.writerow([TaskExportService._csv_cell(flat[column]) for column in CSV_COLUMNS])
+
+    @staticmethod
+    def render(rows: Iterable[Dict], fmt: str) -> Iterator[str]:
+        if fmt == "csv":
+            return TaskExportService.csv_lines(rows)
+        return TaskExportService.ndjson_lines(rows)
+
+    # ---------------- Transport -----------------
+
+    @staticmethod
+    def encode(lines: Iterable[str], flush_bytes: int = EXPORT_FLUSH_BYTES) -> Iterator[bytes]:
+        """UTF-8 encode `lines`, coalesced into blocks of about `flush_bytes`."""
+        buffer = []
+        size = 0
+        for line in lines:
+            data = line.encode()
+            buffer.append(data)
+            size += len(data)
+            if size >= flush_bytes:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+    @staticmethod
+    def gzip(blocks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+        """Compress `blocks` on the fly into a single gzip member."""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        for block in blocks:
+            data = compressor.compress(block)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    @staticmethod
+    def stream(project_id: int, tenant, fmt: str = "ndjson", compress: bool = False, filters=None) -> Iterator[bytes]:
+        queryset = apply_task_filters(TaskExportService.queryset(project_id, tenant), filters)
+        blocks = TaskExportService.encode(TaskExportService.render(TaskExportService.rows(queryset), fmt))
+        return TaskExportService.gzip(blocks) if compress else blocks
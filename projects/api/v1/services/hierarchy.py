@@ -0,0 +1,198 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection
+from ninja.errors import HttpError
+
+from projects.api.v1.utils.versioning import bump_version_on_commit
+from projects.models import Task
+
+MAX_TREE_DEPTH = 20
+DONE_STATUS = "done"
+TREE_COLUMNS = ("id", "parent_id", "title", "status", "task_type", "story_points", "assignee_id")
+# Changes to these on a child invalidate its ancestors' cached rollups
+ROLLUP_SOURCE_FIELDS = ("parent_id", "status", "story_points", "is_deleted")
+
+
+def _table() -> str:
+    return connection.ops.quote_name(Task._meta.db_table)
+
+
+def empty_rollup() -> Dict:
+    return {
+        "task_count": 0,
+        "story_points": 0,
+        "completed_points": 0,
+        "status_counts": {},
+        "completion_percent": 0.0,
+    }
+
+
+def summarize(rows: Iterable[Tuple[str, int, int]]) -> Dict:
+    """Rollup from (status, task count, story points) rows."""
+    rollup = empty_rollup()
+    for status, count, points in rows:
+        points = points or 0
+        rollup["task_count"] += count
+        rollup["story_points"] += points
+        rollup["status_counts"][status] = rollup["status_counts"].get(status, 0) + count
+        if status == DONE_STATUS:
+            rollup["completed_points"] += points
+    done = rollup["status_counts"].get(DONE_STATUS, 0)
+    # Weighted by points when the subtree is estimated, by task count otherwise
+    if rollup["story_points"]:
+        rollup["completion_percent"] = round(100 * rollup["completed_points"] / rollup["story_points"], 1)
+    elif rollup["task_count"]:
+        rollup["completion_percent"] = round(100 * done / rollup["task_count"], 1)
+    return rollup
+
+
+class TaskHierarchyService:
+    """
+    Epic -> story -> subtask trees over Task.parent, walked with recursive
+    CTEs (Postgres and SQLite) instead of one request or query per level.
+    Soft-deleted tasks and everything below them are left out.
+    """
+
+    @staticmethod
+    def subtree_rows(task_id: int, max_depth: int = MAX_TREE_DEPTH) -> List[Dict]:
+        """The task and all its descendants, depth-first, in one recursive query."""
+        table = _table()
+        columns = ", ".join(f"t.{connection.ops.quote_name(c)}" for c in TREE_COLUMNS)
+        sql = f"""
+            WITH RECURSIVE subtree AS (
+                SELECT {columns}, 0 AS depth
+                FROM {table} t
+                WHERE t.id = %s
+                UNION ALL
+                SELECT {columns}, s.depth + 1
+                FROM {table} t
+                JOIN subtree s ON t.parent_id = s.id
+                WHERE NOT t.is_deleted AND s.depth < %s
+            )
+            SELECT {", ".join(TREE_COLUMNS)}, depth FROM subtree ORDER BY depth, id
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [task_id, max_depth])
+            names = [col[0] for col in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def subtree(task: Task, max_depth: int = MAX_TREE_DEPTH) -> Dict:
+        """Nested descendant tree of `task` plus the rollup of everything below it."""
+        rows = TaskHierarchyService.subtree_rows(task.pk, max_depth)
+        # Rows come shallowest first; a task reached again (a cycle in legacy data) is skipped
+        nodes, unique = {}, []
+        for row in rows:
+            if row["id"] in nodes:
+                continue
+            nodes[row["id"]] = {**row, "children": []}
+            if row["depth"]:
+                nodes[row["parent_id"]]["children"].append(nodes[row["id"]])
+            unique.append(row)
+        rows = unique
+
+        statuses = defaultdict(lambda: [0, 0])
+        for row in rows[1:]:
+            statuses[row["status"]][0] += 1
+            statuses[row["status"]][1] += row["story_points"] or 0
+        return {
+            "root": nodes[task.pk],
+            "rollup": summarize((status, count, points) for status, (count, points) in statuses.items()),
+            "max_depth_reached": any(row["depth"] >= max_depth for row in rows),
+        }
+
+    @staticmethod
+    def parent_links(task_ids: Iterable[int]) -> Dict[int, Optional[int]]:
+        """{id: parent_id} for `task_ids` and every ancestor above them, in one recursive query."""
+        task_ids = [pk for pk in set(task_ids) if pk]
+        if not task_ids:
+            return {}
+        table = _table()
+        placeholders = ", ".join(["%s"] * len(task_ids))
+        sql = f"""
+            WITH RECURSIVE chain AS (
+                SELECT t.id, t.parent_id, 0 AS depth FROM {table} t WHERE t.id IN ({placeholders})
+                UNION ALL
+                SELECT t.id, t.parent_id, c.depth + 1
+                FROM {table} t
+                JOIN chain c ON t.id = c.parent_id
+                WHERE c.depth < %s
+            )
+            SELECT DISTINCT id, parent_id FROM chain
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*task_ids, MAX_TREE_DEPTH])
+            return dict(cursor.fetchall())
+
+    @staticmethod
+    def ancestor_ids(task_ids: Iterable[int]) -> List[int]:
+        """`task_ids` and every ancestor above them."""
+        return list(TaskHierarchyService.parent_links(task_ids))
+
+    @staticmethod
+    def validate_parents(parents: Dict[int, Optional[int]]) -> None:
+        """
+        Reject new `{task_id: parent_id}` links that would make a task its own
+        ancestor, checked against the tree as it will be with all of them applied.
+        """
+        parents = {task_id: parent_id for task_id, parent_id in parents.items() if task_id}
+        if not any(parents.values()):
+            return
+        links = TaskHierarchyService.parent_links(parents.values())
+        links.update(parents)
+        for task_id, parent_id in parents.items():
+            node, seen = parent_id, set()
+            while node is not None and node not in seen:
+                if node == task_id:
+                    raise HttpError(400, f"Task {task_id} cannot be moved under itself or one of its subtasks.")
+                seen.add(node)
+                node = links.get(node)
+
+    @staticmethod
+    def rollups(task_ids: List[int]) -> Dict[int, Dict]:
+        """Rollup of each task's descendants, via one closure CTE grouped by ancestor."""
+        if not task_ids:
+            return {}
+        table = _table()
+        placeholders = ", ".join(["%s"] * len(task_ids))
+        sql = f"""
+            WITH RECURSIVE closure AS (
+                SELECT t.id AS ancestor_id, t.id, t.status, t.story_points, 0 AS depth
+                FROM {table} t WHERE t.id IN ({placeholders})
+                UNION ALL
+                SELECT c.ancestor_id, t.id, t.status, t.story_points, c.depth + 1
+                FROM {table} t
+                JOIN closure c ON t.parent_id = c.id
+                WHERE NOT t.is_deleted AND c.depth < %s
+            )
+            SELECT ancestor_id, status, COUNT(*), SUM(story_points)
+            FROM closure WHERE depth > 0
+            GROUP BY ancestor_id, status
+        """
+        grouped = defaultdict(list)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*task_ids, MAX_TREE_DEPTH])
+            for ancestor_id, status, count, points in cursor.fetchall():
+                grouped[ancestor_id].append((status, count, points))
+        return {task_id: summarize(grouped.get(task_id, ())) for task_id in task_ids}
+
+    @staticmethod
+    def refresh_rollups(parent_ids: Iterable[Optional[int]]) -> None:
+        """
+        Recompute the cached `rollup` of the given parents and all their
+        ancestors; called when a child's status, points or parent change.
+        Tasks without children keep rollup=NULL.
+        """
+        chain = TaskHierarchyService.ancestor_ids(parent_ids)
+        if not chain:
+            return
+        rollups = TaskHierarchyService.rollups(chain)
+        Task.objects.bulk_update(
+            [Task(pk=pk, rollup=rollup if rollup["task_count"] else None) for pk, rollup in rollups.items()],
+            ["rollup"],
+            batch_size=500,
+        )
+        # bulk_update sends no save signals, so the boards' cached reads are invalidated here
+        board_ids = Task.objects.filter(pk__in=chain, board__isnull=False).values_list("board_id", flat=True).distinct()
+        bump_version_on_commit("board", *board_ids)
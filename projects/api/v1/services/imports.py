@@ -0,0 +1,314 @@
+import codecs
+import csv
+import json
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models.functions import Lower
+from ninja.errors import HttpError
+from pydantic import ValidationError
+
+from accounts.models import CustomUser
+from projects.api.v1.schemas.projects import TaskIn
+from projects.api.v1.services.export import CSV_FORMULA_PREFIXES
+from projects.api.v1.services.tasks import TaskBulkService
+from projects.models import Board, Label, Sprint, Task
+
+IMPORT_CHUNK_SIZE = getattr(settings, "TASK_IMPORT_CHUNK_SIZE", 1000)
+IMPORT_FORMATS = ("csv", "ndjson", "json")
+IMPORT_FORMAT_PATTERN = "^(csv|ndjson|json)$"
+# Row errors beyond this are counted but not returned
+MAX_REPORTED_ERRORS = 100
+READ_BLOCK_SIZE = 64 * 1024
+LIST_SEPARATOR = ";"
+
+
+# ---------------- Stream parsers -----------------
+
+def _text(stream: IO) -> Iterator[str]:
+    """Decode a binary stream block by block (UTF-8, BOM tolerated)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        block = stream.read(READ_BLOCK_SIZE)
+        if not block:
+            break
+        try:
+            yield decoder.decode(block)
+        except UnicodeDecodeError:
+            raise HttpError(400, "Input is not valid UTF-8.")
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _lines(stream: IO) -> Iterator[str]:
+    """Lines with their terminators, which csv needs for quoted newlines."""
+    pending = ""
+    for text in _text(stream):
+        pending += text
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def iter_csv(stream: IO) -> Iterator[Dict]:
+    reader = csv.DictReader(_lines(stream))
+    try:
+        for row in reader:
+            # Empty cells mean "not set", so schema defaults apply
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+    except csv.Error as e:
+        raise HttpError(400, f"Invalid CSV on line {reader.line_num}: {e}")
+
+
+def iter_ndjson(stream: IO) -> Iterator[Dict]:
+    for number, line in enumerate(_lines(stream), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise HttpError(400, f"Invalid JSON on line {number}: {e.msg}")
+
+
+def iter_json_array(stream: IO) -> Iterator[Dict]:
+    """Yield the elements of a top-level JSON array without loading it whole."""
+    decoder = json.JSONDecoder()
+    blocks = _text(stream)
+    buffer = ""
+    position = 0
+    started = False
+    while True:
+        # Skip whitespace and separators between elements
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise HttpError(400, "Expected a JSON array of tasks.")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                element = None
+            else:
+                # A number or literal cut by the block boundary decodes "successfully"; only trust
+                # an element when something follows it
+                if end < len(buffer):
+                    yield element
+                    buffer, position = buffer[end:], 0
+                    continue
+        block = next(blocks, None)
+        if block is None:
+            if not started or position < len(buffer):
+                raise HttpError(400, "Truncated or invalid JSON array.")
+            raise HttpError(400, "Unterminated JSON array.")
+        buffer = buffer[position:] + block
+        position = 0
+
+
+PARSERS = {"csv": iter_csv, "ndjson": iter_ndjson, "json": iter_json_array}
+
+
+def detect_format(name: Optional[str], head: bytes) -> str:
+    """Pick a parser from the file extension, else from the first significant byte."""
+    if name:
+        extension = name.rsplit(".", 1)[-1].lower()
+        if extension in IMPORT_FORMATS:
+            return extension
+        if extension == "jsonl":
+            return "ndjson"
+    first = head.lstrip(codecs.BOM_UTF8).lstrip()[:1]
+    if first == b"[":
+        return "json"
+    if first == b"{":
+        return "ndjson"
+    return "csv"
+
+
+# ---------------- Row normalization -----------------
+
+def _split(value) -> List[str]:
+    if isinstance(value, list):
+        return value
+    return [part.strip() for part in str(value).split(LIST_SEPARATOR) if part.strip()]
+
+
+def _unquote(value):
+    # Reverse the formula guard the CSV export adds
+    if isinstance(value, str) and value[:1] == "'" and value[1:2] and value[1:].startswith(CSV_FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def normalize_row(raw: Dict) -> Dict:
+    """
+    Map an input record onto TaskIn fields. Accepts the shapes the export
+    produces: nested `sprint`/`assignee`/`labels` objects (NDJSON) and the
+    flattened `*_id`, `assignee_email` and `label_names` columns (CSV).
+    """
+    row = {key: _unquote(value) for key, value in raw.items()}
+    for name in ("sprint", "assignee", "parent"):
+        nested = row.pop(name, None)
+        if isinstance(nested, dict):
+            row.setdefault(f"{name}_id", nested.get("id"))
+            if name == "assignee" and nested.get("email"):
+                row.setdefault("assignee_email", nested["email"])
+    labels = row.pop("labels", None)
+    if isinstance(labels, list):
+        row.setdefault("label_names", [label["name"] for label in labels if isinstance(label, dict) and "name" in label])
+    if "label_ids" in row:
+        row["label_ids"] = _split(row["label_ids"])
+    if "label_names" in row:
+        row["label_names"] = _split(row["label_names"])
+    return row
+
+
+class TaskImportService:
+    """
+    Bulk task import: the input is parsed as a stream, validated against
+    TaskIn row by row and written through TaskBulkService in chunks, one
+    transaction and one summary ActivityLog per chunk. Assignees, labels,
+    sprints and parents are resolved with one query each per chunk; rows
+    that fail validation or reference unknown objects are reported and
+    skipped, the rest are imported.
+    """
+
+    @staticmethod
+    def parse(stream: IO, fmt: Optional[str] = None, name: Optional[str] = None) -> Iterator[Dict]:
+        if fmt is None:
+            head = stream.read(64)
+            stream.seek(0)
+            fmt = detect_format(name, head)
+        return PARSERS[fmt](stream)
+
+    @staticmethod
+    def _resolve(board: Board, rows: List[Tuple[int, Dict]]) -> Dict[str, Dict]:
+        """Per-chunk lookups for the references the rows make."""
+        emails = {row["assignee_email"].lower() for _, row in rows if row.get("assignee_email")}
+        assignee_ids = {row["assignee_id"] for _, row in rows if row.get("assignee_id") is not None}
+        label_names = {name for _, row in rows for name in row.get("label_names") or ()}
+        label_ids = {label_id for _, row in rows for label_id in row.get("label_ids") or ()}
+        sprint_ids = {row["sprint_id"] for _, row in rows if row.get("sprint_id") is not None}
+        parent_ids = {row["parent_id"] for _, row in rows if row.get("parent_id") is not None}
+
+        users = CustomUser.objects.filter(tenant_id=board.tenant_id)
+        labels = Label.objects.filter(tenant_id=board.tenant_id, project_id=board.project_id)
+        return {
+            "emails": dict(
+                users.annotate(email_key=Lower("email")).filter(email_key__in=emails).values_list("email_key", "pk")
+            ) if emails else {},
+            "assignees": set(users.filter(pk__in=assignee_ids).values_list("pk", flat=True)) if assignee_ids else set(),
+            "label_names": dict(labels.filter(name__in=label_names).values_list("name", "pk")) if label_names else {},
+            "labels": set(labels.filter(pk__in=label_ids).values_list("pk", flat=True)) if label_ids else set(),
+            "sprints": set(
+                Sprint.objects.filter(board=board, pk__in=sprint_ids).values_list("pk", flat=True)
+            ) if sprint_ids else set(),
+            "parents": set(
+                Task.objects.filter(board=board, is_deleted=False, pk__in=parent_ids).values_list("pk", flat=True)
+            ) if parent_ids else set(),
+        }
+
+    @staticmethod
+    def _build(row: Dict, refs: Dict[str, Dict]) -> Tuple[Optional[Dict], List[str]]:
+        errors = []
+        email = row.get("assignee_email")
+        if email:
+            if email.lower() in refs["emails"]:
+                row["assignee_id"] = refs["emails"][email.lower()]
+            else:
+                errors.append(f"Unknown assignee email: {email}")
+        elif row.get("assignee_id") is not None and row["assignee_id"] not in refs["assignees"]:
+            errors.append(f"Unknown assignee: {row['assignee_id']}")
+        if row.get("sprint_id") is not None and row["sprint_id"] not in refs["sprints"]:
+            errors.append(f"Sprint not found on this board: {row['sprint_id']}")
+        if row.get("parent_id") is not None and row["parent_id"] not in refs["parents"]:
+            errors.append(f"Parent task not found on this board: {row['parent_id']}")
+
+        label_ids = [label_id for label_id in row.get("label_ids") or () if label_id in refs["labels"]]
+        for name in row.get("label_names") or ():
+            if name in refs["label_names"]:
+                label_ids.append(refs["label_names"][name])
+            else:
+                errors.append(f"Unknown label: {name}")
+        if errors:
+            return None, errors
+        item = {field: row[field] for field in TaskIn.model_fields if field in row}
+        item["label_ids"] = list(dict.fromkeys(label_ids)) or None
+        return item, []
+
+    @staticmethod
+    def _validate(raw) -> Tuple[Optional[Dict], List[str]]:
+        if not isinstance(raw, dict):
+            return None, ["Expected an object"]
+        try:
+            row = normalize_row(raw)
+            # Validates and coerces every TaskIn field; reference columns are kept alongside
+            validated = TaskIn.model_validate(row).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            return None, [
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in e.errors()
+            ]
+        row.update(validated)
+        return row, []
+
+    @staticmethod
+    def import_rows(
+        board: Board,
+        user: CustomUser,
+        records: Iterable[Dict],
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ) -> Dict:
+        result = {"created": 0, "failed": 0, "chunks": 0, "task_ids": [], "errors": [], "parse_error": None}
+
+        def fail(number, messages):
+            result["failed"] += 1
+            if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                result["errors"].append({"row": number, "errors": messages})
+
+        def numbered():
+            # Malformed input ends the import; the rows read before it are still written
+            number = 0
+            try:
+                for number, raw in enumerate(records, start=1):
+                    yield number, raw
+            except HttpError as e:
+                result["parse_error"] = f"Row {number + 1}: {e.message}"
+
+        rows = numbered()
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            valid = []
+            for number, raw in chunk:
+                row, errors = TaskImportService._validate(raw)
+                if errors:
+                    fail(number, errors)
+                else:
+                    valid.append((number, row))
+
+            refs = TaskImportService._resolve(board, valid)
+            items = []
+            for number, row in valid:
+                item, errors = TaskImportService._build(row, refs)
+                if errors:
+                    fail(number, errors)
+                else:
+                    items.append(item)
+            if not items:
+                continue
+
+            tasks = TaskBulkService.create_tasks(board, user, items, summarize=True)
+            result["created"] += len(tasks)
+            result["chunks"] += 1
+            result["task_ids"].extend(task.pk for task in tasks)
+        return result
@@ -0,0 +1,143 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Coalesce, NullIf
+from ninja.errors import HttpError
+
+from accounts.models import CustomUser
+from projects.api.v1.utils.pagination import paginate_queryset
+from projects.api.v1.utils.permissions import projects_with_permissions
+from projects.models import Comment, Project, Task
+
+SEARCH_CONFIG = getattr(settings, "SEARCH_CONFIG", "english")
+
+# kind -> model, weighted source fields, and what to show in a hit
+SEARCH_DOCUMENTS = {
+    "task": {"model": Task, "vector": (("title", "A"), ("description", "B")), "title": "title", "body": "description"},
+    "comment": {"model": Comment, "vector": (("content", "A"),), "title": "task__title", "body": "content"},
+    "project": {"model": Project, "vector": (("name", "A"), ("description", "B")), "title": "name", "body": "description"},
+}
+MODEL_DOCUMENTS = {spec["model"]: spec for spec in SEARCH_DOCUMENTS.values()}
+
+SEARCH_BACKFILL_BATCH_SIZE = 1000
+
+HEADLINE_OPTIONS = {"start_sel": "<mark>", "stop_sel": "</mark>", "max_words": 35, "min_words": 15, "max_fragments": 2}
+
+
+def search_permission(kind: str) -> str:
+    return f"view_{SEARCH_DOCUMENTS[kind]['model']._meta.model_name}"
+
+
+def search_source_fields(model) -> set:
+    return {field for field, _ in MODEL_DOCUMENTS[model]["vector"]}
+
+
+def search_vector_expression(model):
+    vector = None
+    for field, weight in MODEL_DOCUMENTS[model]["vector"]:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def refresh_search_vectors(model, pks: Iterable[int]) -> None:
+    """Recompute the stored tsvector for `pks` in one UPDATE (Postgres only)."""
+    pks = list(pks)
+    if not pks or connections[model.objects.db].vendor != "postgresql":
+        return
+    model.objects.filter(pk__in=pks).update(search_vector=search_vector_expression(model))
+
+
+class SearchService:
+    @staticmethod
+    def _matches(kind: str, query: SearchQuery, user: CustomUser, project_ids: List[int]):
+        spec = SEARCH_DOCUMENTS[kind]
+        model = spec["model"]
+        qs = model.objects.filter(tenant_id=user.tenant_id, search_vector=query)
+        if model is Project:
+            qs = qs.filter(id__in=project_ids)
+        else:
+            qs = qs.filter(project_id__in=project_ids)
+        if model is Task:
+            qs = qs.filter(is_deleted=False)
+        elif model is Comment:
+            qs = qs.filter(task__is_deleted=False)
+        return qs.annotate(
+            kind=Value(kind, output_field=CharField()),
+            rank=SearchRank(F("search_vector"), query),
+        ).values("id", "kind", "rank")
+
+    @staticmethod
+    def _hydrate(kind: str, ids: List[int], query: SearchQuery) -> Dict[int, dict]:
+        spec = SEARCH_DOCUMENTS[kind]
+        model = spec["model"]
+        source = Coalesce(NullIf(F(spec["body"]), Value("")), F(spec["title"]))
+        columns = ["id", "created_at"]
+        if model is not Project:
+            columns.append("project_id")
+        if model is Comment:
+            columns.append("task_id")
+        if model is Task:
+            columns.append("board_id")
+        rows = (
+            model.objects.filter(id__in=ids)
+            .annotate(
+                hit_title=F(spec["title"]),
+                highlight=SearchHeadline(source, query, config=SEARCH_CONFIG, **HEADLINE_OPTIONS),
+            )
+            .values(*columns, "hit_title", "highlight")
+        )
+        return {row["id"]: row for row in rows}
+
+    @staticmethod
+    def search(
+        user: CustomUser,
+        text: str,
+        kinds: Optional[Sequence[str]] = None,
+        page: int = 1,
+        limit: int = 20,
+    ) -> Tuple[List[dict], dict]:
+        """
+        Ranked, tenant- and membership-scoped hits across tasks, comments and
+        projects. Ranking and pagination run on the GIN-indexed vectors; the
+        (costly) headlines are only computed for the rows on the page.
+        """
+        unknown = sorted(set(kinds or ()) - SEARCH_DOCUMENTS.keys())
+        if unknown:
+            raise HttpError(400, f"Unknown kind: {', '.join(unknown)}. Expected {', '.join(SEARCH_DOCUMENTS)}.")
+        kinds = list(dict.fromkeys(kinds or SEARCH_DOCUMENTS))
+        query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+        # Each kind only reaches the projects whose role grants view_<kind>, as its own endpoints do
+        permitted = projects_with_permissions(user.pk, (search_permission(kind) for kind in kinds))
+        parts = [SearchService._matches(kind, query, user, permitted[search_permission(kind)]) for kind in kinds]
+        matches = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+        matches = matches.order_by("-rank", "kind", "id")
+
+        page_rows, meta = paginate_queryset(matches, page, limit)
+
+        ids_by_kind = defaultdict(list)
+        for row in page_rows:
+            ids_by_kind[row["kind"]].append(row["id"])
+        details = {kind: SearchService._hydrate(kind, ids, query) for kind, ids in ids_by_kind.items()}
+
+        hits = []
+        for row in page_rows:
+            detail = details[row["kind"]].get(row["id"])
+            if detail is None:
+                continue
+            hits.append({
+                "kind": row["kind"],
+                "id": row["id"],
+                "rank": row["rank"],
+                "title": detail["hit_title"] or "",
+                "highlight": detail["highlight"] or "",
+                "project_id": detail.get("project_id", row["id"]),
+                "board_id": detail.get("board_id"),
+                "task_id": detail.get("task_id") if row["kind"] == "comment" else (row["id"] if row["kind"] == "task" else None),
+                "created_at": detail["created_at"],
+            })
+        return hits, meta
@@ -0,0 +1,174 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from projects.models import Sprint, SprintSnapshot, Task
+
+DONE_STATUS = "done"
+SNAPSHOT_COUNTERS = ("total_points", "completed_points", "total_tasks", "completed_tasks")
+SNAPSHOT_STATE_FIELDS = ("sprint_id", "story_points", "status", "is_deleted", "tenant_id")
+
+
+def task_state(task) -> Dict:
+    """The parts of a task that feed sprint analytics."""
+    return {field: getattr(task, field) for field in SNAPSHOT_STATE_FIELDS}
+
+
+def _contribution(state: Optional[Dict]) -> Tuple[Optional[int], Tuple[int, int, int, int]]:
+    if not state or not state.get("sprint_id") or state.get("is_deleted"):
+        return None, (0, 0, 0, 0)
+    points = state.get("story_points") or 0
+    done = state.get("status") == DONE_STATUS
+    return state["sprint_id"], (points, points if done else 0, 1, 1 if done else 0)
+
+
+def collect_deltas(changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]]) -> Tuple[Dict[int, List[int]], Dict[int, int]]:
+    """Fold (old_state, new_state) pairs into per-sprint counter deltas (and each sprint's tenant)."""
+    deltas = defaultdict(lambda: [0, 0, 0, 0])
+    tenants = {}
+    for old, new in changes:
+        for state, sign in ((old, -1), (new, 1)):
+            sprint_id, values = _contribution(state)
+            if sprint_id is None:
+                continue
+            tenants[sprint_id] = state.get("tenant_id")
+            for i, value in enumerate(values):
+                deltas[sprint_id][i] += sign * value
+    return {sprint_id: delta for sprint_id, delta in deltas.items() if any(delta)}, tenants
+
+
+def _live_totals(sprint_id: int) -> Dict[str, int]:
+    totals = Task.objects.filter(sprint_id=sprint_id, is_deleted=False).aggregate(
+        total_points=Sum("story_points"),
+        completed_points=Sum("story_points", filter=Q(status=DONE_STATUS)),
+        total_tasks=Count("id"),
+        completed_tasks=Count("id", filter=Q(status=DONE_STATUS)),
+    )
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def _ensure_today_row(sprint_id: int, tenant_id: Optional[int], today: date) -> bool:
+    """
+    Make sure today's row exists. Returns True when it had to be seeded from
+    live task data, which already includes the change being recorded.
+    """
+    if SprintSnapshot.objects.filter(sprint_id=sprint_id, date=today).exists():
+        return False
+    previous = (
+        SprintSnapshot.objects.filter(sprint_id=sprint_id, date__lt=today)
+        .order_by("-date")
+        .values(*SNAPSHOT_COUNTERS)
+        .first()
+    )
+    seeded_from_live = previous is None
+    values = _live_totals(sprint_id) if seeded_from_live else previous
+    try:
+        with transaction.atomic():
+            SprintSnapshot.objects.create(sprint_id=sprint_id, tenant_id=tenant_id, date=today, **values)
+    except IntegrityError:
+        # Another writer created it first; apply our delta on top of theirs
+        return False
+    return seeded_from_live
+
+
+def record_task_changes(changes: Iterable[Tuple[Optional[Dict], Optional[Dict]]]) -> None:
+    """
+    Fold task state transitions into today's sprint snapshots.
+    `changes` holds (old_state, new_state) pairs; None means "did not exist".
+    """
+    deltas, tenants = collect_deltas(changes)
+    if not deltas:
+        return
+    today = timezone.localdate()
+    for sprint_id, delta in deltas.items():
+        if _ensure_today_row(sprint_id, tenants.get(sprint_id), today):
+            continue
+        SprintSnapshot.objects.filter(sprint_id=sprint_id, date=today).update(
+            **{counter: F(counter) + value for counter, value in zip(SNAPSHOT_COUNTERS, delta)}
+        )
+
+
+class SprintAnalyticsService:
+    @staticmethod
+    def series(sprint: Sprint) -> List[Dict]:
+        """
+        One point per sprint day up to today, carrying the last known totals
+        across days without changes. O(days) regardless of task count.
+        """
+        today = timezone.localdate()
+        end = min(sprint.end_date, today)
+        rows = list(
+            SprintSnapshot.objects.filter(sprint=sprint, date__lte=end).order_by("date").values("date", *SNAPSHOT_COUNTERS)
+        )
+        if not rows:
+            return []
+
+        by_date = {row["date"]: row for row in rows}
+        # Opening scope: the last row on or before the start date, else the first one recorded
+        current = rows[0]
+        for row in rows:
+            if row["date"] > sprint.start_date:
+                break
+            current = row
+
+        series = []
+        day = sprint.start_date
+        while day <= end:
+            current = by_date.get(day, current)
+            series.append({
+                "date": day,
+                **{counter: current[counter] for counter in SNAPSHOT_COUNTERS},
+                "remaining_points": current["total_points"] - current["completed_points"],
+            })
+            day += timedelta(days=1)
+        return series
+
+    @staticmethod
+    def burndown(sprint: Sprint) -> Dict:
+        series = SprintAnalyticsService.series(sprint)
+        days = (sprint.end_date - sprint.start_date).days or 1
+        committed = series[0]["total_points"] if series else 0
+        for point in series:
+            elapsed = (point["date"] - sprint.start_date).days
+            point["ideal_points"] = round(committed * max(days - elapsed, 0) / days, 2)
+        return {"sprint_id": sprint.pk, "committed_points": committed, "points": series}
+
+    @staticmethod
+    def burnup(sprint: Sprint) -> Dict:
+        series = SprintAnalyticsService.series(sprint)
+        return {"sprint_id": sprint.pk, "committed_points": series[0]["total_points"] if series else 0, "points": series}
+
+    @staticmethod
+    def velocity(board_id: int, last: int = 5) -> Dict:
+        """Completed vs committed points of the board's last `last` closed sprints."""
+        closing_row = SprintSnapshot.objects.filter(sprint=OuterRef("pk"), date__lte=OuterRef("end_date")).order_by("-date")
+        opening_row = SprintSnapshot.objects.filter(sprint=OuterRef("pk"), date__lte=OuterRef("start_date")).order_by("-date")
+        first_row = SprintSnapshot.objects.filter(sprint=OuterRef("pk")).order_by("date")
+        sprints = list(
+            Sprint.objects.filter(board_id=board_id, status="closed")
+            .order_by("-end_date", "-id")
+            .annotate(
+                completed_points=Subquery(closing_row.values("completed_points")[:1]),
+                committed_points=Subquery(opening_row.values("total_points")[:1]),
+                first_total_points=Subquery(first_row.values("total_points")[:1]),
+            )
+            .values("id", "name", "start_date", "end_date", "completed_points", "committed_points", "first_total_points")[:last]
+        )
+        results = [
+            {
+                "sprint_id": sprint["id"],
+                "name": sprint["name"],
+                "start_date": sprint["start_date"],
+                "end_date": sprint["end_date"],
+                "completed_points": sprint["completed_points"] or 0,
+                "committed_points": sprint["committed_points"] if sprint["committed_points"] is not None
+                else (sprint["first_total_points"] or 0),
+            }
+            for sprint in sprints
+        ]
+        average = round(sum(s["completed_points"] for s in results) / len(results), 2) if results else 0
+        return {"board_id": board_id, "average_velocity": average, "sprints": results}
@@ -0,0 +1,184 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.http import Http404
+from django.utils import timezone
+from ninja.errors import HttpError
+
+from accounts.models import CustomUser
+from projects.api.v1.services import audit
+from projects.api.v1.services.search import refresh_search_vectors, search_source_fields
+from projects.api.v1.services.hierarchy import ROLLUP_SOURCE_FIELDS, TaskHierarchyService
+from projects.api.v1.services.sprint_analytics import record_task_changes, task_state
+from projects.api.v1.utils.versioning import bump_version_on_commit
+from projects.models import Board, Label, Sprint, Task
+from projects.signals import build_activity_log, build_import_log
+
+TaskLabel = Task.labels.through
+
+BULK_BATCH_SIZE = 500
+
+# Row key -> (error message, what on the board's tenant/project it may point at)
+REFERENCE_LOOKUPS = {
+    "sprint_id": ("Sprints not found on this board", lambda board: Sprint.objects.filter(board=board)),
+    "assignee_id": ("Assignees not found", lambda board: CustomUser.objects.filter(tenant_id=board.tenant_id)),
+    "parent_id": (
+        "Parent tasks not found on this board", lambda board: Task.objects.filter(board=board, is_deleted=False)
+    ),
+    "label_ids": (
+        "Labels not found in this project",
+        lambda board: Label.objects.filter(tenant_id=board.tenant_id, project_id=board.project_id),
+    ),
+}
+
+
+class TaskBulkService:
+    """
+    Set-based task writes: one transaction, bulk_create/bulk_update and a
+    single batched ActivityLog insert (after commit) instead of per-row save() signals.
+    """
+
+    @staticmethod
+    def _validate_references(board: Board, rows: Iterable[Dict]) -> None:
+        """Reject, up front, any sprint, assignee, parent or label a row names that `board` cannot use."""
+        wanted = {key: set() for key in REFERENCE_LOOKUPS}
+        for row in rows:
+            for key in ("sprint_id", "assignee_id", "parent_id"):
+                if row.get(key) is not None:
+                    wanted[key].add(row[key])
+            wanted["label_ids"].update(row.get("label_ids") or ())
+        for key, ids in wanted.items():
+            if not ids:
+                continue
+            message, scope = REFERENCE_LOOKUPS[key]
+            found = set(scope(board).filter(pk__in=ids).values_list("pk", flat=True))
+            missing = ids - found
+            if missing:
+                raise HttpError(400, f"{message}: {sorted(missing)}")
+
+    @staticmethod
+    def _set_labels(labels_by_task: Dict[int, List[int]], replace: bool = False) -> None:
+        if not labels_by_task:
+            return
+        if replace:
+            TaskLabel.objects.filter(task_id__in=labels_by_task.keys()).delete()
+        TaskLabel.objects.bulk_create(
+            [
+                TaskLabel(task_id=task_id, label_id=label_id)
+                for task_id, label_ids in labels_by_task.items()
+                for label_id in dict.fromkeys(label_ids)
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def create_tasks(board: Board, user: CustomUser, items: List[Dict], summarize: bool = False) -> List[Task]:
+        """
+        Create tasks on `board` from TaskIn-shaped dicts (`label_ids` included).
+        With `summarize`, the batch is audited as a single "imported" entry on
+        the board instead of one "created" entry per task.
+        """
+        TaskBulkService._validate_references(board, items)
+        tasks = [
+            Task(
+                board=board,
+                project_id=board.project_id,
+                tenant_id=board.tenant_id,
+                created_by=user,
+                updated_by=user,
+                **{key: value for key, value in item.items() if key != "label_ids"}
+            )
+            for item in items
+        ]
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks, batch_size=BULK_BATCH_SIZE)
+            TaskBulkService._set_labels(
+                {task.pk: item["label_ids"] for task, item in zip(tasks, items) if item.get("label_ids")},
+            )
+            if summarize:
+                audit.record(build_import_log(board, tasks, actor=user))
+            else:
+                audit.record_many(build_activity_log(task, "created", actor=user) for task in tasks)
+            refresh_search_vectors(Task, [task.pk for task in tasks])
+            record_task_changes((None, task_state(task)) for task in tasks)
+            TaskHierarchyService.refresh_rollups(task.parent_id for task in tasks)
+            bump_version_on_commit("board", board.pk)
+        return tasks
+
+    @staticmethod
+    def update_tasks(board: Board, user: CustomUser, updates: Dict[int, Dict]) -> List[Task]:
+        """
+        Apply per-task field updates `{task_id: {field: value, ...}}`.
+        A `label_ids` entry replaces that task's labels.
+        """
+        tasks = Task.objects.filter(board=board, is_deleted=False).in_bulk(list(updates.keys()))
+        missing = set(updates) - set(tasks)
+        if missing:
+            raise Http404(f"Tasks not found on this board: {sorted(missing)}")
+        TaskBulkService._validate_references(board, updates.values())
+        TaskHierarchyService.validate_parents(
+            {task_id: data["parent_id"] for task_id, data in updates.items() if "parent_id" in data}
+        )
+
+        label_updates = {
+            task_id: data["label_ids"] for task_id, data in updates.items() if data.get("label_ids") is not None
+        }
+        current_labels = defaultdict(set)
+        for task_id, label_id in TaskLabel.objects.filter(task_id__in=label_updates).values_list("task_id", "label_id"):
+            current_labels[task_id].add(label_id)
+
+        now = timezone.now()
+        changed_fields = set()
+        reindex = []
+        logs = []
+        sprint_changes = []
+        rollup_parents = set()
+        for task_id, data in updates.items():
+            task = tasks[task_id]
+            old_state = task_state(task)
+            old_parent_id = task.parent_id
+            changes = {}
+            for field, value in data.items():
+                if field == "label_ids":
+                    continue
+                old = getattr(task, field)
+                if old != value:
+                    changes[field] = {"old": old, "new": value}
+                    setattr(task, field, value)
+            if changes:
+                task.updated_by = user
+                task.updated_at = now
+                changed_fields.update(changes)
+                if search_source_fields(Task) & set(changes):
+                    reindex.append(task_id)
+                sprint_changes.append((old_state, task_state(task)))
+                if set(changes) & set(ROLLUP_SOURCE_FIELDS):
+                    rollup_parents.update((old_parent_id, task.parent_id))
+            logged = dict(changes)
+            if task_id in label_updates and set(label_updates[task_id]) != current_labels[task_id]:
+                # Not a column, so only the audit entry carries it (history replay skips such keys)
+                logged["label_ids"] = {"old": sorted(current_labels[task_id]), "new": sorted(set(label_updates[task_id]))}
+            if logged:
+                logs.append(build_activity_log(task, "updated", changes=logged, actor=user))
+
+        with transaction.atomic():
+            if changed_fields:
+                Task.objects.bulk_update(
+                    [tasks[task_id] for task_id in updates],
+                    fields=sorted(changed_fields) + ["updated_by", "updated_at"],
+                    batch_size=BULK_BATCH_SIZE,
+                )
+            TaskBulkService._set_labels(label_updates, replace=True)
+            audit.record_many(logs)
+            refresh_search_vectors(Task, reindex)
+            record_task_changes(sprint_changes)
+            TaskHierarchyService.refresh_rollups(rollup_parents)
+            bump_version_on_commit("board", board.pk)
+        return [tasks[task_id] for task_id in updates]
+
+    @staticmethod
+    def move_tasks(board: Board, user: CustomUser, task_ids: List[int], values: Dict) -> List[Task]:
+        """Set the same sprint and/or status on many tasks (sprint close, board drag)."""
+        return TaskBulkService.update_tasks(board, user, {task_id: dict(values) for task_id in task_ids})
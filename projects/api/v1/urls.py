@@ -3,15 +3,18 @@
 from django.urls import path
 from ninja import NinjaAPI
 from accounts.api.v1.utils.exceptions import register_custom_exception_handlers
+from accounts.api.v1.utils.renderers import FastJSONRenderer
 from projects.api.v1.views.projects import projects_api
 from projects.api.v1.views.roles import role_api
+from projects.api.v1.views.search import search_api
 
 from accounts.api.v1.services.auth import JWTAuth
 
 
-api = NinjaAPI(title="Project Management Tool API", version="1.0")
+api = NinjaAPI(title="Project Management Tool API", version="1.0", renderer=FastJSONRenderer())
 api.add_router("project/", projects_api)
 api.add_router("roles/", role_api)
+api.add_router("search/", search_api)
 
 register_custom_exception_handlers(api)
 urlpatterns = [
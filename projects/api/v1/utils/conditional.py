@@ -0,0 +1,107 @@
+import hashlib
+from functools import wraps
+from typing import Optional, Tuple, Type
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Model
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import parse_etags
+from django.utils.http import http_date, parse_http_date_safe
+
+from projects.api.v1.utils.versioning import VersionSpec, get_versions, version_pairs
+
+
+def _make_etag(request, tokens) -> str:
+    digest = hashlib.sha1(request.get_full_path().encode())
+    for token in tokens:
+        digest.update(b":" + str(token).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    # If-None-Match uses the weak comparison: W/"x" and "x" are equal
+    candidates = parse_etags(if_none_match)
+    if "*" in candidates:
+        return True
+    bare = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == bare for candidate in candidates)
+
+
+def _last_modified(model: Type[Model], pk) -> Optional[int]:
+    updated_at = model.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+    return int(updated_at.timestamp()) if updated_at else None
+
+
+def _set_validators(response: HttpResponse, etag: Optional[str], modified: Optional[int]) -> None:
+    if etag:
+        response.headers["ETag"] = etag
+    if modified is not None:
+        response.headers["Last-Modified"] = http_date(modified)
+    # Per-user API data: browsers may keep it but must revalidate, shared caches must not
+    response.headers.setdefault("Cache-Control", "private, no-cache")
+
+
+def conditional_get(
+    versions: VersionSpec = (),
+    last_modified: Optional[Tuple[Type[Model], str]] = None,
+):
+    """
+    Decorator adding ETag / Last-Modified validators and 304 responses to a GET view.
+
+    Args:
+        versions: (scope, kwarg) pairs naming the version stamps the response
+            depends on, e.g. [("board", "board_id")], or a callable taking the
+            view kwargs and returning (scope, pk) pairs. The weak ETag is built
+            from those stamps and the full path, so a matching If-None-Match
+            is answered before the view runs any query.
+        last_modified: (model, kwarg) whose row `updated_at` drives
+            Last-Modified / If-Modified-Since; costs one single-column lookup.
+
+    Place it below `require_project_permission` so only authorized callers
+    learn whether anything changed. Views returning plain objects should
+    declare `response: HttpResponse` to receive the validator headers.
+    """
+    if last_modified and not any(field.name == "updated_at" for field in last_modified[0]._meta.get_fields()):
+        raise ImproperlyConfigured(f"{last_modified[0].__name__} has no updated_at field for Last-Modified.")
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view_func(request, *args, **kwargs)
+
+            etag = None
+            if versions:
+                pairs = version_pairs(versions, kwargs)
+                stamps = get_versions(*pairs)
+                etag = _make_etag(request, (stamps[pair] for pair in pairs))
+
+            modified = None
+            if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+            if_modified_since = request.META.get("HTTP_IF_MODIFIED_SINCE")
+            if etag and if_none_match:
+                # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)
+                if _etag_matches(etag, if_none_match):
+                    response = HttpResponseNotModified()
+                    _set_validators(response, etag, None)
+                    return response
+            elif last_modified and if_modified_since:
+                model, kwarg = last_modified
+                modified = _last_modified(model, kwargs.get(kwarg))
+                since = parse_http_date_safe(if_modified_since)
+                if modified is not None and since is not None and modified <= since:
+                    response = HttpResponseNotModified()
+                    _set_validators(response, etag, modified)
+                    return response
+
+            result = view_func(request, *args, **kwargs)
+
+            target = result if isinstance(result, HttpResponse) else kwargs.get("response")
+            if isinstance(target, HttpResponse) and target.status_code == 200:
+                if last_modified and modified is None:
+                    model, kwarg = last_modified
+                    modified = _last_modified(model, kwargs.get(kwarg))
+                _set_validators(target, etag, modified)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+import logging
+logger = logging.getLogger("api")
+
+COUNT_STRATEGIES = ("exact", "estimate", "cached")
+COUNT_STRATEGY_PATTERN = "^(exact|estimate|cached)$"
+
+COUNT_CACHE_TTL = getattr(settings, "PAGINATION_COUNT_CACHE_TTL", 60)
+# Stale counts are still served (and refreshed in the background) for this long
+COUNT_CACHE_STALE_TTL = getattr(settings, "PAGINATION_COUNT_CACHE_STALE_TTL", 60 * 60)
+
+
+def count_queryset(queryset: QuerySet, strategy: str = "exact") -> Tuple[int, bool]:
+    """
+    Count `queryset` using `strategy`. Returns (count, is_exact).
+    Strategies that cannot be served fall back to an exact COUNT(*).
+    """
+    queryset = queryset.order_by()
+    if strategy == "estimate":
+        estimate = estimate_count(queryset)
+        if estimate is not None:
+            return estimate, False
+    elif strategy == "cached":
+        return cached_count(queryset)
+    return queryset.count(), True
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """Planner row estimate (Postgres EXPLAIN) for `queryset`, None if unavailable."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    try:
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"Count estimate failed, falling back to exact count: {e}")
+        return None
+
+
+def _count_cache_key(queryset: QuerySet) -> str:
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha1(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+    return f"qs-count:{digest}"
+
+
+def _refresh_count(queryset: QuerySet, key: str) -> int:
+    count = queryset.count()
+    cache.set(key, (count, time.time()), COUNT_CACHE_STALE_TTL)
+    return count
+
+
+def _refresh_count_in_background(queryset: QuerySet, key: str) -> None:
+    def run():
+        try:
+            _refresh_count(queryset, key)
+        except Exception as e:
+            logger.warning(f"Background count refresh failed: {e}")
+        finally:
+            connections.close_all()
+            cache.delete(f"{key}:lock")
+
+    # Only one refresh per key at a time across workers
+    if cache.add(f"{key}:lock", 1, COUNT_CACHE_TTL):
+        threading.Thread(target=run, daemon=True).start()
+
+
+def cached_count(queryset: QuerySet) -> Tuple[int, bool]:
+    """
+    Exact count cached for COUNT_CACHE_TTL seconds. Older entries are served
+    as-is while a background thread recomputes them (stale-while-revalidate).
+    """
+    key = _count_cache_key(queryset)
+    entry = cache.get(key)
+    if entry is None:
+        return _refresh_count(queryset, key), True
+
+    count, computed_at = entry
+    if time.time() - computed_at > COUNT_CACHE_TTL:
+        _refresh_count_in_background(queryset, key)
+    return count, False
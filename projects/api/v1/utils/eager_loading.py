@@ -0,0 +1,99 @@
+from functools import lru_cache
+from typing import Any, List, Tuple, Type, Union, get_args, get_origin
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Prefetch, QuerySet
+from pydantic import BaseModel
+
+
+class EagerLoadPlan:
+    """select_related / prefetch_related / annotate calls derived from an output schema."""
+
+    def __init__(self, select_related=(), prefetch_related=(), counts=()):
+        self.select_related: Tuple[str, ...] = tuple(select_related)
+        self.prefetch_related: Tuple[Any, ...] = tuple(prefetch_related)
+        self.counts: Tuple[Tuple[str, str], ...] = tuple(counts)  # (alias, relation)
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.counts:
+            queryset = queryset.annotate(
+                **{alias: Count(relation, distinct=True) for alias, relation in self.counts}
+            )
+        return queryset
+
+    def __repr__(self):
+        return (
+            f"EagerLoadPlan(select_related={self.select_related}, "
+            f"prefetch_related={self.prefetch_related}, counts={self.counts})"
+        )
+
+
+def _nested_schema(annotation) -> Union[Type[BaseModel], None]:
+    """Return the BaseModel inside Optional[...] / List[...] annotations, if any."""
+    origin = get_origin(annotation)
+    if origin is not None:
+        for arg in get_args(annotation):
+            nested = _nested_schema(arg)
+            if nested is not None:
+                return nested
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _relation(opts, name: str):
+    try:
+        return opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _collect(schema: Type[BaseModel], model, prefix: str, depth: int, select: List[str], prefetch: List[Any], counts: List):
+    opts = model._meta
+    for name, info in schema.model_fields.items():
+        nested = _nested_schema(info.annotation)
+        field = _relation(opts, name)
+
+        # Nested object: created_by -> UsersDetail
+        if field is not None and field.is_relation and nested is not None:
+            path = f"{prefix}{name}"
+            if field.many_to_one or field.one_to_one:
+                select.append(path)
+                if depth > 0:
+                    _collect(nested, field.related_model, f"{path}__", depth - 1, select, prefetch, counts)
+            else:
+                prefetch.append(path)
+            continue
+
+        # Id lists of to-many relations: label_ids -> labels
+        if name.endswith("_ids"):
+            base = name[: -len("_ids")]
+            relation = _relation(opts, f"{base}s") or _relation(opts, base)
+            if relation is not None and (relation.many_to_many or relation.one_to_many):
+                prefetch.append(Prefetch(
+                    f"{prefix}{relation.name}",
+                    queryset=relation.related_model.objects.only("pk"),
+                ))
+            continue
+
+        # Counters of to-many relations: comments_count -> Count("comments")
+        if name.endswith("_count") and not prefix:
+            relation = _relation(opts, name[: -len("_count")])
+            if relation is not None and (relation.many_to_many or relation.one_to_many):
+                counts.append((name, relation.name))
+
+
+@lru_cache(maxsize=256)
+def build_eager_load_plan(schema: Type[BaseModel], model, depth: int = 2) -> EagerLoadPlan:
+    """
+    Inspect `schema` against `model` and plan the joins, prefetches and
+    annotations needed to serialize a page in a constant number of queries.
+    """
+    select, prefetch, counts = [], [], []
+    _collect(schema, model, "", depth, select, prefetch, counts)
+    return EagerLoadPlan(select, prefetch, counts)
@@ -0,0 +1,165 @@
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from pydantic import BaseModel, TypeAdapter, create_model
+
+from projects.api.v1.utils.eager_loading import _nested_schema
+from projects.api.v1.utils.fieldsets import _get_resolver
+from projects.api.v1.utils.pagination import DEFAULT_KEYSET, paginate_queryset
+
+FAST_READ_VALUES = getattr(settings, "FAST_READ_VALUES", False)
+
+
+class ValuesPlan:
+    """
+    How to read `schema` straight from `.values()` rows: the columns to
+    select, nested objects to fold back into dicts, and id lists to fetch
+    from the relation tables.
+    """
+
+    def __init__(self, columns, nested, id_lists):
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self.nested: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(nested)  # (field, subfields)
+        self.id_lists: Tuple[Tuple[str, Any], ...] = tuple(id_lists)  # (field, m2m field)
+
+    def shape(self, rows: List[Dict]) -> List[Dict]:
+        """Fold `created_by__email`-style keys into nested dicts and attach id lists, in place."""
+        for name, subfields in self.nested:
+            keys = [(sub, f"{name}__{sub}") for sub in subfields]
+            for row in rows:
+                nested = {sub: row.pop(key) for sub, key in keys}
+                row[name] = nested if nested.get("id") is not None else None
+
+        for name, relation in self.id_lists:
+            through = relation.remote_field.through
+            source = relation.m2m_field_name()
+            target = relation.m2m_reverse_field_name()
+            ids = defaultdict(list)
+            pairs = (
+                through.objects.filter(**{f"{source}_id__in": [row["id"] for row in rows]})
+                .order_by(f"{source}_id", f"{target}_id")
+                .values_list(f"{source}_id", f"{target}_id")
+            )
+            for owner_id, related_id in pairs:
+                ids[owner_id].append(related_id)
+            for row in rows:
+                row[name] = ids.get(row["id"], [])
+        return rows
+
+
+def _model_field(opts, name: str):
+    try:
+        return opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+@lru_cache(maxsize=256)
+def build_values_plan(schema: Type[BaseModel], model) -> Optional[ValuesPlan]:
+    """
+    Plan a values() read for `schema` on `model`, or None when some field
+    needs a model instance (computed resolvers, reverse FKs, deeper nesting).
+    """
+    opts = model._meta
+    columns, nested, id_lists = [], [], []
+    for name, info in schema.model_fields.items():
+        field = _model_field(opts, name)
+        nested_schema = _nested_schema(info.annotation)
+
+        # Many-to-many id lists: label_ids -> labels
+        if name.endswith("_ids") and field is None:
+            relation = _model_field(opts, f"{name[:-len('_ids')]}s") or _model_field(opts, name[:-len("_ids")])
+            if relation is None or not relation.many_to_many or relation.auto_created:
+                return None
+            id_lists.append((name, relation))
+            continue
+
+        if _get_resolver(schema, name) is not None:
+            return None
+
+        # One level of nested FK object: created_by -> UsersDetail
+        if field is not None and nested_schema is not None and (field.many_to_one or field.one_to_one):
+            related_opts = field.related_model._meta
+            subfields = tuple(nested_schema.model_fields)
+            if "id" not in subfields or any(
+                _model_field(related_opts, sub) is None or _model_field(related_opts, sub).is_relation
+                for sub in subfields
+            ):
+                return None
+            columns.extend(f"{name}__{sub}" for sub in subfields)
+            nested.append((name, subfields))
+            continue
+
+        # Plain columns, by name or attname (assignee_id); JSON columns may carry a nested schema
+        if field is None:
+            field = next((f for f in opts.concrete_fields if f.attname == name), None)
+        if field is None or not field.concrete or field.many_to_many or (nested_schema is not None and field.is_relation):
+            return None
+        columns.append(field.attname if field.attname == name else field.name)
+    return ValuesPlan(columns, nested, id_lists)
+
+
+def _row_annotation(annotation):
+    origin = get_origin(annotation)
+    if origin is not None:
+        args = tuple(_row_annotation(arg) for arg in get_args(annotation))
+        if origin is Union:
+            return Union[args]
+        return origin[args if len(args) > 1 else args[0]]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return row_model(annotation)
+    return annotation
+
+
+@lru_cache(maxsize=256)
+def row_model(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Plain pydantic twin of a ninja Schema: same fields, defaults and
+    constraints, so it dumps to the same JSON, but without the per-row
+    DjangoGetter wrapper that Schema validation goes through.
+    """
+    fields = {name: (_row_annotation(info.annotation), info) for name, info in schema.model_fields.items()}
+    return create_model(f"{schema.__name__}Row", __module__=schema.__module__, **fields)
+
+
+@lru_cache(maxsize=256)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[row_model(schema)])
+
+
+def paginate_schema(
+    queryset: QuerySet,
+    schema: Type[BaseModel],
+    *,
+    extra: Sequence[str] = (),
+    ordering: Sequence[str] = DEFAULT_KEYSET,
+    values: Optional[bool] = None,
+    **pagination,
+) -> Tuple[List[Any], List[BaseModel], Dict[str, Any]]:
+    """
+    Paginate `queryset` and validate the page into `schema`.
+
+    By default the page is read as model instances and validated per row.
+    With `values` (default: the FAST_READ_VALUES setting) and a schema that
+    maps onto plain columns, it is read with .values() instead and validated
+    in one TypeAdapter call against the schema's plain twin (`row_model`).
+    `extra` columns are read alongside for the caller. Returns
+    (rows, data, meta), where rows are dicts on the fast path.
+    """
+    if values is None:
+        values = FAST_READ_VALUES
+    plan = build_values_plan(schema, queryset.model) if values else None
+    if plan is None:
+        rows, meta = paginate_queryset(queryset, ordering=ordering, schema=schema, **pagination)
+        return rows, [schema.model_validate(row) for row in rows], meta
+
+    pk = queryset.model._meta.pk.attname
+    keyset = [pk if name.lstrip("-") == "pk" else name.lstrip("-") for name in ordering] + [pk]
+    columns = list(dict.fromkeys([*plan.columns, *keyset, *extra]))
+    rows, meta = paginate_queryset(queryset.values(*columns), ordering=ordering, **pagination)
+    rows = plan.shape(list(rows))
+    return rows, list_adapter(schema).validate_python(rows), meta
@@ -0,0 +1,90 @@
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Type
+
+from django.db.models import QuerySet
+from ninja import Schema
+from ninja.errors import HttpError
+
+
+def parse_fields(fields: Optional[str], schema: Type[Schema]) -> Optional[FrozenSet[str]]:
+    """
+    Parse a `fields=a,b,c` query parameter against `schema`.
+    Returns None when no projection was requested; `id` is always included.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise HttpError(400, f"Unknown fields for {schema.__name__}: {', '.join(sorted(unknown))}")
+    return frozenset(requested | {"id"})
+
+
+def _get_resolver(schema: Type[Schema], name: str):
+    for klass in schema.__mro__:
+        resolver = klass.__dict__.get(f"resolve_{name}")
+        if resolver is not None:
+            return resolver
+    return None
+
+
+@lru_cache(maxsize=256)
+def subset_schema(schema: Type[Schema], fields: Optional[FrozenSet[str]]) -> Type[Schema]:
+    """Derive (and memoize) a Schema exposing only `fields` of `schema`."""
+    if fields is None:
+        return schema
+    namespace = {"__annotations__": {}, "__module__": schema.__module__}
+    for name, info in schema.model_fields.items():
+        if name not in fields:
+            continue
+        namespace["__annotations__"][name] = info.annotation
+        namespace[name] = info
+        resolver = _get_resolver(schema, name)
+        if resolver is not None:
+            namespace[f"resolve_{name}"] = resolver
+    return type(f"{schema.__name__}Subset", (Schema,), namespace)
+
+
+def _select_related_paths(tree: dict, prefix: str = ""):
+    for name, children in tree.items():
+        path = f"{prefix}{name}"
+        if children:
+            yield from _select_related_paths(children, f"{path}__")
+        else:
+            yield path
+
+
+def project_queryset(
+    queryset: QuerySet,
+    fields: Optional[FrozenSet[str]],
+    always: Iterable[str] = (),
+) -> QuerySet:
+    """
+    Restrict `queryset` to the columns backing `fields` (plus `always`).
+
+    Schema fields are matched to model fields by name or attname
+    (`assignee_id`); many-to-many and computed fields load no column.
+    select_related() joins for relations that are no longer loaded are dropped.
+    """
+    if fields is None:
+        return queryset
+
+    opts = queryset.model._meta
+    columns = set()
+    for name in set(fields) | set(always):
+        try:
+            field = opts.get_field(name)
+        except Exception:
+            continue
+        if field.concrete and not field.many_to_many:
+            columns.add(field.name)
+
+    related = queryset.query.select_related
+    if related is True:
+        queryset = queryset.select_related(None)
+    elif isinstance(related, dict):
+        keep = [path for path in _select_related_paths(related) if path.split("__", 1)[0] in columns]
+        queryset = queryset.select_related(None)
+        if keep:
+            queryset = queryset.select_related(*keep)
+    return queryset.only(*columns)
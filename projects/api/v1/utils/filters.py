@@ -0,0 +1,53 @@
+from django.db.models import Count, Exists, OuterRef, QuerySet, Subquery
+
+from projects.models import Task
+
+TaskLabel = Task.labels.through
+
+
+def apply_task_filters(queryset: QuerySet, filters) -> QuerySet:
+    """
+    Apply a TaskFilterIn to a Task queryset.
+
+    Every predicate is an equality/range on a column covered by the
+    (tenant, board, is_deleted, <column>, created_at) indexes on Task;
+    label predicates are semi-joins on the task/label through table.
+    """
+    if filters is None:
+        return queryset
+
+    if filters.status:
+        queryset = queryset.filter(status__in=filters.status)
+    if filters.priority:
+        queryset = queryset.filter(priority__in=filters.priority)
+    if filters.task_type:
+        queryset = queryset.filter(task_type__in=filters.task_type)
+    if filters.assignee_id:
+        queryset = queryset.filter(assignee_id__in=filters.assignee_id)
+    if filters.sprint_id is not None:
+        queryset = queryset.filter(sprint_id=filters.sprint_id)
+    if filters.in_backlog is not None:
+        queryset = queryset.filter(sprint__isnull=filters.in_backlog)
+    if filters.parent_id is not None:
+        queryset = queryset.filter(parent_id=filters.parent_id)
+    if filters.due_after is not None:
+        queryset = queryset.filter(due_date__gte=filters.due_after)
+    if filters.due_before is not None:
+        queryset = queryset.filter(due_date__lte=filters.due_before)
+
+    if filters.labels_any:
+        queryset = queryset.filter(
+            Exists(TaskLabel.objects.filter(task_id=OuterRef("pk"), label_id__in=filters.labels_any))
+        )
+    if filters.labels_all:
+        # Counted per outer task (an index range on the through table's task_id), never
+        # grouped over every tagged task in the database
+        label_ids = set(filters.labels_all)
+        matched = (
+            TaskLabel.objects.filter(task_id=OuterRef("pk"), label_id__in=label_ids)
+            .values("task_id")
+            .annotate(matched=Count("label_id", distinct=True))
+            .values("matched")
+        )
+        queryset = queryset.alias(labels_matched=Subquery(matched)).filter(labels_matched=len(label_ids))
+    return queryset
@@ -1,37 +1,176 @@
-from typing import List, Any, Union, Dict, Tuple
-from django.db.models import QuerySet
+from typing import List, Any, Union, Dict, Tuple, Optional, Sequence
+from django.core import signing
+from django.db.models import Q, QuerySet
+from ninja.errors import HttpError
+
+from projects.api.v1.utils.counting import count_queryset
+from projects.api.v1.utils.eager_loading import build_eager_load_plan
+
+CURSOR_SALT = "projects.api.pagination.cursor"
+DEFAULT_KEYSET = ("-created_at", "-id")
+
 
 def paginate_queryset(
     queryset: Union[QuerySet, List[Any]],
     page: int = 1,
     limit: int = 10,
-    strict: bool = False  # Raise on invalid page if True
+    strict: bool = False,  # Raise on invalid page if True
+    cursor: Optional[str] = None,
+    mode: str = "offset",
+    ordering: Sequence[str] = DEFAULT_KEYSET,
+    count: str = "exact",
+    schema: Any = None,
 ) -> Tuple[List[Any], Dict[str, Any]]:
     """
     Paginate a queryset or list with optional page bounds checking.
+
+    Passing a `cursor` (or `mode="cursor"`) switches a queryset to keyset
+    pagination over `ordering`, which skips the COUNT and the OFFSET scan.
+    `count` picks how a queryset's total is computed ("exact", "estimate" or
+    "cached"); `total_count_exact` in the meta tells clients which they got.
+    Given the output `schema`, the related data it needs is eager-loaded so a
+    page costs the same number of queries whatever its size.
     """
+    if isinstance(queryset, QuerySet) and schema is not None:
+        queryset = build_eager_load_plan(schema, queryset.model).apply(queryset)
+
+    if isinstance(queryset, QuerySet) and (cursor or mode == "cursor"):
+        return paginate_keyset(queryset, cursor=cursor, limit=limit, ordering=ordering)
+
     if page < 1:
         page = 1
 
+    is_exact = True
+    has_next = None
     if isinstance(queryset, QuerySet):
-        total_count = queryset.count()
-        results_slice = queryset[(page - 1) * limit : page * limit]
-        results = list(results_slice)
+        total_count, is_exact = count_queryset(queryset, count)
+        if is_exact:
+            results_slice = queryset[(page - 1) * limit : page * limit]
+            results = list(results_slice)
+        else:
+            # An approximate total cannot say whether another page exists; probe one row ahead
+            results = list(queryset[(page - 1) * limit : page * limit + 1])
+            has_next = len(results) > limit
+            results = results[:limit]
     else:
         total_count = len(queryset)
         results = queryset[(page - 1) * limit : page * limit]
 
     total_pages = (total_count + limit - 1) // limit or 1
+    if has_next is None:
+        has_next = page < total_pages
+    elif has_next:
+        total_pages = max(total_pages, page + 1)
 
-    if strict and page > total_pages:
+    if strict and is_exact and page > total_pages:
         raise ValueError(f"Page {page} exceeds total pages {total_pages}")
 
     results_meta = {
         "total_count": total_count,
+        "total_count_exact": is_exact,
         "total_pages": total_pages,
         "current_page": page,
         "per_page": limit,
-        "next_page": page + 1 if page < total_pages else None,
+        "next_page": page + 1 if has_next else None,
         "prev_page": page - 1 if page > 1 else None,
     }
-    return results, results_meta
\ No newline at end of file
+    return results, results_meta
+
+
+# -------------------- KEYSET (CURSOR) PAGINATION --------------------
+
+def _keyset_fields(model, ordering: Sequence[str]) -> List[Tuple[Any, bool]]:
+    """Resolve `ordering` to [(field, descending)], always ending on the pk."""
+    fields = []
+    for name in ordering:
+        descending = name.startswith("-")
+        name = name.lstrip("-")
+        field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        fields.append((field, descending))
+    if not any(field.primary_key for field, _ in fields):
+        fields.append((model._meta.pk, fields[-1][1] if fields else False))
+    return fields
+
+
+def encode_cursor(obj, fields, direction: str = "next") -> str:
+    values = []
+    for field, _ in fields:
+        # Rows from .values() are dicts keyed by attname
+        value = obj[field.attname] if isinstance(obj, dict) else getattr(obj, field.attname)
+        values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+    return signing.dumps({"k": values, "d": direction}, salt=CURSOR_SALT, compress=True)
+
+
+def cursor_after(obj, ordering: Sequence[str] = DEFAULT_KEYSET) -> str:
+    """Cursor for the page that follows `obj` under `ordering`."""
+    return encode_cursor(obj, _keyset_fields(type(obj), ordering), "next")
+
+
+def decode_cursor(cursor: str, fields) -> Tuple[List[Any], str]:
+    try:
+        payload = signing.loads(cursor, salt=CURSOR_SALT)
+        values = payload["k"]
+        direction = payload.get("d", "next")
+        if len(values) != len(fields) or direction not in ("next", "prev"):
+            raise ValueError("Cursor does not match this ordering")
+        return [field.to_python(value) for (field, _), value in zip(fields, values)], direction
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise HttpError(400, "Invalid or expired cursor.")
+
+
+def _keyset_filter(fields, values, backwards: bool = False) -> Q:
+    """Rows strictly after `values` in the (possibly reversed) keyset order."""
+    condition = Q()
+    equal = Q()
+    for (field, descending), value in zip(fields, values):
+        lookup = "lt" if descending != backwards else "gt"
+        condition |= equal & Q(**{f"{field.attname}__{lookup}": value})
+        equal &= Q(**{field.attname: value})
+    return condition
+
+
+def paginate_keyset(
+    queryset: QuerySet,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    ordering: Sequence[str] = DEFAULT_KEYSET,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Keyset pagination with opaque, signed cursors.
+
+    The cursor encodes the ordering values of the edge row, so pages stay
+    stable under concurrent inserts and deep pages cost the same as the first.
+    Ordering fields must be non-nullable; the pk is appended as a tie-breaker.
+    """
+    fields = _keyset_fields(queryset.model, ordering)
+    order_by = [("-" if descending else "") + field.attname for field, descending in fields]
+    reverse_order_by = [("" if descending else "-") + field.attname for field, descending in fields]
+
+    values, direction = decode_cursor(cursor, fields) if cursor else (None, "next")
+    backwards = direction == "prev"
+
+    qs = queryset.order_by(*(reverse_order_by if backwards else order_by))
+    if values is not None:
+        qs = qs.filter(_keyset_filter(fields, values, backwards=backwards))
+
+    rows = list(qs[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    has_next = has_more if not backwards else values is not None
+    has_prev = values is not None if not backwards else has_more
+
+    results_meta = {
+        "total_count": None,
+        "total_count_exact": False,
+        "total_pages": None,
+        "current_page": None,
+        "per_page": limit,
+        "next_page": None,
+        "prev_page": None,
+        "next_cursor": encode_cursor(rows[-1], fields, "next") if rows and has_next else None,
+        "prev_cursor": encode_cursor(rows[0], fields, "prev") if rows and has_prev else None,
+    }
+    return rows, results_meta
@@ -1,16 +1,135 @@
 from functools import wraps
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from django.conf import settings
 from ninja.errors import HttpError
+from accounts.api.v1.utils.cache import TwoTierCache, MISSING
 from projects.models import ProjectMember, Board, Sprint, Task
 
 import logging
 logger = logging.getLogger("api")
 
+# (model, pk) -> (project_id, tenant_id) resolution index
+project_resolution = TwoTierCache(
+    "project-resolution",
+    maxsize=getattr(settings, "PROJECT_RESOLUTION_CACHE_MAXSIZE", 16384),
+    local_ttl=getattr(settings, "PROJECT_RESOLUTION_CACHE_LOCAL_TTL", 30),
+    shared_ttl=getattr(settings, "PROJECT_RESOLUTION_CACHE_TTL", 3600),
+)
+
+
+def _resolution_key(model, pk):
+    return (model._meta.model_name, pk)
+
+
+def resolve_project(model, pk) -> Tuple[int, Optional[int]]:
+    """
+    Return (project_id, tenant_id) for a Board/Sprint/Task primary key.
+    A miss reads just those two columns, never the full row.
+    Raises model.DoesNotExist for unknown or project-less objects.
+    """
+    key = _resolution_key(model, pk)
+    resolved = project_resolution.get(key)
+    if resolved is not MISSING:
+        return resolved
+
+    resolved = model.objects.filter(pk=pk).values_list("project_id", "tenant_id").first()
+    if resolved is None or resolved[0] is None:
+        raise model.DoesNotExist(f"{model.__name__} {pk} does not exist or has no project.")
+    project_resolution.set(key, resolved)
+    return resolved
+
+
+def prime_project_resolution(objects: Iterable, model=None) -> None:
+    """
+    Seed the index from already-loaded instances, at no query cost.
+    `.values()` rows (dicts with id/project_id/tenant_id) need `model`.
+    """
+    mapping = {}
+    for obj in objects:
+        if isinstance(obj, dict):
+            key, project_id, tenant_id = _resolution_key(model, obj["id"]), obj.get("project_id"), obj.get("tenant_id")
+        else:
+            key, project_id, tenant_id = _resolution_key(obj.__class__, obj.pk), obj.project_id, obj.tenant_id
+        if project_id is not None:
+            mapping[key] = (project_id, tenant_id)
+    if mapping:
+        project_resolution.set_many(mapping)
+
+
+def warm_board_resolution(board_id: int) -> None:
+    """Bulk-load resolutions for a board and every sprint and task on it."""
+    mapping = {}
+    for model in (Sprint, Task):
+        rows = model.objects.filter(board_id=board_id, project__isnull=False).values_list("pk", "project_id", "tenant_id")
+        for pk, project_id, tenant_id in rows:
+            mapping[_resolution_key(model, pk)] = (project_id, tenant_id)
+    row = Board.objects.filter(pk=board_id, project__isnull=False).values_list("project_id", "tenant_id").first()
+    if row:
+        mapping[_resolution_key(Board, board_id)] = row
+    if mapping:
+        project_resolution.set_many(mapping)
+
+
+def invalidate_project_resolution(model, *pks) -> None:
+    project_resolution.delete_many(_resolution_key(model, pk) for pk in pks)
+
+
 MODEL_PROJECT_MAP = {
-    "board_id": lambda pk: Board.objects.select_related("project").get(id=pk).project_id,
-    "sprint_id": lambda pk: Sprint.objects.select_related("project").get(id=pk).project_id,
-    "task_id": lambda pk: Task.objects.select_related("project").get(id=pk).project_id,
+    "board_id": lambda pk: resolve_project(Board, pk)[0],
+    "sprint_id": lambda pk: resolve_project(Sprint, pk)[0],
+    "task_id": lambda pk: resolve_project(Task, pk)[0],
 }
 
+# Compiled permission snapshots, keyed by (user_id, project_id).
+# A snapshot is the frozenset of permission codenames granted by the member's
+# role, or None when the user is not a member (or has no role).
+permission_snapshots = TwoTierCache(
+    "perm-snapshot",
+    maxsize=getattr(settings, "PERMISSION_CACHE_MAXSIZE", 4096),
+    local_ttl=getattr(settings, "PERMISSION_CACHE_LOCAL_TTL", 5),
+    shared_ttl=getattr(settings, "PERMISSION_CACHE_TTL", 600),
+)
+
+
+def get_permission_snapshot(user_id: int, project_id: int) -> Optional[FrozenSet[str]]:
+    """
+    Return the set of permission codenames `user_id` holds on `project_id`.
+    A warm lookup costs zero queries; a cold one costs a single query.
+    """
+    key = (user_id, project_id)
+    snapshot = permission_snapshots.get(key)
+    if snapshot is not MISSING:
+        return snapshot
+
+    rows = list(
+        ProjectMember.objects.filter(user_id=user_id, project_id=project_id, role__isnull=False)
+        .values_list("role__permissions__codename", flat=True)
+    )
+    snapshot = frozenset(codename for codename in rows if codename) if rows else None
+    permission_snapshots.set(key, snapshot)
+    return snapshot
+
+
+def projects_with_permissions(user_id: int, codenames: Iterable[str]) -> Dict[str, List[int]]:
+    """{codename: ids of the projects where `user_id`'s snapshot grants it}, for cross-project reads."""
+    project_ids = list(
+        ProjectMember.objects.filter(user_id=user_id, role__isnull=False, project__isnull=False)
+        .values_list("project_id", flat=True).distinct()
+    )
+    snapshots = {project_id: get_permission_snapshot(user_id, project_id) or frozenset() for project_id in project_ids}
+    return {
+        codename: [project_id for project_id, snapshot in snapshots.items() if codename in snapshot]
+        for codename in codenames
+    }
+
+
+def invalidate_permission_snapshots(*pairs) -> None:
+    """Drop cached snapshots for the given (user_id, project_id) pairs."""
+    keys = [(user_id, project_id) for user_id, project_id in pairs if user_id and project_id]
+    if keys:
+        permission_snapshots.delete_many(keys)
+
+
 def require_project_permission(
     permission_codename: str,
     *,
@@ -55,19 +174,21 @@ def require_project_permission(
             if not project_id:
                 raise HttpError(400, "Unable to resolve project context.")
 
-            # Membership & permission check
-            member = ProjectMember.objects.filter(
-                user=user,
-                project_id=project_id
-            ).select_related("role").first()
+            # Membership & permission check against the cached snapshot
+            try:
+                snapshot = get_permission_snapshot(user.id, int(project_id))
+            except (TypeError, ValueError):
+                raise HttpError(400, "Unable to resolve project context.")
 
-            if not member or not member.role:
+            if snapshot is None:
                 raise HttpError(403, "You are not a member of this project.")
 
-            # Role permissions must be a ManyToManyField to Permission objects
-            if not member.role.permissions.filter(codename=permission_codename).exists():
+            if permission_codename not in snapshot:
                 raise HttpError(403, f"Missing required permission: '{permission_codename}'.")
 
+            # Downstream decorators (e.g. the response cache) key on the caller's permissions
+            request.project_permissions = snapshot
+
             # Pass project_id in kwargs if not already present, for downstream logic
             if project_kwarg and project_kwarg not in kwargs:
                 kwargs[project_kwarg] = project_id
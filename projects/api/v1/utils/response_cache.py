@@ -0,0 +1,146 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+from django.http import HttpRequest, HttpResponse
+
+from accounts.middleware.current_user import clear_current_user, set_current_user
+
+from projects.api.v1.utils.versioning import VersionSpec, get_versions, version_pairs
+
+import logging
+logger = logging.getLogger("api")
+
+RESPONSE_CACHE_TTL = getattr(settings, "RESPONSE_CACHE_TTL", 30)
+RESPONSE_CACHE_STALE_TTL = getattr(settings, "RESPONSE_CACHE_STALE_TTL", 300)
+
+
+def permission_fingerprint(request) -> str:
+    """Short digest of the caller's project permissions (set by require_project_permission)."""
+    permissions = getattr(request, "project_permissions", None) or ()
+    return hashlib.sha1(",".join(sorted(permissions)).encode()).hexdigest()[:12]
+
+
+def _cache_key(request, tokens) -> str:
+    query = sorted(request.GET.lists())
+    digest = hashlib.sha1(f"{request.path}?{query!r}".encode())
+    for token in tokens:
+        digest.update(b":" + str(token).encode())
+    tenant_id = getattr(request.user, "tenant_id", None)
+    return f"response:{tenant_id}:{permission_fingerprint(request)}:{digest.hexdigest()}"
+
+
+def _store(key: str, response: HttpResponse, ttl: int, stale_ttl: int) -> None:
+    entry = {
+        "content": response.content,
+        "status": response.status_code,
+        "content_type": response.headers.get("Content-Type"),
+        "fresh_until": time.time() + ttl,
+    }
+    try:
+        cache.set(key, entry, ttl + stale_ttl)
+    except Exception as e:
+        logger.warning(f"Response cache write failed for {key}: {e}")
+
+
+def _build(entry, state: str) -> HttpResponse:
+    response = HttpResponse(entry["content"], status=entry["status"], content_type=entry["content_type"])
+    response.headers["X-Cache"] = state
+    return response
+
+
+def _detached_request(request) -> HttpRequest:
+    """A copy of the GET `request` that outlives it, for re-running the view off the request thread."""
+    clone = HttpRequest()
+    clone.method = request.method
+    clone.path, clone.path_info = request.path, request.path_info
+    clone.META = dict(request.META)
+    clone.GET = request.GET.copy()
+    clone.user = request.user
+    for attr in ("auth", "jwt_payload", "project_permissions"):
+        if hasattr(request, attr):
+            setattr(clone, attr, getattr(request, attr))
+    return clone
+
+
+def _cacheable(response) -> bool:
+    return isinstance(response, HttpResponse) and response.status_code == 200 and not response.streaming
+
+
+def cached_response(versions: VersionSpec = (), ttl: Optional[int] = None, stale_ttl: Optional[int] = None):
+    """
+    Decorator caching a GET view's rendered response in the shared cache.
+
+    The key covers the tenant, the caller's permission fingerprint, the path
+    and query parameters, and the version stamps named by `versions` (same
+    spec as `conditional_get`). Writes bump those stamps in projects.signals,
+    so changed data is never served from cache.
+
+    Within `ttl` seconds an entry is served as-is. For `stale_ttl` seconds
+    after that it is still served while one background thread re-runs the
+    view (stale-while-revalidate), so a slow database does not stall
+    polling dashboards. Only 200 responses returned as HttpResponse
+    (`api_response`) are cached.
+
+    Place it below `require_project_permission`.
+    """
+    ttl = RESPONSE_CACHE_TTL if ttl is None else ttl
+    stale_ttl = RESPONSE_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+
+    def decorator(view_func):
+        def refresh_in_background(key, request, args, kwargs):
+            # The original request is finished by the time the thread runs
+            request = _detached_request(request)
+
+            def run():
+                close_old_connections()
+                set_current_user(request.user)
+                try:
+                    response = view_func(request, *args, **kwargs)
+                    if _cacheable(response):
+                        _store(key, response, ttl, stale_ttl)
+                except Exception as e:
+                    logger.warning(f"Background response refresh failed for {key}: {e}")
+                finally:
+                    clear_current_user()
+                    cache.delete(f"{key}:lock")
+                    # This thread's connections die with it
+                    connections.close_all()
+
+            # Only one refresh per key at a time across workers
+            if cache.add(f"{key}:lock", 1, ttl or 30):
+                threading.Thread(target=run, daemon=True).start()
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return view_func(request, *args, **kwargs)
+
+            pairs = version_pairs(versions, kwargs)
+            stamps = get_versions(*pairs) if pairs else {}
+            key = _cache_key(request, (stamps[pair] for pair in pairs))
+
+            try:
+                entry = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Response cache read failed for {key}: {e}")
+                entry = None
+
+            if entry is not None:
+                if entry["fresh_until"] >= time.time():
+                    return _build(entry, "HIT")
+                refresh_in_background(key, request, args, kwargs)
+                return _build(entry, "STALE")
+
+            response = view_func(request, *args, **kwargs)
+            if _cacheable(response):
+                _store(key, response, ttl, stale_ttl)
+                response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
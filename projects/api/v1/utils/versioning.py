@@ -0,0 +1,73 @@
+import uuid
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, Union
+
+from django.core.cache import cache
+from django.db import transaction
+
+import logging
+logger = logging.getLogger("api")
+
+# Version stamps are opaque tokens rather than counters: an evicted stamp is
+# re-minted as a new token, so it can never collide with an older cached value.
+
+
+def _version_key(scope: str, pk) -> str:
+    return f"version:{scope}:{pk}"
+
+
+def get_versions(*pairs: Tuple[str, object]) -> Dict[Tuple[str, object], str]:
+    """Current version stamps for [(scope, pk), ...], minting missing ones."""
+    keys = {_version_key(scope, pk): (scope, pk) for scope, pk in pairs}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Version lookup failed: {e}")
+        return {pair: uuid.uuid4().hex for pair in keys.values()}
+
+    missing = {key: uuid.uuid4().hex for key in keys if key not in found}
+    for key, token in missing.items():
+        # add() keeps a token minted concurrently by another worker
+        if not cache.add(key, token, None):
+            missing[key] = cache.get(key) or token
+    found.update(missing)
+    return {keys[key]: found[key] for key in keys}
+
+
+def get_version(scope: str, pk) -> str:
+    return get_versions((scope, pk))[(scope, pk)]
+
+
+def bump_version(scope: str, *pks: Iterable) -> None:
+    """Invalidate everything cached under the (scope, pk) stamps."""
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    try:
+        cache.set_many({_version_key(scope, pk): uuid.uuid4().hex for pk in pks}, None)
+    except Exception as e:
+        logger.warning(f"Version bump failed for {scope} {pks}: {e}")
+
+
+
+def bump_version_on_commit(scope: str, *pks: Iterable) -> None:
+    """
+    `bump_version` once the surrounding transaction commits (at once in
+    autocommit). Bumping earlier lets a concurrent read fetch the old rows
+    under the new stamp, which would then be served as current.
+    """
+    transaction.on_commit(partial(bump_version, scope, *pks))
+
+
+VersionSpec = Union[Sequence[Tuple[str, str]], Callable]
+
+
+def version_pairs(spec: VersionSpec, kwargs: Dict) -> List[Tuple[str, object]]:
+    """
+    Resolve a view's version spec against its kwargs: either (scope, kwarg)
+    pairs such as [("board", "board_id")], or a callable taking the kwargs
+    and returning (scope, pk) pairs.
+    """
+    if callable(spec):
+        return list(spec(kwargs))
+    return [(scope, kwargs.get(kwarg)) for scope, kwarg in spec]
@@ -1,15 +1,34 @@
 
-from ninja import Router, Query
+from ninja import Router, Query, File, Path
+from ninja.files import UploadedFile
+from ninja.errors import HttpError
 from django.shortcuts import get_object_or_404
+from django.http import HttpResponse, StreamingHttpResponse
 from django.db.models import Q
+from django.utils import timezone
 
 from accounts.api.v1.utils.exceptions import ApiValidationError
 from accounts.models import CustomUser
-from projects.api.v1.utils.permissions import require_project_permission
+from projects.api.v1.utils.permissions import require_project_permission, prime_project_resolution, resolve_project
+from projects.api.v1.utils.conditional import conditional_get
+from projects.api.v1.utils.response_cache import cached_response
 from projects.api.v1.validator.projects import validate_project_unique_name
+from projects.api.v1.services.tasks import TaskBulkService
+from projects.api.v1.services.boards import BoardSnapshotService
+from projects.api.v1.services.sprint_analytics import SprintAnalyticsService
+from projects.api.v1.services.comments import CommentThreadService
+from projects.api.v1.services.hierarchy import TaskHierarchyService, MAX_TREE_DEPTH
+from projects.api.v1.services.export import TaskExportService, EXPORT_CONTENT_TYPES, EXPORT_FORMAT_PATTERN
+from projects.api.v1.services.imports import TaskImportService, IMPORT_FORMAT_PATTERN
+from projects.api.v1.services.activity import ActivityFeedService, ActivityHistoryService, FEED_TARGET_PATTERN
 from projects.models import Project, Board, ProjectMember, Sprint, Task, Label, Comment
 from accounts.api.v1.utils.response import api_response
 from projects.api.v1.utils.pagination import paginate_queryset
+from projects.api.v1.utils.counting import COUNT_STRATEGY_PATTERN
+from projects.api.v1.utils.fieldsets import parse_fields, project_queryset, subset_schema
+from projects.api.v1.utils.eager_loading import build_eager_load_plan
+from projects.api.v1.utils.fast_read import paginate_schema
+from projects.api.v1.utils.filters import apply_task_filters
 from projects.api.v1.schemas.projects import *
 from starlette import status
 from accounts.api.v1.services.auth import JWTAuth
@@ -25,12 +44,17 @@ auth = JWTAuth()
 # -------------------- PROJECT --------------------
 # LIST
 @projects_api.get("", auth=auth)
-def list_projects(request, page: int = 1, limit: int = 20):
+def list_projects(
+    request,
+    page: int = 1,
+    limit: int = 20,
+    count: str = Query("exact", pattern=COUNT_STRATEGY_PATTERN),
+):
     filters = Q(tenant=request.user.tenant)
     filters.add(Q(project_member__user=request.user), Q.AND)
     qs = Project.objects.select_related("tenant", "created_by").filter(filters)
     # paginate_queryset is your helper
-    results, meta = paginate_queryset(qs, page, limit)
+    results, meta = paginate_queryset(qs, page, limit, count=count, schema=ProjectOut)
     return api_response(
         data=[ProjectOut.model_validate(obj) for obj in results],
         message="Projects fetched",
@@ -69,6 +93,7 @@ def create_project(request, payload: ProjectIn):
         )
 
 @projects_api.get("/{id}/", auth=auth)
+@conditional_get(versions=[("project", "id")], last_modified=(Project, "id"))
 def get_project(request, id: int):
     project = get_object_or_404(Project.objects.select_related("tenant", "created_by"), id=id)
     return api_response(data=ProjectOut.model_validate(project), message="Project fetched")
@@ -164,15 +189,30 @@ def delete_project_member(request, id: int):
 # -------------------- BOARD --------------------
 @projects_api.get("{project_id}/board/", auth=auth)
 @require_project_permission("view_board", project_kwarg="project_id")
-def list_boards(request, project_id: int, page: int = 1, limit: int = 20):
+@conditional_get(versions=[("project", "project_id")])
+@cached_response(versions=[("project", "project_id")])
+def list_boards(
+    request,
+    project_id: int,
+    page: int = 1,
+    limit: int = 20,
+    cursor: str = Query(None),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    count: str = Query("exact", pattern=COUNT_STRATEGY_PATTERN),
+    fields: str = Query(None),
+):
+    field_set = parse_fields(fields, BoardOut)
+    out_schema = subset_schema(BoardOut, field_set)
     qs = Board.objects.select_related("project", "created_by").filter(
-        tenant=request.user.tenant
+        tenant=request.user.tenant, project_id=project_id
     ).order_by("-created_at")
+    qs = project_queryset(qs, field_set, always=("created_at",))
 
-    result, meta = paginate_queryset(qs, page, limit)
-    data = [BoardOut.model_validate(obj) for obj in result]
+    _, data, meta = paginate_schema(
+        qs, out_schema, page=page, limit=limit, cursor=cursor, mode=pagination, count=count
+    )
 
-    return api_response(data=data, message="Boards fetched successfully")
+    return api_response(data=data, message="Boards fetched successfully", meta=meta)
 
 
 @projects_api.post("{project_id}/board/", auth=auth)
@@ -190,9 +230,12 @@ def create_board(request, payload: BoardIn, project_id: int):
 
 @projects_api.get("{project_id}/board/{board_id}/", auth=auth)
 @require_project_permission("view_board", project_kwarg="project_id")
-def get_board(request, project_id: int, board_id: int):
-    board = get_object_or_404(Board, id=board_id, project_id=project_id, tenant=request.user.tenant)
-    return api_response(data=BoardOut.model_validate(board), message="Board fetched")
+@conditional_get(versions=[("board", "board_id")])
+def get_board(request, project_id: int, board_id: int, fields: str = Query(None)):
+    field_set = parse_fields(fields, BoardOut)
+    qs = project_queryset(Board.objects.all(), field_set)
+    board = get_object_or_404(qs, id=board_id, project_id=project_id, tenant=request.user.tenant)
+    return api_response(data=subset_schema(BoardOut, field_set).model_validate(board), message="Board fetched")
 
 
 @projects_api.put("{project_id}/board/{board_id}/", auth=auth)
@@ -224,6 +267,25 @@ def delete_board(request, project_id: int, board_id: int):
     board.delete()
     return api_response(message="Board deleted", status_code=status.HTTP_200_OK)
 
+def _board_snapshot_versions(kwargs):
+    # The snapshot embeds project labels as well as board data
+    board_id = kwargs["board_id"]
+    return [("board", board_id), ("project", resolve_project(Board, board_id)[0])]
+
+@projects_api.get("/board/{board_id}/snapshot/", auth=auth)
+@require_project_permission("view_task", resolve_from="board_id")
+@conditional_get(versions=_board_snapshot_versions)
+@cached_response(versions=_board_snapshot_versions)
+def get_board_snapshot(
+    request,
+    board_id: int,
+    sprint_id: int = Query(None),
+    per_column: int = Query(50, ge=1, le=200),
+):
+    board = get_object_or_404(Board, id=board_id, tenant=request.user.tenant)
+    snapshot = BoardSnapshotService.get_snapshot(board, sprint_id=sprint_id, per_column=per_column)
+    return api_response(data=snapshot, message="Board snapshot fetched")
+
 # -------------------- SPRINTS --------------------
 @projects_api.post("board/{board_id}/sprints/", auth=auth)
 @require_project_permission("add_sprint", resolve_from="board_id")
@@ -239,16 +301,35 @@ def create_sprint(request, board_id: int, payload: SprintIn):
 
 @projects_api.get("board/{board_id}/sprints/", auth=auth)
 @require_project_permission("view_sprint", resolve_from="board_id")
-def list_sprints(request, board_id: int, page: int = 1, limit: int = 20):
+@conditional_get(versions=[("board", "board_id")])
+@cached_response(versions=[("board", "board_id")])
+def list_sprints(
+    request,
+    board_id: int,
+    page: int = 1,
+    limit: int = 20,
+    cursor: str = Query(None),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    count: str = Query("exact", pattern=COUNT_STRATEGY_PATTERN),
+    fields: str = Query(None),
+):
+    field_set = parse_fields(fields, SprintOut)
+    out_schema = subset_schema(SprintOut, field_set)
     sprints = Sprint.objects.filter(board_id=board_id, tenant=request.user.tenant).order_by("-created_at")
-    result, meta = paginate_queryset(sprints, page, limit)
-    return api_response(data=[SprintOut.model_validate(s) for s in result], message="Sprints fetched", meta=meta)
+    sprints = project_queryset(sprints, field_set, always=("created_at",))
+    _, data, meta = paginate_schema(
+        sprints, out_schema, page=page, limit=limit, cursor=cursor, mode=pagination, count=count
+    )
+    return api_response(data=data, message="Sprints fetched", meta=meta)
 
 @projects_api.get("board/{board_id}/sprints/{sprint_id}/", auth=auth)
 @require_project_permission("view_sprint", resolve_from="sprint_id")
-def get_sprint(request,  board_id: int, sprint_id: int):
-    sprint = get_object_or_404(Sprint, id=sprint_id,  board_id= board_id, tenant=request.user.tenant)
-    return api_response(data=SprintOut.model_validate(sprint), message="Sprint fetched")
+@conditional_get(versions=[("board", "board_id")], last_modified=(Sprint, "sprint_id"))
+def get_sprint(request,  board_id: int, sprint_id: int, fields: str = Query(None)):
+    field_set = parse_fields(fields, SprintOut)
+    qs = project_queryset(Sprint.objects.all(), field_set)
+    sprint = get_object_or_404(qs, id=sprint_id,  board_id= board_id, tenant=request.user.tenant)
+    return api_response(data=subset_schema(SprintOut, field_set).model_validate(sprint), message="Sprint fetched")
 
 @projects_api.put("board/{board_id}/sprints/{sprint_id}/", auth=auth)
 @require_project_permission("change_sprint", resolve_from="sprint_id")
@@ -276,6 +357,85 @@ def delete_sprint(request, board_id: int, sprint_id: int):
     sprint.delete()
     return api_response(message="Sprint deleted")
 
+# -------------------- SPRINT ANALYTICS --------------------
+def _sprint_chart_versions(kwargs):
+    # Charts gain a point per day even without writes; each date mints its own stamp
+    return [("board", kwargs["board_id"]), ("day", timezone.localdate().isoformat())]
+
+@projects_api.get("board/{board_id}/sprints/{sprint_id}/burndown/", response=SprintBurnOut, auth=auth)
+@require_project_permission("view_sprint", resolve_from="sprint_id")
+@conditional_get(versions=_sprint_chart_versions)
+@cached_response(versions=_sprint_chart_versions)
+def get_sprint_burndown(request, board_id: int, sprint_id: int):
+    sprint = get_object_or_404(Sprint, id=sprint_id, board_id=board_id, tenant=request.user.tenant)
+    return api_response(data=SprintBurnOut.model_validate(SprintAnalyticsService.burndown(sprint)), message="Sprint burndown fetched")
+
+@projects_api.get("board/{board_id}/sprints/{sprint_id}/burnup/", response=SprintBurnOut, auth=auth)
+@require_project_permission("view_sprint", resolve_from="sprint_id")
+@conditional_get(versions=_sprint_chart_versions)
+@cached_response(versions=_sprint_chart_versions)
+def get_sprint_burnup(request, board_id: int, sprint_id: int):
+    sprint = get_object_or_404(Sprint, id=sprint_id, board_id=board_id, tenant=request.user.tenant)
+    return api_response(data=SprintBurnOut.model_validate(SprintAnalyticsService.burnup(sprint)), message="Sprint burnup fetched")
+
+@projects_api.get("board/{board_id}/velocity/", response=BoardVelocityOut, auth=auth)
+@require_project_permission("view_sprint", resolve_from="board_id")
+@conditional_get(versions=[("board", "board_id")])
+@cached_response(versions=[("board", "board_id")])
+def get_board_velocity(request, board_id: int, last: int = Query(5, ge=1, le=50)):
+    board = get_object_or_404(Board, id=board_id, tenant=request.user.tenant)
+    velocity = SprintAnalyticsService.velocity(board.pk, last=last)
+    return api_response(data=BoardVelocityOut.model_validate(velocity), message="Board velocity fetched")
+
+
+# -------------------- BULK TASKS --------------------
+# Registered before the /task/{task_id}/ routes so `bulk` is not captured as an id
+@projects_api.post("/board/{board_id}/task/bulk/", auth=auth)
+@require_project_permission("add_task", resolve_from="board_id")
+def bulk_create_tasks(request, board_id: int, payload: TaskBulkCreateIn):
+    board = get_object_or_404(Board, id=board_id, tenant=request.user.tenant)
+    tasks = TaskBulkService.create_tasks(board, request.user, [item.model_dump() for item in payload.tasks])
+    created = build_eager_load_plan(TaskOut, Task).apply(
+        Task.objects.filter(id__in=[task.pk for task in tasks]).order_by("id")
+    )
+    return api_response(data=[TaskOut.model_validate(t) for t in created], message="Tasks created")
+
+@projects_api.patch("/board/{board_id}/task/bulk/", auth=auth)
+@require_project_permission("change_task", resolve_from="board_id")
+def bulk_patch_tasks(request, board_id: int, payload: TaskBulkPatchIn):
+    board = get_object_or_404(Board, id=board_id, tenant=request.user.tenant)
+    updates = {item.id: item.model_dump(exclude_unset=True, exclude={"id"}) for item in payload.tasks}
+    tasks = TaskBulkService.update_tasks(board, request.user, updates)
+    return api_response(
+        data=TaskBulkResultOut(updated=len(tasks), task_ids=[task.pk for task in tasks]),
+        message="Tasks updated"
+    )
+
+@projects_api.post("/board/{board_id}/task/import/", auth=auth)
+@require_project_permission("add_task", resolve_from="board_id")
+def import_tasks(
+    request,
+    board_id: int,
+    file: UploadedFile = File(...),
+    format: str = Query(None, pattern=IMPORT_FORMAT_PATTERN),
+):
+    board = get_object_or_404(Board, id=board_id, tenant=request.user.tenant)
+    records = TaskImportService.parse(file, fmt=format, name=file.name)
+    result = TaskImportService.import_rows(board, request.user, records)
+    return api_response(data=TaskImportResultOut(**result), message="Tasks imported")
+
+@projects_api.post("/board/{board_id}/task/bulk/move/", auth=auth)
+@require_project_permission("change_task", resolve_from="board_id")
+def bulk_move_tasks(request, board_id: int, payload: TaskBulkMoveIn):
+    board = get_object_or_404(Board, id=board_id, tenant=request.user.tenant)
+    values = payload.model_dump(exclude_unset=True, exclude={"task_ids"})
+    if not values:
+        raise HttpError(400, "Nothing to move: provide `sprint_id` and/or `status`.")
+    tasks = TaskBulkService.move_tasks(board, request.user, payload.task_ids, values)
+    return api_response(
+        data=TaskBulkResultOut(updated=len(tasks), task_ids=[task.pk for task in tasks]),
+        message="Tasks moved"
+    )
 
 # -------------------- TASKS --------------------
 @projects_api.post("/board/{board_id}/task/", auth=auth)
@@ -296,21 +456,54 @@ def create_task(request, board_id: int, payload: TaskIn):
 
 @projects_api.get("/board/{board_id}/task/", auth=auth)
 @require_project_permission("view_task", resolve_from="board_id")
-def list_tasks(request, board_id: int, page: int = Query(1), limit: int = Query(20)):
+@conditional_get(versions=[("board", "board_id")])
+@cached_response(versions=[("board", "board_id")])
+def list_tasks(
+    request,
+    board_id: int,
+    page: int = Query(1),
+    limit: int = Query(20),
+    cursor: str = Query(None),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    count: str = Query("exact", pattern=COUNT_STRATEGY_PATTERN),
+    fields: str = Query(None),
+    filters: TaskFilterIn = Query(...),
+):
+    field_set = parse_fields(fields, TaskOut)
+    out_schema = subset_schema(TaskOut, field_set)
     tasks = Task.objects.filter(board_id=board_id, is_deleted=False, tenant=request.user.tenant).order_by("-created_at")
-    result, meta = paginate_queryset(tasks, page, limit)
-    return api_response(data=[TaskOut.model_validate(t) for t in result], message="Tasks fetched", meta=meta)
+    tasks = apply_task_filters(tasks, filters)
+    tasks = project_queryset(tasks, field_set, always=("created_at", "project", "tenant"))
+    rows, data, meta = paginate_schema(
+        tasks, out_schema, page=page, limit=limit, cursor=cursor, mode=pagination, count=count,
+        extra=("project_id", "tenant_id"),
+    )
+    prime_project_resolution(rows, model=Task)
+    return api_response(data=data, message="Tasks fetched", meta=meta)
 
 @projects_api.get("/board/{board_id}/task/{task_id}/", auth=auth)
 @require_project_permission("view_task", resolve_from="task_id")
-def get_task(request, board_id: int, task_id: int):
-    task = get_object_or_404(Task, id=task_id, board_id=board_id, tenant=request.user.tenant)
-    return api_response(data=TaskOut.model_validate(task), message="Task fetched")
+@conditional_get(versions=[("board", "board_id")], last_modified=(Task, "task_id"))
+def get_task(request, board_id: int, task_id: int, fields: str = Query(None)):
+    field_set = parse_fields(fields, TaskOut)
+    qs = project_queryset(Task.objects.all(), field_set)
+    task = get_object_or_404(qs, id=task_id, board_id=board_id, tenant=request.user.tenant)
+    return api_response(data=subset_schema(TaskOut, field_set).model_validate(task), message="Task fetched")
+
+@projects_api.get("/board/{board_id}/task/{task_id}/subtree/", response=TaskSubtreeOut, auth=auth)
+@require_project_permission("view_task", resolve_from="task_id")
+@conditional_get(versions=[("board", "board_id")])
+@cached_response(versions=[("board", "board_id")])
+def get_task_subtree(request, board_id: int, task_id: int, max_depth: int = Query(MAX_TREE_DEPTH, ge=1, le=MAX_TREE_DEPTH)):
+    task = get_object_or_404(Task, id=task_id, board_id=board_id, tenant=request.user.tenant, is_deleted=False)
+    subtree = TaskHierarchyService.subtree(task, max_depth=max_depth)
+    return api_response(data=TaskSubtreeOut.model_validate(subtree), message="Task subtree fetched")
 
 @projects_api.put("/board/{board_id}/task/{task_id}/", auth=auth)
 @require_project_permission("change_task", resolve_from="task_id")
 def update_task(request, board_id: int, task_id: int, payload: TaskIn):
     task = get_object_or_404(Task, id=task_id, board_id=board_id, tenant=request.user.tenant)
+    TaskHierarchyService.validate_parents({task.pk: payload.parent_id})
     for attr, value in payload.model_dump(exclude={"label_ids"}).items():
         setattr(task, attr, value)
     task.updated_by = request.user
@@ -324,6 +517,8 @@ def update_task(request, board_id: int, task_id: int, payload: TaskIn):
 def patch_task(request, board_id: int, task_id: int, payload: TaskPatchIn):
     task = get_object_or_404(Task, id=task_id, board_id=board_id, tenant=request.user.tenant)
     update_data = payload.model_dump(exclude_unset=True, exclude={"label_ids"})
+    if "parent_id" in update_data:
+        TaskHierarchyService.validate_parents({task.pk: update_data["parent_id"]})
     for field, value in update_data.items():
         setattr(task, field, value)
     task.updated_by = request.user
@@ -339,6 +534,104 @@ def delete_task(request, board_id: int, task_id: int):
     task.save(update_fields=["is_deleted", "updated_by"])
     return api_response(message="Task deleted")
 
+# -------------------- EXPORT --------------------
+
+@projects_api.get("{project_id}/export/", auth=auth)
+@require_project_permission("view_task", project_kwarg="project_id")
+def export_tasks(
+    request,
+    project_id: int,
+    format: str = Query("ndjson", pattern=EXPORT_FORMAT_PATTERN),
+    gzip: bool = Query(False),
+    filters: TaskFilterIn = Query(...),
+):
+    stream = TaskExportService.stream(project_id, request.user.tenant, fmt=format, compress=gzip, filters=filters)
+    filename = f"project-{project_id}-tasks.{format}" + (".gz" if gzip else "")
+    response = StreamingHttpResponse(
+        stream, content_type="application/gzip" if gzip else EXPORT_CONTENT_TYPES[format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Cache-Control"] = "private, no-store"
+    return response
+
+# -------------------- ACTIVITY --------------------
+
+def _activity_page(request, project_id: int, cursor: str, limit: int, **filters):
+    queryset = ActivityFeedService.queryset(project_id, request.user.tenant, **filters)
+    data, meta = ActivityFeedService.page(queryset, cursor=cursor, limit=limit)
+    return api_response(
+        data=[ActivityOut.model_validate(entry) for entry in data],
+        message="Activity fetched",
+        meta=meta,
+    )
+
+@projects_api.get("{project_id}/activity/", response=list[ActivityOut], auth=auth)
+@require_project_permission("view_activitylog", project_kwarg="project_id")
+@conditional_get(versions=[("activity", "project_id")])
+@cached_response(versions=[("activity", "project_id")])
+def list_project_activity(
+    request,
+    project_id: int,
+    cursor: str = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    actor_id: int = Query(None),
+    target_type: str = Query(None, pattern=FEED_TARGET_PATTERN),
+    target_id: int = Query(None),
+    action: List[str] = Query(None),
+):
+    if (target_type is None) != (target_id is None):
+        raise HttpError(400, "`target_type` and `target_id` must be given together.")
+    return _activity_page(
+        request, project_id, cursor, limit,
+        actor_id=actor_id,
+        target=(target_type, target_id) if target_type else None,
+        actions=action,
+    )
+
+# Registered before /activity/{target_type}/{target_id}/ so `user` is not captured as a type
+@projects_api.get("{project_id}/activity/user/{user_id}/", response=list[ActivityOut], auth=auth)
+@require_project_permission("view_activitylog", project_kwarg="project_id")
+@conditional_get(versions=[("activity", "project_id")])
+@cached_response(versions=[("activity", "project_id")])
+def list_user_activity(
+    request,
+    project_id: int,
+    user_id: int,
+    cursor: str = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+):
+    return _activity_page(request, project_id, cursor, limit, actor_id=user_id)
+
+@projects_api.get("{project_id}/activity/{target_type}/{target_id}/", response=list[ActivityOut], auth=auth)
+@require_project_permission("view_activitylog", project_kwarg="project_id")
+@conditional_get(versions=[("activity", "project_id")])
+@cached_response(versions=[("activity", "project_id")])
+def list_target_activity(
+    request,
+    project_id: int,
+    target_id: int,
+    target_type: str = Path(..., pattern=FEED_TARGET_PATTERN),
+    cursor: str = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+):
+    return _activity_page(request, project_id, cursor, limit, target=(target_type, target_id))
+
+@projects_api.get("{project_id}/history/{target_type}/{target_id}/", response=ObjectStateOut, auth=auth)
+@require_project_permission("view_activitylog", project_kwarg="project_id")
+@conditional_get(versions=[("activity", "project_id")])
+@cached_response(versions=[("activity", "project_id")])
+def get_object_history(
+    request,
+    project_id: int,
+    target_id: int,
+    target_type: str = Path(..., pattern=FEED_TARGET_PATTERN),
+    at: datetime = Query(...),
+):
+    if timezone.is_naive(at):
+        at = timezone.make_aware(at)
+    state = ActivityHistoryService.reconstruct(target_type, target_id, at, project_id)
+    return api_response(data=ObjectStateOut.model_validate(state), message="Object state reconstructed")
+
 # -------------------- LABELS --------------------
 
 @projects_api.post("{project_id}/label/", response=LabelOut, auth=auth)
@@ -354,13 +647,15 @@ def create_label(request, project_id: int, payload: LabelIn):
 
 @projects_api.get("{project_id}/label/", response=list[LabelOut], auth=auth)
 @require_project_permission("view_label", project_kwarg="project_id")
-def list_labels(request, project_id: int):
+@conditional_get(versions=[("project", "project_id")])
+def list_labels(request, project_id: int, response: HttpResponse):
     labels = Label.objects.filter(tenant=request.user.tenant,project_id=project_id)
     return list(labels)
 
 @projects_api.get("{project_id}/label/{label_id}/", response=LabelOut, auth=auth)
 @require_project_permission("view_label", project_kwarg="project_id")
-def get_label(request, project_id: int, label_id: int):
+@conditional_get(versions=[("project", "project_id")])
+def get_label(request, project_id: int, label_id: int, response: HttpResponse):
     label = get_object_or_404(Label, project_id=project_id, id=label_id, tenant=request.user.tenant)
     return label
 
@@ -400,6 +695,7 @@ def delete_label(request, project_id: int, label_id: int):
 @require_project_permission("add_comment", resolve_from="task_id")
 def create_comment(request, task_id: int, payload: CommentIn):
     task = get_object_or_404(Task, id=task_id, tenant=request.user.tenant)
+    CommentThreadService.validate_parent(Comment(task=task), payload.parent_id)
     comment = Comment.objects.create(
         tenant=request.user.tenant,
         project=task.project,
@@ -415,6 +711,7 @@ def create_comment(request, task_id: int, payload: CommentIn):
 
 @projects_api.get("task/{task_id}/comment/", response=list[CommentOut], auth=auth)
 @require_project_permission("view_comment", resolve_from="task_id")
+@conditional_get(versions=[("comments", "task_id")])
 def list_comments(request, task_id: int):
     comments = Comment.objects.filter(
         tenant=request.user.tenant,
@@ -425,9 +722,54 @@ def list_comments(request, task_id: int):
         message="Comments fetched"
     )
 
+# Registered before /comment/{comment_id}/ so `threads` is not captured as an id
+@projects_api.get("task/{task_id}/comment/threads/", response=list[CommentThreadOut], auth=auth)
+@require_project_permission("view_comment", resolve_from="task_id")
+@conditional_get(versions=[("comments", "task_id")])
+@cached_response(versions=[("comments", "task_id")])
+def list_comment_threads(
+    request,
+    task_id: int,
+    cursor: str = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    replies: int = Query(3, ge=0, le=50),
+):
+    threads, meta = CommentThreadService.threads(
+        task_id, request.user.tenant, cursor=cursor, limit=limit, replies=replies
+    )
+    data = [
+        CommentThreadOut.model_validate({
+            **CommentOut.model_validate(thread["comment"]).model_dump(),
+            "reply_count": thread["reply_count"],
+            "replies": [CommentOut.model_validate(r) for r in thread["replies"]],
+            "replies_cursor": thread["replies_cursor"],
+        })
+        for thread in threads
+    ]
+    return api_response(data=data, message="Comment threads fetched", meta=meta)
+
+@projects_api.get("task/{task_id}/comment/{comment_id}/replies/", response=list[CommentOut], auth=auth)
+@require_project_permission("view_comment", resolve_from="task_id")
+@conditional_get(versions=[("comments", "task_id")])
+def list_comment_replies(
+    request,
+    task_id: int,
+    comment_id: int,
+    cursor: str = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+):
+    comment = get_object_or_404(Comment, task_id=task_id, id=comment_id, tenant=request.user.tenant)
+    replies, meta = CommentThreadService.replies(comment, cursor=cursor, limit=limit)
+    return api_response(
+        data=[CommentOut.model_validate(r) for r in replies],
+        message="Comment replies fetched",
+        meta=meta,
+    )
+
 @projects_api.get("task/{task_id}/comment/{comment_id}/", response=CommentOut, auth=auth)
 @require_project_permission("view_comment", resolve_from="task_id")
-def get_comment(request, task_id:int, comment_id: int):
+@conditional_get(versions=[("comments", "task_id")])
+def get_comment(request, task_id:int, comment_id: int, response: HttpResponse):
     comment = get_object_or_404(Comment, task_id = task_id, id=comment_id, tenant=request.user.tenant)
     return comment
 
@@ -445,6 +787,8 @@ def update_comment(request, task_id: int, comment_id: int, payload: CommentIn):
 def patch_comment(request, task_id: int, comment_id: int, payload: CommentPatchIn):
     comment:Comment = get_object_or_404(Comment, task_id=task_id, id=comment_id, tenant=request.user.tenant)
     update_data = payload.model_dump(exclude_unset=True)
+    if "parent_id" in update_data:
+        CommentThreadService.validate_parent(comment, update_data["parent_id"])
     for field, value in update_data.items():
         setattr(comment, field, value)
     comment.save(update_fields=list(update_data.keys()))
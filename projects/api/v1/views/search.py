@@ -0,0 +1,27 @@
+from typing import List
+
+from ninja import Router, Query
+
+from accounts.api.v1.services.auth import JWTAuth
+from accounts.api.v1.utils.response import api_response
+from projects.api.v1.schemas.projects import SearchHitOut
+from projects.api.v1.services.search import SearchService
+
+search_api = Router(tags=["Search"])
+auth = JWTAuth()
+
+
+@search_api.get("", auth=auth)
+def search(
+    request,
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: List[str] = Query(None, description="task, comment and/or project"),
+    page: int = 1,
+    limit: int = Query(20, le=100),
+):
+    hits, meta = SearchService.search(request.user, q, kinds=kind, page=page, limit=limit)
+    return api_response(
+        data=[SearchHitOut(**hit) for hit in hits],
+        message="Search results fetched",
+        meta=meta
+    )
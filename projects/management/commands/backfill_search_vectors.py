@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from projects.api.v1.services.search import SEARCH_BACKFILL_BATCH_SIZE, SEARCH_DOCUMENTS, refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the stored search vectors of existing tasks, comments and projects "
+        "(rows saved since search was added are kept up to date by signals)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", action="append", choices=sorted(SEARCH_DOCUMENTS),
+                            help="Only this kind (repeatable); default: all")
+        parser.add_argument("--all", action="store_true", help="Recompute every row, not only empty vectors")
+        parser.add_argument("--batch-size", type=int, default=SEARCH_BACKFILL_BATCH_SIZE, help="Rows per UPDATE")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for kind in options["kind"] or SEARCH_DOCUMENTS:
+            model = SEARCH_DOCUMENTS[kind]["model"]
+            rows = model.objects.order_by("pk")
+            if not options["all"]:
+                rows = rows.filter(search_vector__isnull=True)
+            updated = 0
+            last_pk = 0
+            while True:
+                # Walk by pk so rows filled by earlier batches are not rescanned
+                pks = list(rows.filter(pk__gt=last_pk).values_list("pk", flat=True)[:batch_size])
+                if not pks:
+                    break
+                refresh_search_vectors(model, pks)
+                updated += len(pks)
+                last_pk = pks[-1]
+            self.stdout.write(f"{kind}: {updated} rows")
+        self.stdout.write(self.style.SUCCESS("✅ Done."))
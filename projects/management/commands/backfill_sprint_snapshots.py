@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from projects.api.v1.services.sprint_analytics import DONE_STATUS, SNAPSHOT_COUNTERS
+from projects.models import Sprint, SprintSnapshot, Task
+
+
+class Command(BaseCommand):
+    help = "Rebuilds daily sprint snapshots from current task data (sprint membership and completed_at)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sprint", type=int, action="append", help="Only this sprint id (repeatable)")
+        parser.add_argument("--board", type=int, help="Only sprints of this board")
+        parser.add_argument("--only-missing", action="store_true", help="Skip sprints that already have snapshots")
+
+    def handle(self, *args, **options):
+        sprints = Sprint.objects.order_by("id")
+        if options["sprint"]:
+            sprints = sprints.filter(id__in=options["sprint"])
+        if options["board"]:
+            sprints = sprints.filter(board_id=options["board"])
+        if options["only_missing"]:
+            sprints = sprints.filter(snapshots__isnull=True)
+
+        today = timezone.localdate()
+        written = 0
+        for sprint in sprints.iterator():
+            rows = self.build_rows(sprint, today)
+            with transaction.atomic():
+                SprintSnapshot.objects.filter(sprint=sprint).exclude(date__in=[row.date for row in rows]).delete()
+                SprintSnapshot.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["sprint", "date"],
+                    update_fields=list(SNAPSHOT_COUNTERS),
+                )
+            written += len(rows)
+            self.stdout.write(f"Sprint {sprint.pk}: {len(rows)} snapshots")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Done. Wrote {written} snapshots."))
+
+    @staticmethod
+    def build_rows(sprint, today):
+        """
+        One row per sprint day. Scope is the sprint's current tasks (history of
+        sprint moves is not recorded); a task counts as done from the day of
+        its completed_at, or its last update when completed_at is missing.
+        """
+        tasks = list(
+            Task.objects.filter(sprint=sprint, is_deleted=False).values("story_points", "status", "completed_at", "updated_at")
+        )
+        total_points = sum(task["story_points"] or 0 for task in tasks)
+        done_on = []
+        for task in tasks:
+            if task["status"] != DONE_STATUS:
+                continue
+            finished = task["completed_at"] or task["updated_at"]
+            done_on.append((timezone.localdate(finished), task["story_points"] or 0))
+
+        rows = []
+        day = sprint.start_date
+        end = min(sprint.end_date, today)
+        while day <= end:
+            finished = [points for done_day, points in done_on if done_day <= day]
+            rows.append(SprintSnapshot(
+                tenant_id=sprint.tenant_id,
+                sprint=sprint,
+                date=day,
+                total_points=total_points,
+                completed_points=sum(finished),
+                total_tasks=len(tasks),
+                completed_tasks=len(finished),
+            ))
+            day += timedelta(days=1)
+        return rows
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.api.v1.services.activity import (
+    ACTIVITY_CHECKPOINT_INTERVAL,
+    CHECKPOINT_BATCH_SIZE,
+    FEED_TARGET_TYPES,
+    ActivityHistoryService,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Snapshots objects with many activity entries since their last checkpoint, so "
+        "reconstructing their history replays a bounded number of diffs. Run periodically (e.g. hourly)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", action="append", choices=sorted(FEED_TARGET_TYPES),
+                            help="Only this target type (repeatable); default: all")
+        parser.add_argument("--interval", type=int, default=ACTIVITY_CHECKPOINT_INTERVAL,
+                            help="Checkpoint objects with at least this many entries since the last one")
+        parser.add_argument("--batch-size", type=int, default=CHECKPOINT_BATCH_SIZE, help="Objects per query")
+
+    def handle(self, *args, **options):
+        if options["interval"] < 1:
+            raise CommandError("--interval must be at least 1.")
+        total = 0
+        for target_type in options["type"] or FEED_TARGET_TYPES:
+            written = ActivityHistoryService.checkpoint(
+                FEED_TARGET_TYPES[target_type], interval=options["interval"], batch_size=options["batch_size"]
+            )
+            total += written
+            self.stdout.write(f"{target_type}: {written} checkpoints")
+        self.stdout.write(self.style.SUCCESS(f"✅ Done. Wrote {total} checkpoints."))
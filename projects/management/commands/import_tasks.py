@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from ninja.errors import HttpError
+
+from accounts.models import CustomUser
+from projects.api.v1.services.imports import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, TaskImportService
+from projects.models import Board
+
+
+class Command(BaseCommand):
+    help = "Bulk-imports tasks onto a board from a CSV, NDJSON or JSON array file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file")
+        parser.add_argument("--board", type=int, required=True, help="Target board id")
+        parser.add_argument("--user", required=True, help="Acting user (id or email), recorded as creator")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Input format (default: detect)")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Rows per transaction")
+
+    def handle(self, *args, **options):
+        try:
+            board = Board.objects.get(pk=options["board"])
+        except Board.DoesNotExist:
+            raise CommandError(f"Board {options['board']} does not exist.")
+        lookup = {"pk": options["user"]} if options["user"].isdigit() else {"email__iexact": options["user"]}
+        try:
+            user = CustomUser.objects.get(tenant_id=board.tenant_id, **lookup)
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"User {options['user']} not found in the board's tenant.")
+
+        try:
+            with open(options["path"], "rb") as stream:
+                records = TaskImportService.parse(stream, fmt=options["format"], name=options["path"])
+                result = TaskImportService.import_rows(board, user, records, chunk_size=options["chunk_size"])
+        except HttpError as e:
+            raise CommandError(str(e))
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {'; '.join(error['errors'])}")
+        if result["parse_error"]:
+            self.stderr.write(self.style.ERROR(f"Stopped reading input. {result['parse_error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Done. Imported {result['created']} tasks in {result['chunks']} chunks, {result['failed']} rows failed."
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from projects.api.v1.services.comments import CommentThreadService
+
+
+class Command(BaseCommand):
+    help = "Recomputes comment thread paths and depths from parent links"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--task", type=int, help="Only comments of this task id")
+
+    def handle(self, *args, **options):
+        changed = CommentThreadService.rebuild_paths(task_id=options["task"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Done. Updated {changed} comments."))
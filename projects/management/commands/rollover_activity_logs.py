@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.api.v1.services.activity import (
+    ACTIVITY_LOG_COMPACT_AFTER_DAYS,
+    ACTIVITY_LOG_HOT_DAYS,
+    ACTIVITY_LOG_RETENTION_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    ActivityArchiveService,
+    day_cutoff,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves aged activity log entries to the archive table, compacts old update diffs "
+        "and deletes archived entries past retention. Safe to run repeatedly (e.g. nightly)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hot-days", type=int, default=ACTIVITY_LOG_HOT_DAYS,
+                            help="Keep this many days in the hot table")
+        parser.add_argument("--compact-after-days", type=int, default=ACTIVITY_LOG_COMPACT_AFTER_DAYS,
+                            help="Compact archived update diffs older than this (0: never)")
+        parser.add_argument("--retention-days", type=int, default=ACTIVITY_LOG_RETENTION_DAYS,
+                            help="Delete archived entries older than this (0: keep forever)")
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Rows per transaction")
+
+    def handle(self, *args, **options):
+        hot_days, compact_days, retention_days = (
+            options["hot_days"], options["compact_after_days"], options["retention_days"]
+        )
+        if hot_days < 1:
+            raise CommandError("--hot-days must be at least 1.")
+        if retention_days and retention_days < hot_days:
+            raise CommandError("--retention-days must not be shorter than --hot-days.")
+        batch_size = options["batch_size"]
+
+        moved = ActivityArchiveService.rollover(day_cutoff(hot_days), batch_size=batch_size)
+        self.stdout.write(f"Archived {moved} entries older than {hot_days} days")
+
+        if compact_days:
+            stats = ActivityArchiveService.compact(day_cutoff(compact_days), batch_size=batch_size)
+            self.stdout.write(
+                f"Compacted {stats['scanned']} archived entries: {stats['merged']} merged away, "
+                f"{stats['deleted']} no-op updates removed"
+            )
+
+        if retention_days:
+            purged = ActivityArchiveService.purge(day_cutoff(retention_days), batch_size=batch_size)
+            self.stdout.write(f"Deleted {purged} archived entries older than {retention_days} days")
+
+        self.stdout.write(self.style.SUCCESS("✅ Done."))
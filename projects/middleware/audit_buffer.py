@@ -0,0 +1,14 @@
+from projects.api.v1.services.audit import audit_scope
+
+
+class AuditBufferMiddleware:
+    """
+    Batches the request's activity log entries: everything committed while
+    the request runs is written with one bulk_create when it finishes.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit_scope():
+            return self.get_response(request)
@@ -1,28 +1,95 @@
 from django.db import models
+from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import Group
 from accounts.models import CustomUser, Tenant
 
 # Create your models here.
 
+# --------------------------
+# Change tracking
+# --------------------------
+
+class TrackedFieldsMixin:
+    """
+    Keeps the column values an instance was loaded with (keyed by attname),
+    so projects.signals can diff a save in memory instead of re-reading the
+    row. `untracked_fields` are columns maintained outside save().
+    """
+    untracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.tracked_values()
+        return instance
+
+    @classmethod
+    def tracked_attnames(cls):
+        attnames = cls.__dict__.get("_tracked_attnames")
+        if attnames is None:
+            attnames = cls._tracked_attnames = tuple(
+                field.attname for field in cls._meta.concrete_fields
+                if field.name not in cls.untracked_fields
+            )
+        return attnames
+
+    def tracked_values(self, attnames=None):
+        """Current values of the tracked columns held in memory; deferred ones are skipped."""
+        values = self.__dict__
+        return {
+            attname: values[attname]
+            for attname in (self.tracked_attnames() if attnames is None else attnames)
+            if attname in values
+        }
+
+    def _reset_tracking(self, fields=None):
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None or fields is None:
+            self._loaded_values = self.tracked_values()
+            return
+        tracked = self.tracked_attnames()
+        attnames = {getattr(self._meta.get_field(name), "attname", name) for name in fields}
+        loaded.update(self.tracked_values([attname for attname in tracked if attname in attnames]))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._reset_tracking(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._reset_tracking(fields)
+
+
 # --------------------------
 # Permissions & Memberships
 # --------------------------
 
-class Project(models.Model):
+class Project(TrackedFieldsMixin, models.Model):
     tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='project')
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='created_projects')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)  # maintained by projects.signals
+
+    untracked_fields = ('search_vector',)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='project_search_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class ProjectMember(models.Model):
+class ProjectMember(TrackedFieldsMixin, models.Model):
     project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, related_name='project_member')
     user = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='project_member')
     role = models.ForeignKey(Group, on_delete=models.SET_NULL, null=True, related_name='project_member')
@@ -35,7 +102,7 @@ class ProjectMember(models.Model):
 # Boards, Sprints, Labels
 # --------------------------
 
-class Board(models.Model):
+class Board(TrackedFieldsMixin, models.Model):
     tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='board')
     project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, related_name='board')
     name = models.CharField(max_length=255)
@@ -46,7 +113,7 @@ class Board(models.Model):
         return self.name
 
 
-class Sprint(models.Model):
+class Sprint(TrackedFieldsMixin, models.Model):
     tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='sprint')
     project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, related_name='sprint')
     board = models.ForeignKey(Board, on_delete=models.SET_NULL, null=True, related_name='sprint')
@@ -66,7 +133,28 @@ class Sprint(models.Model):
         return self.name
 
 
-class Label(models.Model):
+class SprintSnapshot(models.Model):
+    """End-of-day sprint totals, folded in as tasks change (see sprint_analytics)."""
+    tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='sprint_snapshots')
+    sprint = models.ForeignKey(Sprint, on_delete=models.CASCADE, related_name='snapshots')
+    date = models.DateField()
+    total_points = models.IntegerField(default=0)
+    completed_points = models.IntegerField(default=0)
+    total_tasks = models.IntegerField(default=0)
+    completed_tasks = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['sprint', 'date'], name='unique_sprint_snapshot_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.sprint_id} @ {self.date}"
+
+
+class Label(TrackedFieldsMixin, models.Model):
     tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='label')
     project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, related_name='labels')
     name = models.CharField(max_length=50)
@@ -80,7 +168,7 @@ class Label(models.Model):
 # Tasks, Subtasks, Comments
 # --------------------------
 
-class Task(models.Model):
+class Task(TrackedFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('todo', 'To Do'),
         ('in_progress', 'In Progress'),
@@ -116,17 +204,36 @@ class Task(models.Model):
     due_date = models.DateField(null=True, blank=True)
     start_date = models.DateField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Totals of all descendants (see TaskHierarchyService); maintained by projects.signals
+    rollup = models.JSONField(null=True, blank=True, editable=False, encoder=DjangoJSONEncoder)
     created_by = models.ForeignKey(CustomUser, related_name='created_tasks', on_delete=models.SET_NULL, null=True)
     updated_by = models.ForeignKey(CustomUser, related_name='updated_tasks', on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_deleted = models.BooleanField(default=False)
+    search_vector = SearchVectorField(null=True, editable=False)  # maintained by projects.signals
+
+    untracked_fields = ('rollup', 'search_vector')
+
+    class Meta:
+        # Board listings filter on (tenant, board, is_deleted) and sort by -created_at;
+        # each filterable column gets its own prefix so combinations stay index-driven.
+        indexes = [
+            models.Index(fields=['tenant', 'board', 'is_deleted', 'created_at'], name='task_board_created_idx'),
+            models.Index(fields=['tenant', 'board', 'is_deleted', 'status', 'created_at'], name='task_board_status_idx'),
+            models.Index(fields=['tenant', 'board', 'is_deleted', 'assignee', 'created_at'], name='task_board_assignee_idx'),
+            models.Index(fields=['tenant', 'board', 'is_deleted', 'priority', 'created_at'], name='task_board_priority_idx'),
+            models.Index(fields=['tenant', 'board', 'is_deleted', 'sprint', 'created_at'], name='task_board_sprint_idx'),
+            models.Index(fields=['tenant', 'board', 'is_deleted', 'due_date'], name='task_board_due_idx'),
+            models.Index(fields=['parent', 'created_at'], name='task_parent_created_idx'),
+            GinIndex(fields=['search_vector'], name='task_search_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
 
-class Comment(models.Model):
+class Comment(TrackedFieldsMixin, models.Model):
     tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='comment')
     project = models.ForeignKey(Project, on_delete=models.SET_NULL, null=True, related_name='comments')
     task = models.ForeignKey(Task, on_delete=models.SET_NULL, null=True, related_name='comments')
@@ -136,6 +243,21 @@ class Comment(models.Model):
     is_edited = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     edited_at = models.DateTimeField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)  # maintained by projects.signals
+    # Materialized thread path: zero-padded ancestor ids down to this comment, e.g.
+    # "0000000042.0000000057". Sorting by path yields depth-first thread order.
+    path = models.CharField(max_length=1024, blank=True, default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    untracked_fields = ('search_vector', 'path', 'depth')
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='comment_search_idx'),
+            # Top-level pages are (task, depth=0) by created_at; replies are (task, path) ranges
+            models.Index(fields=['task', 'depth', 'created_at'], name='comment_task_depth_idx'),
+            models.Index(fields=['task', 'path'], name='comment_task_path_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.username} on {self.task.title}"
@@ -146,22 +268,84 @@ class Comment(models.Model):
 # --------------------------
 
 
-class ActivityLog(models.Model):
-    tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='activity_logs')
-    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, related_name='activity_logs')
-    actor = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='activity_logs')
+class ActivityLogBase(models.Model):
+    tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='+')
+    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, related_name='+')
+    actor = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='+')
     action = models.CharField(max_length=32)  # 'created', 'updated', 'deleted'
-    target_content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, null=True)
+    target_content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, null=True, related_name='+')
     target_object_id = models.PositiveIntegerField(null=True)
     target = GenericForeignKey('target_content_type', 'target_object_id')
     target_type = models.CharField(max_length=64)     # e.g., "Task", "Sprint"
     target_repr = models.CharField(max_length=255)    # str(instance) for display
-    changed_fields = models.JSONField(null=True, blank=True)   # {field: {'old': x, 'new': y}, ...}
-    created_at = models.DateTimeField(auto_now_add=True)
+    changed_fields = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)   # {field: {'old': x, 'new': y}, ...}
+    # Time of the change, set when the entry is built; entries are written later, in batches
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
+        abstract = True
         ordering = ['-created_at']
 
     def __str__(self):
         user = self.actor.username if self.actor else "system"
-        return f"{user} {self.action} {self.target_type} [{self.target_repr}] at {self.created_at:%Y-%m-%d %H:%M}"
\ No newline at end of file
+        return f"{user} {self.action} {self.target_type} [{self.target_repr}] at {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class ActivityLog(ActivityLogBase):
+    """Recent activity (hot). Entries older than ACTIVITY_LOG_HOT_DAYS move to ActivityLogArchive."""
+    tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='activity_logs')
+    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, related_name='activity_logs')
+    actor = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='activity_logs')
+    target_content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, null=True)
+
+    class Meta(ActivityLogBase.Meta):
+        indexes = [
+            models.Index(fields=['tenant', 'project', 'created_at'], name='activity_project_idx'),
+            # Per-actor and per-target feeds walk these in created_at order
+            models.Index(fields=['project', 'actor', 'created_at'], name='activity_actor_idx'),
+            models.Index(fields=['target_content_type', 'target_object_id', 'created_at'], name='activity_target_idx'),
+            # Unfiltered -created_at listings (admin) and the rollover scan
+            models.Index(fields=['created_at'], name='activity_created_idx'),
+        ]
+
+
+class ActivityLogArchive(ActivityLogBase):
+    """
+    Aged activity (cold), moved here by `rollover_activity_logs` with the
+    original ids. Append-only apart from compaction, so created_at follows
+    insertion order and a BRIN index covers time ranges at a fraction of
+    the size of a btree.
+    """
+    # Number of original "updated" entries folded into this one by compaction
+    merged_count = models.PositiveIntegerField(default=1)
+    compacted = models.BooleanField(default=False)
+
+    class Meta(ActivityLogBase.Meta):
+        indexes = [
+            BrinIndex(fields=['created_at'], name='activity_archive_created_brin'),
+            models.Index(fields=['tenant', 'project', 'created_at'], name='activity_archive_project_idx'),
+            models.Index(fields=['target_content_type', 'target_object_id', 'created_at'], name='activity_archive_target_idx'),
+        ]
+
+
+class ActivityCheckpoint(models.Model):
+    """
+    Tracked column values of an object at `taken_at`, written by
+    `checkpoint_activity`. History reconstruction replays diffs back from
+    the nearest later checkpoint instead of from the current row.
+    """
+    tenant = models.ForeignKey(Tenant, on_delete=models.SET_NULL, null=True, related_name='activity_checkpoints')
+    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, related_name='activity_checkpoints')
+    target_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    target_object_id = models.PositiveIntegerField()
+    state = models.JSONField(encoder=DjangoJSONEncoder)  # {attname: value}, as stored in changed_fields
+    taken_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-taken_at']
+        indexes = [
+            models.Index(fields=['target_content_type', 'target_object_id', 'taken_at'], name='activity_checkpoint_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.target_content_type_id}:{self.target_object_id} @ {self.taken_at:%Y-%m-%d %H:%M}"
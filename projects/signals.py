@@ -1,10 +1,18 @@
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
+from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
 
 from accounts.middleware.current_user import get_current_user
 from projects.models import Project, Board, Sprint, Task, Label, Comment, ProjectMember, ActivityLog
 from accounts.models import CustomUser
+from projects.api.v1.utils.permissions import invalidate_permission_snapshots, invalidate_project_resolution
+from projects.api.v1.services.search import refresh_search_vectors, search_source_fields
+from projects.api.v1.utils.versioning import bump_version_on_commit
+from projects.api.v1.services import audit
+from projects.api.v1.services.comments import CommentThreadService
+from projects.api.v1.services.hierarchy import TaskHierarchyService, ROLLUP_SOURCE_FIELDS
+from projects.api.v1.services.sprint_analytics import task_state, record_task_changes, SNAPSHOT_STATE_FIELDS
 
 # List the models you want to log
 TRACKED_MODELS = [Project, Board, Sprint, Task, Label, Comment, ProjectMember]
@@ -27,20 +35,24 @@ def get_actor(instance):
     return user or getattr(instance, 'updated_by', None) or getattr(instance, 'created_by', None) or getattr(instance,
                                                                                                     'user', None)
 
-def get_project(instance):
-    """Get related project if available."""
-    return getattr(instance, 'project', None)
-
-def get_tenant(instance):
-    """Get related tenant if available."""
-    return getattr(instance, 'tenant', None)
-
 def collect_field_values(instance):
-    """Returns {field_name: value, ...} for all concrete fields."""
-    data = {}
-    for field in instance._meta.fields:
-        data[field.name] = getattr(instance, field.name, None)
-    return data
+    """Returns {attname: value, ...} for the tracked fields held in memory (FKs as ids)."""
+    return instance.tracked_values()
+
+def load_old_data(sender, instance):
+    """
+    Column values `instance` was loaded with, from its in-memory snapshot.
+    Only fields the snapshot lacks (deferred, or an instance that was never
+    loaded) are read from the database, in one narrow query.
+    """
+    old_data = dict(getattr(instance, "_loaded_values", None) or {})
+    missing = [attname for attname in collect_field_values(instance) if attname not in old_data]
+    if missing:
+        row = sender.objects.filter(pk=instance.pk).values(*missing).first()
+        if row is None:
+            return {}
+        old_data.update(row)
+    return old_data
 
 def get_changed_fields(old_data, new_data):
     """Return a dict of fields that changed."""
@@ -52,11 +64,13 @@ def get_changed_fields(old_data, new_data):
             changes[key] = {"old": old_data[key], "new": new_data[key]}
     return changes
 
-def log_activity(instance, action, changes=None):
-    ActivityLog.objects.create(
-        tenant=get_tenant(instance),
-        project=get_project(instance),
-        actor=get_actor(instance),
+def build_activity_log(instance, action, changes=None, actor=None):
+    """Unsaved ActivityLog for `instance`, for callers that write logs in bulk."""
+    return ActivityLog(
+        tenant_id=getattr(instance, 'tenant_id', None),
+        # A project's own entries belong to its feed too
+        project_id=instance.pk if isinstance(instance, Project) else getattr(instance, 'project_id', None),
+        actor=actor or get_actor(instance),
         action=action,
         target_content_type=ContentType.objects.get_for_model(instance),
         target_object_id=instance.pk,
@@ -65,34 +79,212 @@ def log_activity(instance, action, changes=None):
         changed_fields=changes or None,
     )
 
+def build_import_log(board, tasks, actor=None):
+    """Unsaved summary ActivityLog for tasks bulk-imported onto `board`."""
+    task_ids = [task.pk for task in tasks]
+    return build_activity_log(
+        board,
+        "imported",
+        changes={"task_ids": {"old": None, "new": task_ids}, "task_count": {"old": None, "new": len(task_ids)}},
+        actor=actor,
+    )
+
+def log_activity(instance, action, changes=None):
+    # Written in a batch once the transaction commits (see services.audit)
+    audit.record(build_activity_log(instance, action, changes=changes))
+
 # Pre-save: store old data for update checks
-for model in TRACKED_MODELS:
-    @receiver(pre_save, sender=model)
-    def _store_old_data(sender, instance, **kwargs):
-        if instance.pk:
-            try:
-                old = sender.objects.get(pk=instance.pk)
-                instance._old_data = collect_field_values(old)
-            except sender.DoesNotExist:
-                instance._old_data = {}
-        else:
-            instance._old_data = {}
+def _store_old_data(sender, instance, **kwargs):
+    instance._old_data = load_old_data(sender, instance) if instance.pk else {}
 
 # Post-save: log create/update
-for model in TRACKED_MODELS:
-    @receiver(post_save, sender=model)
-    def _log_save(sender, instance, created, **kwargs):
-        if created:
-            log_activity(instance, "created")
-        else:
-            old_data = getattr(instance, "_old_data", {}) or {}
-            new_data = collect_field_values(instance)
-            changes = get_changed_fields(old_data, new_data)
-            if changes:  # only log if something actually changed
-                log_activity(instance, "updated", changes=changes)
+def _log_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        log_activity(instance, "created")
+    else:
+        old_data = getattr(instance, "_old_data", {}) or {}
+        new_data = collect_field_values(instance)
+        if update_fields is not None:
+            # Only these columns were written
+            saved = {instance._meta.get_field(name).attname for name in update_fields}
+            new_data = {attname: value for attname, value in new_data.items() if attname in saved}
+        changes = get_changed_fields(old_data, new_data)
+        if changes:  # only log if something actually changed
+            log_activity(instance, "updated", changes=changes)
 
 # Post-delete: log delete
+def _log_delete(sender, instance, **kwargs):
+    # The final values, so the object's history can still be reconstructed
+    changes = {attname: {"old": value, "new": None} for attname, value in collect_field_values(instance).items()}
+    log_activity(instance, "deleted", changes=changes)
+
 for model in TRACKED_MODELS:
-    @receiver(post_delete, sender=model)
-    def _log_delete(sender, instance, **kwargs):
-        log_activity(instance, "deleted")
\ No newline at end of file
+    pre_save.connect(_store_old_data, sender=model)
+    post_save.connect(_log_save, sender=model)
+    post_delete.connect(_log_delete, sender=model)
+
+# --------------------------
+# Permission snapshot invalidation
+# --------------------------
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def _invalidate_member_permissions(sender, instance, **kwargs):
+    pairs = [(instance.user_id, instance.project_id)]
+    old_data = getattr(instance, "_old_data", None) or {}
+    if old_data:
+        pairs.append((old_data.get("user_id"), old_data.get("project_id")))
+    invalidate_permission_snapshots(*pairs)
+
+def _invalidate_role_permissions(group_ids):
+    pairs = ProjectMember.objects.filter(role_id__in=group_ids).values_list("user_id", "project_id")
+    invalidate_permission_snapshots(*pairs)
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def _role_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        group_ids = [instance.pk]
+    elif pk_set:
+        group_ids = list(pk_set)
+    else:
+        # Permission.group_set.clear(): collect the groups before they are detached
+        group_ids = list(instance.group_set.values_list("pk", flat=True))
+    _invalidate_role_permissions(group_ids)
+
+@receiver(pre_delete, sender=Group)
+def _role_deleted(sender, instance, **kwargs):
+    _invalidate_role_permissions([instance.pk])
+
+
+# --------------------------
+# Project resolution index invalidation
+# --------------------------
+
+@receiver(post_save, sender=Board)
+@receiver(post_save, sender=Sprint)
+@receiver(post_save, sender=Task)
+def _invalidate_resolution_on_save(sender, instance, created, **kwargs):
+    # New rows are resolved lazily; updates may have re-parented the object
+    if not created:
+        invalidate_project_resolution(sender, instance.pk)
+
+@receiver(post_delete, sender=Board)
+@receiver(post_delete, sender=Sprint)
+@receiver(post_delete, sender=Task)
+def _invalidate_resolution_on_delete(sender, instance, **kwargs):
+    invalidate_project_resolution(sender, instance.pk)
+
+
+# --------------------------
+# Full-text search vectors
+# --------------------------
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Comment)
+def _refresh_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    # Saves that cannot have touched the indexed text skip the extra UPDATE
+    if update_fields is not None and not set(update_fields) & search_source_fields(sender):
+        return
+    refresh_search_vectors(sender, [instance.pk])
+
+
+# --------------------------
+# Cache version stamps
+# --------------------------
+# Bumped after commit, so a read racing the write cannot cache old rows under the new stamp
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Sprint)
+@receiver(post_delete, sender=Sprint)
+def _bump_board_version(sender, instance, **kwargs):
+    bump_version_on_commit("board", instance.board_id)
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def _bump_board_version_on_board(sender, instance, **kwargs):
+    bump_version_on_commit("board", instance.pk)
+    # Board listings are versioned per project
+    bump_version_on_commit("project", instance.project_id)
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def _bump_board_version_on_task_labels(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        bump_version_on_commit("board", instance.board_id)
+    else:
+        bump_version_on_commit("project", instance.project_id)
+
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+def _bump_project_version_on_label(sender, instance, **kwargs):
+    bump_version_on_commit("project", instance.project_id)
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def _bump_project_version(sender, instance, **kwargs):
+    bump_version_on_commit("project", instance.pk)
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def _bump_comments_version(sender, instance, **kwargs):
+    bump_version_on_commit("comments", instance.task_id)
+
+
+# --------------------------
+# Task derived data: sprint snapshots and hierarchy rollups
+# --------------------------
+
+TASK_STATE_FIELDS = tuple(dict.fromkeys(SNAPSHOT_STATE_FIELDS + ROLLUP_SOURCE_FIELDS))
+
+@receiver(pre_save, sender=Task)
+def _capture_task_state(sender, instance, **kwargs):
+    # Runs after _store_old_data, whose snapshot normally has every field needed
+    instance._task_state = None
+    if instance.pk:
+        old_data = getattr(instance, "_old_data", None) or {}
+        if all(field in old_data for field in TASK_STATE_FIELDS):
+            instance._task_state = {field: old_data[field] for field in TASK_STATE_FIELDS}
+        else:
+            instance._task_state = sender.objects.filter(pk=instance.pk).values(*TASK_STATE_FIELDS).first()
+
+@receiver(post_save, sender=Task)
+def _record_sprint_change(sender, instance, created, **kwargs):
+    old_state = getattr(instance, "_task_state", None)
+    old_state = {field: old_state[field] for field in SNAPSHOT_STATE_FIELDS} if old_state else None
+    record_task_changes([(old_state, task_state(instance))])
+
+@receiver(post_save, sender=Task)
+def _refresh_parent_rollups(sender, instance, created, **kwargs):
+    old_state = getattr(instance, "_task_state", None) or {}
+    if not created and all(old_state.get(field) == getattr(instance, field) for field in ROLLUP_SOURCE_FIELDS):
+        return
+    TaskHierarchyService.refresh_rollups([old_state.get("parent_id"), instance.parent_id])
+
+@receiver(post_delete, sender=Task)
+def _record_sprint_removal(sender, instance, **kwargs):
+    record_task_changes([(task_state(instance), None)])
+
+@receiver(post_delete, sender=Task)
+def _refresh_rollups_on_delete(sender, instance, **kwargs):
+    TaskHierarchyService.refresh_rollups([instance.parent_id])
+
+
+# --------------------------
+# Comment thread paths
+# --------------------------
+
+@receiver(post_save, sender=Comment)
+def _assign_comment_path(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or {"parent", "parent_id"} & set(update_fields):
+        CommentThreadService.assign_path(instance)
+
+@receiver(post_delete, sender=Comment)
+def _reroot_comment_replies(sender, instance, **kwargs):
+    # Replies of a deleted comment lose their parent (SET_NULL) and become thread roots
+    if instance.task_id and instance.path:
+        CommentThreadService.rebuild_paths(task_id=instance.task_id, under=instance.path)
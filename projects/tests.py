@@ -1,3 +1,1095 @@
+import csv
+import gzip
+import json
+import time
+from datetime import date, datetime, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+import jwt
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ninja import Schema
+
+from accounts.api.v1.utils.response import api_response
+from accounts.middleware.current_user import clear_current_user, get_current_user, set_current_user
+from accounts.models import CustomUser, Tenant
+from projects.api.v1.schemas.projects import BoardOut, TaskFilterIn, TaskOut
+from projects.api.v1.services import audit
+from projects.api.v1.services.activity import (
+    ActivityArchiveService, ActivityFeedService, ActivityHistoryService, merge_changes,
+)
+from projects.api.v1.services.boards import BoardSnapshotService
+from projects.api.v1.services.comments import MAX_COMMENT_DEPTH
+from projects.api.v1.services.export import TaskExportService
+from projects.api.v1.services.hierarchy import TaskHierarchyService
+from projects.api.v1.services.imports import TaskImportService
+from projects.api.v1.services.sprint_analytics import SprintAnalyticsService
+from projects.api.v1.services.tasks import TaskBulkService
+from projects.api.v1.utils.counting import count_queryset
+from projects.api.v1.utils.eager_loading import build_eager_load_plan
+from projects.api.v1.utils.fast_read import ValuesPlan, build_values_plan, paginate_schema
+from projects.api.v1.utils.fieldsets import subset_schema
+from projects.api.v1.utils.filters import apply_task_filters
+from projects.api.v1.utils.permissions import (
+    get_permission_snapshot, permission_snapshots, project_resolution, resolve_project,
+)
+from projects.api.v1.utils.versioning import get_version
+from projects.models import (
+    ActivityCheckpoint, ActivityLog, ActivityLogArchive, Board, Comment, Label, Project, ProjectMember, Sprint,
+    SprintSnapshot, Task,
+)
+from projects.signals import build_activity_log
+
+API = "/projects/api/v1"
+
+
+class ProjectsAPITestCase(TestCase):
+    """A tenant with one member (all project permissions), one project and one board."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = Tenant.objects.create(name="Acme", slug="acme")
+        cls.user = CustomUser.objects.create_user("dev@acme.test", "dev", "pw", tenant=cls.tenant)
+        cls.role = Group.objects.create(name="developer")
+        cls.role.permissions.set(Permission.objects.filter(content_type__app_label="projects"))
+        cls.project = Project.objects.create(tenant=cls.tenant, name="Apollo", created_by=cls.user)
+        ProjectMember.objects.create(project=cls.project, user=cls.user, role=cls.role)
+        cls.board = Board.objects.create(tenant=cls.tenant, project=cls.project, name="Main", created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        # Rolled-back test data sends no invalidation signals; drop what this process kept
+        permission_snapshots.clear_local()
+        project_resolution.clear_local()
+        self.login(self.user)
+
+    def login(self, user):
+        token = jwt.encode({"user_id": user.id, "type": "access"}, settings.SECRET_KEY, algorithm="HS256")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+    def make_sprint(self, start_date, end_date, **fields):
+        fields.setdefault("name", "Sprint 1")
+        fields.setdefault("status", "active")
+        return Sprint.objects.create(
+            tenant=self.tenant, project=self.project, board=self.board,
+            start_date=start_date, end_date=end_date, **fields
+        )
+
+    def make_task(self, **fields):
+        fields.setdefault("title", "Task")
+        return Task.objects.create(
+            tenant=self.tenant, project=self.project, board=self.board, created_by=self.user, **fields
+        )
+
+
+class PermissionSnapshotTests(ProjectsAPITestCase):
+    def test_warm_snapshot_costs_no_queries(self):
+        snapshot = get_permission_snapshot(self.user.pk, self.project.pk)
+        self.assertIn("view_task", snapshot)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_permission_snapshot(self.user.pk, self.project.pk), snapshot)
+        self.assertIsNone(get_permission_snapshot(self.user.pk, self.project.pk + 1))
+
+    def test_role_and_membership_changes_invalidate_the_snapshot(self):
+        url = f"{API}/project/board/{self.board.pk}/task/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.role.permissions.remove(Permission.objects.get(codename="view_task"))
+        cache.clear()  # the response cache, not the snapshot, must not hide the change
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.role.permissions.add(Permission.objects.get(codename="view_task"))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        ProjectMember.objects.filter(project=self.project, user=self.user).delete()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+class SearchTests(ProjectsAPITestCase):
+    def test_unknown_kind_is_rejected(self):
+        response = self.client.get(f"{API}/search/", {"q": "launch", "kind": "bogus"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_backfill_makes_existing_rows_searchable(self):
+        task = self.make_task(title="Launch checklist")
+        Task.objects.filter(pk=task.pk).update(search_vector=None)
+        self.assertEqual(self.client.get(f"{API}/search/", {"q": "launch"}).json()["data"], [])
+
+        call_command("backfill_search_vectors", kind=["task"], batch_size=1, stdout=StringIO())
+
+        hits = self.client.get(f"{API}/search/", {"q": "launch", "kind": "task"}).json()["data"]
+        self.assertEqual([hit["id"] for hit in hits], [task.pk])
+
+    def test_kinds_are_limited_to_projects_granting_their_view_permission(self):
+        visible = self.make_task(title="Launch checklist")
+        viewer = Group.objects.create(name="viewer")
+        viewer.permissions.set(Permission.objects.filter(codename__in=["view_project", "view_comment"]))
+        other = Project.objects.create(tenant=self.tenant, name="Launch pad", created_by=self.user)
+        ProjectMember.objects.create(project=other, user=self.user, role=viewer)
+        other_board = Board.objects.create(tenant=self.tenant, project=other, name="Pad", created_by=self.user)
+        Task.objects.create(
+            tenant=self.tenant, project=other, board=other_board, created_by=self.user, title="Launch sequence"
+        )
+
+        hits = self.client.get(f"{API}/search/", {"q": "launch"}).json()["data"]
+        self.assertEqual(
+            sorted((hit["kind"], hit["id"]) for hit in hits), [("project", other.pk), ("task", visible.pk)]
+        )
+
+
+class CommentThreadTests(ProjectsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_task()
+
+    def comment(self, parent=None):
+        return Comment.objects.create(
+            tenant=self.tenant, project=self.project, task=self.task, user=self.user, content="Hi", parent=parent
+        )
+
+    def test_reply_counts_without_previews(self):
+        root = self.comment()
+        first = self.comment(parent=root)
+        self.comment(parent=first)
+
+        thread = self.client.get(f"{API}/project/task/{self.task.pk}/comment/threads/", {"replies": 0}).json()["data"][0]
+        self.assertEqual((thread["reply_count"], thread["replies"]), (2, []))
+
+        replies = self.client.get(
+            f"{API}/project/task/{self.task.pk}/comment/{root.pk}/replies/", {"cursor": thread["replies_cursor"]}
+        ).json()["data"]
+        self.assertEqual(len(replies), 2)
+
+    def test_delete_reroots_only_the_deleted_subtree(self):
+        other = self.comment()
+        other_reply = self.comment(parent=other)
+        root = self.comment()
+        reply = self.comment(parent=root)
+        nested = self.comment(parent=reply)
+
+        root.delete()
+
+        reply.refresh_from_db()
+        nested.refresh_from_db()
+        self.assertEqual((reply.path, reply.depth), (f"{reply.pk:010d}", 0))
+        self.assertEqual((nested.path, nested.depth), (f"{reply.pk:010d}.{nested.pk:010d}", 1))
+        other_reply.refresh_from_db()
+        self.assertEqual(other_reply.path, f"{other.pk:010d}.{other_reply.pk:010d}")
+
+    def test_nesting_stops_where_the_path_column_does(self):
+        chain = [self.comment()]
+        for _ in range(MAX_COMMENT_DEPTH):
+            chain.append(self.comment(parent=chain[-1]))
+        self.assertEqual(chain[-1].depth, MAX_COMMENT_DEPTH)
+        url = f"{API}/project/task/{self.task.pk}/comment/"
+
+        self.assertEqual(self.client.post(url, {"parent_id": chain[-1].pk}, content_type="application/json").status_code, 400)
+        self.assertEqual(self.client.post(url, {"parent_id": chain[-2].pk}, content_type="application/json").status_code, 200)
+
+        root = self.comment()
+        self.comment(parent=root)
+        response = self.client.patch(f"{url}{root.pk}/", {"parent_id": chain[-2].pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        root.refresh_from_db()
+        self.assertIsNone(root.parent_id)
+
+
+class TaskHierarchyTests(ProjectsAPITestCase):
+    def patch_parent(self, task, parent_id):
+        return self.client.patch(
+            f"{API}/project/board/{self.board.pk}/task/{task.pk}/",
+            {"title": task.title, "parent_id": parent_id},
+            content_type="application/json",
+        )
+
+    def test_task_cannot_become_its_own_ancestor(self):
+        epic = self.make_task(title="Epic")
+        story = self.make_task(title="Story", parent=epic)
+        subtask = self.make_task(title="Subtask", parent=story)
+
+        self.assertEqual(self.patch_parent(epic, epic.pk).status_code, 400)
+        self.assertEqual(self.patch_parent(epic, subtask.pk).status_code, 400)
+        epic.refresh_from_db()
+        self.assertIsNone(epic.parent_id)
+
+        response = self.client.get(f"{API}/project/board/{self.board.pk}/task/{epic.pk}/subtree/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["rollup"]["task_count"], 2)
+
+    def test_bulk_patch_rejects_cycles_across_the_batch(self):
+        first, second = self.make_task(title="First"), self.make_task(title="Second")
+        response = self.client.patch(
+            f"{API}/project/board/{self.board.pk}/task/bulk/",
+            {"tasks": [{"id": first.pk, "parent_id": second.pk}, {"id": second.pk, "parent_id": first.pk}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.filter(pk__in=[first.pk, second.pk], parent__isnull=False).exists())
+
+    def test_rollup_refresh_bumps_the_board_after_commit(self):
+        epic = self.make_task(title="Epic")
+        Task.objects.filter(pk=self.make_task(title="Story", parent=epic).pk).update(status="done")
+        before = get_version("board", self.board.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskHierarchyService.refresh_rollups([epic.pk])
+            self.assertEqual(get_version("board", self.board.pk), before)
+        self.assertNotEqual(get_version("board", self.board.pk), before)
+        epic.refresh_from_db()
+        self.assertEqual(epic.rollup["status_counts"], {"done": 1})
+
+
+class TaskBulkTests(ProjectsAPITestCase):
+    def bulk(self, method, tasks):
+        return getattr(self.client, method)(
+            f"{API}/project/board/{self.board.pk}/task/bulk/", {"tasks": tasks}, content_type="application/json"
+        )
+
+    def test_unknown_references_are_rejected_before_writing(self):
+        task = self.make_task()
+        self.assertEqual(self.bulk("patch", [{"id": task.pk, "assignee_id": 99999}]).status_code, 400)
+        self.assertEqual(self.bulk("patch", [{"id": task.pk, "parent_id": 99999}]).status_code, 400)
+        self.assertEqual(self.bulk("post", [{"title": "New", "assignee_id": 99999}]).status_code, 400)
+        task.refresh_from_db()
+        self.assertIsNone(task.assignee_id)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_labels_must_belong_to_the_board_project(self):
+        other = Project.objects.create(tenant=self.tenant, name="Gemini", created_by=self.user)
+        foreign = Label.objects.create(tenant=self.tenant, project=other, name="Bug", color="#f00")
+        response = self.bulk("post", [{"title": "New", "label_ids": [foreign.pk]}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.exists())
+
+
+class ProjectResolutionTests(ProjectsAPITestCase):
+    def test_board_snapshot_warms_task_and_sprint_resolution(self):
+        task = self.make_task()
+        sprint = self.make_sprint(date(2026, 1, 5), date(2026, 1, 19))
+        self.assertEqual(self.client.get(f"{API}/project/board/{self.board.pk}/snapshot/").status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_project(Task, task.pk), (self.project.pk, self.tenant.pk))
+            self.assertEqual(resolve_project(Sprint, sprint.pk), (self.project.pk, self.tenant.pk))
+
+
+class TaskFilterTests(ProjectsAPITestCase):
+    def test_labels_all_matches_tasks_carrying_every_label(self):
+        bug = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        ui = Label.objects.create(tenant=self.tenant, project=self.project, name="UI", color="#00f")
+        both, only_bug = self.make_task(title="Both"), self.make_task(title="Bug only")
+        both.labels.set([bug, ui])
+        only_bug.labels.set([bug])
+        other_board = Board.objects.create(tenant=self.tenant, project=self.project, name="Other", created_by=self.user)
+        Task.objects.create(
+            tenant=self.tenant, project=self.project, board=other_board, created_by=self.user, title="Elsewhere"
+        ).labels.set([bug, ui])
+
+        filters = TaskFilterIn(labels_all=[bug.pk, ui.pk])
+        tasks = apply_task_filters(Task.objects.filter(board=self.board), filters)
+        self.assertEqual(list(tasks.values_list("id", flat=True)), [both.pk])
+        self.assertNotIn("HAVING", str(tasks.query))
+
+        response = self.client.get(f"{API}/project/board/{self.board.pk}/task/", {"labels_all": [bug.pk, ui.pk]})
+        self.assertEqual([task["id"] for task in response.json()["data"]], [both.pk])
+
+
+class PaginationTests(ProjectsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f"{API}/project/board/{self.board.pk}/task/"
+
+    def test_cursor_pages_round_trip(self):
+        tasks = [self.make_task(title=f"Task {n}") for n in range(5)]
+        # Tied created_at values fall back to the id tie-breaker
+        Task.objects.filter(pk__in=[task.pk for task in tasks[1:4]]).update(created_at=tasks[1].created_at)
+        expected = list(Task.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+
+        seen, metas, params = [], [], {"pagination": "cursor", "limit": 2}
+        while True:
+            body = self.client.get(self.url, params).json()
+            seen.extend(task["id"] for task in body["data"])
+            metas.append(body["meta"])
+            if not body["meta"]["next_cursor"]:
+                break
+            params = {"pagination": "cursor", "limit": 2, "cursor": body["meta"]["next_cursor"]}
+        self.assertEqual(seen, expected)
+        self.assertIsNone(metas[0]["prev_cursor"])
+
+        back = self.client.get(self.url, {"limit": 2, "cursor": metas[-1]["prev_cursor"]}).json()
+        self.assertEqual([task["id"] for task in back["data"]], expected[2:4])
+
+    def test_tampered_cursor_is_rejected(self):
+        self.make_task()
+        self.make_task()
+        cursor = self.client.get(self.url, {"pagination": "cursor", "limit": 1}).json()["meta"]["next_cursor"]
+        tampered = cursor[:-2] + ("AA" if not cursor.endswith("AA") else "BB")
+        self.assertEqual(self.client.get(self.url, {"cursor": tampered}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"cursor": "not-a-cursor"}).status_code, 400)
+
+
+class CountStrategyTests(ProjectsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for n in range(3):
+            self.make_task(title=f"Task {n}")
+        self.tasks = Task.objects.filter(board=self.board)
+
+    def test_exact_and_estimate(self):
+        self.assertEqual(count_queryset(self.tasks, "exact"), (3, True))
+        estimate, is_exact = count_queryset(self.tasks, "estimate")
+        self.assertIsInstance(estimate, int)
+        self.assertFalse(is_exact)
+
+        meta = self.client.get(
+            f"{API}/project/board/{self.board.pk}/task/", {"count": "estimate", "limit": 2}
+        ).json()["meta"]
+        # Whatever the planner guessed, the probe row still finds the second page
+        self.assertEqual((meta["total_count_exact"], meta["next_page"]), (False, 2))
+
+    def test_cached_count_is_served_stale_then_refreshed(self):
+        self.assertEqual(count_queryset(self.tasks, "cached"), (3, True))
+        self.make_task(title="Task 3")
+        with self.assertNumQueries(0):
+            self.assertEqual(count_queryset(self.tasks, "cached"), (3, False))
+
+        counting = "projects.api.v1.utils.counting"
+        later = mock.Mock(time=mock.Mock(return_value=time.time() + 3600))
+        with mock.patch(f"{counting}.time", later), \
+                mock.patch(f"{counting}.threading.Thread", _InlineThread), \
+                mock.patch(f"{counting}.connections"):
+            self.assertEqual(count_queryset(self.tasks, "cached"), (3, False))
+        self.assertEqual(count_queryset(self.tasks, "cached"), (4, False))
+
+
+class FieldsetTests(ProjectsAPITestCase):
+    def test_fields_limit_the_payload_and_the_columns_read(self):
+        task = self.make_task(title="Only this", description="Not this")
+        url = f"{API}/project/board/{self.board.pk}/task/"
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(url, {"fields": "title,status"}).json()["data"]
+        self.assertEqual(data, [{"id": task.pk, "title": "Only this", "status": "todo"}])
+        task_selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT") and '"projects_task"."title"' in q["sql"]]
+        self.assertTrue(task_selects)
+        self.assertFalse(any('"projects_task"."description"' in sql for sql in task_selects))
+
+        detail = self.client.get(f"{url}{task.pk}/", {"fields": "title"}).json()["data"]
+        self.assertEqual(detail, {"id": task.pk, "title": "Only this"})
+
+    def test_projection_drops_unneeded_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"{API}/project/{self.project.pk}/board/")
+        self.assertTrue(any('JOIN "accounts_customuser"' in q["sql"] for q in queries))
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(f"{API}/project/{self.project.pk}/board/", {"fields": "name"}).json()["data"]
+        self.assertEqual(data, [{"id": self.board.pk, "name": "Main"}])
+        self.assertFalse(any('JOIN "accounts_customuser"' in q["sql"] for q in queries))
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(f"{API}/project/board/{self.board.pk}/task/", {"fields": "title,secret"})
+        self.assertEqual(response.status_code, 400)
+
+
+class EagerLoadingTests(ProjectsAPITestCase):
+    def queries_for(self, url):
+        self.setUp()  # cold caches for every measurement
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_list_queries_do_not_grow_with_the_page(self):
+        label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        tasks_url = f"{API}/project/board/{self.board.pk}/task/"
+        boards_url = f"{API}/project/{self.project.pk}/board/"
+        self.make_task(assignee=self.user).labels.set([label])
+        small = self.queries_for(tasks_url), self.queries_for(boards_url)
+
+        for n in range(5):
+            self.make_task(title=f"Task {n}", assignee=self.user).labels.set([label])
+            Board.objects.create(tenant=self.tenant, project=self.project, name=f"Board {n}", created_by=self.user)
+        self.assertEqual((self.queries_for(tasks_url), self.queries_for(boards_url)), small)
+
+    def test_plan_follows_the_schema(self):
+        plan = build_eager_load_plan(BoardOut, Board)
+        self.assertIn("created_by", plan.select_related)
+        plan = build_eager_load_plan(TaskOut, Task)
+        self.assertIn("labels", [getattr(p, "prefetch_to", p) for p in plan.prefetch_related])
+
+
+class RenderingTests(ProjectsAPITestCase):
+    def test_rendering_validated_models_costs_no_queries(self):
+        label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        for n in range(3):
+            self.make_task(title=f"Task {n}", assignee=self.user).labels.set([label])
+        tasks = build_eager_load_plan(TaskOut, Task).apply(Task.objects.filter(board=self.board))
+        data = [TaskOut.model_validate(task) for task in tasks]
+        with self.assertNumQueries(0):
+            body = json.loads(api_response(data=data).content)
+        self.assertEqual([task["label_ids"] for task in body["data"]], [[label.pk]] * 3)
+
+
+class BoardSnapshotTests(ProjectsAPITestCase):
+    def test_columns_totals_and_cards(self):
+        label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        for points in (1, 2, 3):
+            self.make_task(story_points=points).labels.set([label])
+        self.make_task(status="done", story_points=5)
+        self.make_task(is_deleted=True, story_points=8)
+
+        with self.assertNumQueries(5):
+            snapshot = BoardSnapshotService.build(self.board, per_column=2)
+        todo, done = snapshot["columns"]["todo"], snapshot["columns"]["done"]
+        self.assertEqual((todo["count"], todo["story_points"], todo["has_more"]), (3, 6, True))
+        self.assertEqual([card["story_points"] for card in todo["tasks"]], [3, 2])
+        self.assertEqual(todo["tasks"][0]["label_ids"], [label.pk])
+        self.assertEqual((done["count"], done["story_points"], done["has_more"]), (1, 5, False))
+        self.assertEqual(snapshot["labels"][0]["name"], "Bug")
+
+    def test_cached_snapshot_turns_over_with_board_and_project_writes(self):
+        url = f"{API}/project/board/{self.board.pk}/snapshot/"
+        task = self.make_task()
+        label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        self.assertEqual(self.client.get(url).json()["data"]["columns"]["todo"]["count"], 1)
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.status = "done"
+            task.save()
+        columns = self.client.get(url).json()["data"]["columns"]
+        self.assertEqual((columns["todo"]["count"], columns["done"]["count"]), (0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            label.name = "Defect"
+            label.save()
+        self.assertEqual(self.client.get(url).json()["data"]["labels"][0]["name"], "Defect")
+
+
+class FastReadTests(ProjectsAPITestCase):
+    def assertSameJSONOnBothPaths(self, url, params=None):
+        with mock.patch("projects.api.v1.utils.fast_read.ValuesPlan.shape", autospec=True) as shape:
+            orm = self.client.get(url, params or {}).json()
+        shape.assert_not_called()
+        cache.clear()
+        with mock.patch("projects.api.v1.utils.fast_read.FAST_READ_VALUES", True), mock.patch(
+            "projects.api.v1.utils.fast_read.ValuesPlan.shape", autospec=True, side_effect=ValuesPlan.shape
+        ) as shape:
+            values = self.client.get(url, params or {}).json()
+        shape.assert_called_once()
+        self.assertTrue(orm["data"])
+        self.assertEqual(values, orm)
+
+    def test_values_path_builds_no_model_instances(self):
+        self.make_task(assignee=self.user)
+        schema = subset_schema(TaskOut, frozenset({"id", "title", "assignee_id", "created_at"}))
+        with mock.patch.object(Task, "from_db", wraps=Task.from_db) as from_db:
+            _, data, _ = paginate_schema(Task.objects.filter(board=self.board), schema, values=True)
+        from_db.assert_not_called()
+        self.assertEqual(data[0].assignee_id, self.user.pk)
+
+    def test_schemas_needing_instances_stay_on_the_orm_path(self):
+        class ShoutedTask(Schema):
+            id: int
+            title: str
+
+            @staticmethod
+            def resolve_title(obj):
+                return obj.title.upper()
+
+        self.make_task(title="quiet")
+        self.assertIsNone(build_values_plan(ShoutedTask, Task))
+        _, data, _ = paginate_schema(Task.objects.filter(board=self.board), ShoutedTask, values=True)
+        self.assertEqual(data[0].title, "QUIET")
+
+    def test_values_path_matches_the_schema_path(self):
+        self.make_sprint(date(2026, 1, 5), date(2026, 1, 19))
+        self.make_task(title="Assigned", assignee=self.user, story_points=3)
+        self.make_task(title="Unassigned")
+
+        self.assertSameJSONOnBothPaths(f"{API}/project/{self.project.pk}/board/")
+        self.assertSameJSONOnBothPaths(f"{API}/project/board/{self.board.pk}/sprints/")
+        self.assertSameJSONOnBothPaths(
+            f"{API}/project/board/{self.board.pk}/task/",
+            {"fields": "id,title,status,assignee_id,story_points,sprint_id,created_at"},
+        )
+
+
+class ConditionalGetTests(ProjectsAPITestCase):
+    def test_get_board(self):
+        url = f"{API}/project/{self.project.pk}/board/{self.board.pk}/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE="Wed, 21 Oct 2015 07:28:00 GMT").status_code, 200)
+
+    def test_versions_are_bumped_only_on_commit(self):
+        before = get_version("board", self.board.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_task()
+            # A read racing the open transaction still sees the old stamp
+            self.assertEqual(get_version("board", self.board.pk), before)
+        self.assertNotEqual(get_version("board", self.board.pk), before)
+
+    def test_board_list_is_scoped_to_the_project(self):
+        other = Project.objects.create(tenant=self.tenant, name="Gemini", created_by=self.user)
+        Board.objects.create(tenant=self.tenant, project=other, name="Elsewhere", created_by=self.user)
+        boards = self.client.get(f"{API}/project/{self.project.pk}/board/").json()["data"]
+        self.assertEqual([board["id"] for board in boards], [self.board.pk])
+
+    def test_burndown_turns_over_at_midnight(self):
+        today = date.today()
+        sprint = self.make_sprint(today - timedelta(days=3), today + timedelta(days=3))
+        url = f"{API}/project/board/{self.board.pk}/sprints/{sprint.pk}/burndown/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch("django.utils.timezone.localdate", return_value=today + timedelta(days=1)):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SprintAnalyticsTests(ProjectsAPITestCase):
+    def chart(self, sprint, kind):
+        return self.client.get(f"{API}/project/board/{self.board.pk}/sprints/{sprint.pk}/{kind}/").json()["data"]
+
+    def test_task_writes_fold_into_todays_snapshot(self):
+        today = timezone.localdate()
+        sprint = self.make_sprint(today - timedelta(days=2), today + timedelta(days=5))
+        task = self.make_task(sprint=sprint, story_points=3)
+        self.make_task(sprint=sprint, story_points=5)
+        self.make_task(story_points=13)  # backlog
+        task.status = "done"
+        task.save()
+
+        snapshot = SprintSnapshot.objects.get(sprint=sprint, date=today)
+        self.assertEqual(
+            (snapshot.total_points, snapshot.completed_points, snapshot.total_tasks, snapshot.completed_tasks),
+            (8, 3, 2, 1),
+        )
+        burndown = self.chart(sprint, "burndown")
+        self.assertEqual(len(burndown["points"]), 3)
+        self.assertEqual((burndown["committed_points"], burndown["points"][-1]["remaining_points"]), (8, 5))
+
+    def test_burnup_after_backfill(self):
+        today = timezone.localdate()
+        sprint = self.make_sprint(today - timedelta(days=3), today + timedelta(days=3))
+        early, late = self.make_task(sprint=sprint, story_points=2), self.make_task(sprint=sprint, story_points=3)
+        self.make_task(sprint=sprint, story_points=5)
+        for task, day in ((early, today - timedelta(days=2)), (late, today)):
+            completed_at = timezone.make_aware(datetime.combine(day, datetime.min.time()).replace(hour=12))
+            Task.objects.filter(pk=task.pk).update(status="done", completed_at=completed_at)
+        SprintSnapshot.objects.filter(sprint=sprint).delete()
+
+        call_command("backfill_sprint_snapshots", sprint=[sprint.pk], stdout=StringIO())
+
+        burnup = self.chart(sprint, "burnup")
+        self.assertEqual(burnup["committed_points"], 10)
+        self.assertEqual([point["completed_points"] for point in burnup["points"]], [0, 2, 2, 5])
+        self.assertEqual({point["total_points"] for point in burnup["points"]}, {10})
+
+        Sprint.objects.filter(pk=sprint.pk).update(status="closed")
+        velocity = SprintAnalyticsService.velocity(self.board.pk)
+        self.assertEqual(velocity["sprints"][0]["completed_points"], 5)
+        self.assertEqual(velocity["average_velocity"], 5)
+
+
+class TaskExportTests(ProjectsAPITestCase):
+    def export(self, **params):
+        response = self.client.get(f"{API}/project/{self.project.pk}/export/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def setUp(self):
+        super().setUp()
+        self.label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        self.task = self.make_task(title="=SUM(A1:A9)", assignee=self.user, story_points=3)
+        self.task.labels.set([self.label])
+        self.make_task(title="Gone", is_deleted=True)
+
+    def test_ndjson_rows_nest_related_objects(self):
+        response, body = self.export()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        [row] = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual((row["id"], row["title"], row["story_points"]), (self.task.pk, "=SUM(A1:A9)", 3))
+        self.assertEqual(row["assignee"]["email"], self.user.email)
+        self.assertEqual(row["labels"], [{"id": self.label.pk, "name": "Bug", "color": "#f00"}])
+        self.assertEqual(row["board"], {"id": self.board.pk, "name": "Main"})
+
+    def test_gzipped_csv_guards_formulas(self):
+        response, body = self.export(format="csv", gzip="true")
+        self.assertIn("attachment", response["Content-Disposition"])
+        [row] = list(csv.DictReader(StringIO(gzip.decompress(body).decode())))
+        self.assertEqual(row["title"], "'=SUM(A1:A9)")
+        self.assertEqual((row["assignee_email"], row["label_names"]), (self.user.email, "Bug"))
+
+    def test_small_chunks_still_yield_every_row_with_its_labels(self):
+        others = [self.make_task(title=f"Task {n}") for n in range(2)]
+        rows = list(TaskExportService.rows(TaskExportService.queryset(self.project.pk, self.tenant), chunk_size=1))
+        self.assertEqual([row["id"] for row in rows], [self.task.pk] + [task.pk for task in others])
+        self.assertEqual([len(row["labels"]) for row in rows], [1, 0, 0])
+
+
+class TaskImportTests(ProjectsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.target = Board.objects.create(tenant=self.tenant, project=self.project, name="Copy", created_by=self.user)
+
+    def import_file(self, name, content):
+        upload = SimpleUploadedFile(name, content)
+        response = self.client.post(f"{API}/project/board/{self.target.pk}/task/import/", {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_export_then_import_round_trip(self):
+        label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        fields = ("title", "description", "status", "priority", "task_type", "story_points", "due_date", "assignee_id")
+        original = self.make_task(
+            title="=SUM(A1:A9)", description="Line one\nline two, with comma", status="in_progress",
+            priority="high", story_points=5, due_date=date(2026, 3, 1), assignee=self.user,
+        )
+        original.labels.set([label])
+        expected = (*(getattr(original, field) for field in fields), [label.pk])
+
+        for fmt in ("ndjson", "csv"):
+            export = self.client.get(f"{API}/project/{self.project.pk}/export/", {"format": fmt})
+            body = b"".join(export.streaming_content)
+            result = self.import_file(f"tasks.{fmt}", body)
+            self.assertEqual((result["created"], result["failed"]), (1, 0), result["errors"])
+
+            copy = Task.objects.get(pk=result["task_ids"][0])
+            self.assertEqual(copy.board_id, self.target.pk)
+            self.assertEqual((*(getattr(copy, field) for field in fields), [l.pk for l in copy.labels.all()]), expected)
+            copy.delete()
+
+    def test_bad_rows_are_reported_and_the_rest_imported_in_chunks(self):
+        rows = [
+            {"title": "Fine"},
+            {"description": "No title"},
+            {"title": "Unknown label", "label_names": ["Nope"]},
+            {"title": "Also fine", "assignee_email": self.user.email.upper()},
+        ]
+        content = "\n".join(json.dumps(row) for row in rows).encode()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = TaskImportService.import_rows(
+                self.target, self.user, TaskImportService.parse(BytesIO(content), fmt="ndjson"), chunk_size=2
+            )
+        self.assertEqual((result["created"], result["failed"], result["chunks"]), (2, 2, 2))
+        self.assertEqual([error["row"] for error in result["errors"]], [2, 3])
+        self.assertEqual(Task.objects.get(title="Also fine").assignee_id, self.user.pk)
+        # One summary entry per chunk instead of one per task
+        self.assertEqual(ActivityLog.objects.filter(target_type="Board", action="imported").count(), 2)
+        self.assertFalse(ActivityLog.objects.filter(target_type="Task", action="created").exists())
+
+
+class ActivityLogTests(ProjectsAPITestCase):
+    def updates(self, instance):
+        return list(
+            ActivityLog.objects.filter(target_object_id=instance.pk, target_type=type(instance).__name__, action="updated")
+            .values_list("changed_fields", flat=True)
+        )
+
+    def test_foreign_key_changes_are_logged_as_ids(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = self.make_task()
+            task.assignee = self.user
+            task.save()
+        [changes] = self.updates(task)
+        self.assertEqual(changes["assignee_id"], {"old": None, "new": self.user.pk})
+        self.assertNotIn("assignee", changes)
+
+    def test_update_fields_logs_only_the_written_columns(self):
+        task = self.make_task(title="Draft")
+        task = Task.objects.get(pk=task.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.title = "Final"
+            task.status = "done"  # changed in memory, not written
+            task.save(update_fields=["title"])
+        self.assertEqual(self.updates(task), [{"title": {"old": "Draft", "new": "Final"}}])
+
+    def test_rolled_back_saves_write_no_log(self):
+        task = self.make_task(title="Draft")
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                task.title = "Final"
+                task.save()
+                raise RuntimeError
+        self.assertEqual(self.updates(task), [])
+
+    def test_audit_scope_writes_entries_together_on_exit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with audit.audit_scope():
+                label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+                label.name = "Defect"
+                label.save()
+                self.assertFalse(ActivityLog.objects.filter(target_type="Label").exists())
+        self.assertEqual(ActivityLog.objects.filter(target_type="Label").count(), 2)
+
+    def test_bulk_update_logs_each_changed_task(self):
+        first, second = self.make_task(title="First"), self.make_task(title="Second")
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskBulkService.update_tasks(self.board, self.user, {first.pk: {"status": "done"}, second.pk: {"status": "todo"}})
+        self.assertEqual(self.updates(first), [{"status": {"old": "todo", "new": "done"}}])
+        self.assertEqual(self.updates(second), [])
+
+    def test_bulk_update_logs_label_only_changes(self):
+        task = self.make_task()
+        label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskBulkService.update_tasks(self.board, self.user, {task.pk: {"label_ids": [label.pk]}})
+        self.assertEqual(self.updates(task), [{"label_ids": {"old": [], "new": [label.pk]}}])
+
+    def test_rolled_back_savepoints_drop_only_their_entries(self):
+        task = self.make_task(title="Draft")
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                task.title = "Kept"
+                task.save()
+                with self.assertRaises(RuntimeError), transaction.atomic():
+                    task.status = "done"
+                    task.save()
+                    raise RuntimeError
+        [changes] = self.updates(task)
+        self.assertEqual(changes["title"], {"old": "Draft", "new": "Kept"})
+        self.assertNotIn("status", changes)
+
+    def test_scope_writes_one_insert_for_many_entries(self):
+        tasks = [self.make_task(title=f"Task {n}") for n in range(3)]
+        with CaptureQueriesContext(connection) as queries:
+            with audit.audit_scope(), self.captureOnCommitCallbacks(execute=True):
+                for task in tasks:
+                    task.status = "done"
+                    task.save()
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "projects_activitylog"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(sum(len(self.updates(task)) for task in tasks), 3)
+
+    def test_full_async_queue_falls_back_to_a_direct_write(self):
+        writer = audit.AuditWriter(maxsize=1)
+        task = self.make_task()
+
+        def entry():
+            return build_activity_log(task, "updated", changes={"title": {"old": "a", "new": "b"}})
+
+        with mock.patch.object(audit, "AUDIT_LOG_ASYNC", True), mock.patch.object(audit, "audit_writer", writer), \
+                mock.patch.object(audit.threading, "Thread") as thread:
+            audit.flush([entry()])  # queued for the (stubbed) writer thread
+            audit.flush([entry()])  # queue full: written by the caller
+        thread.return_value.start.assert_called_once()
+        self.assertEqual(writer.queue.qsize(), 1)
+        self.assertEqual(len(self.updates(task)), 1)
+
+    def test_write_failures_are_logged_not_raised(self):
+        task = self.make_task()
+        with mock.patch.object(ActivityLog.objects, "bulk_create", side_effect=DatabaseError("down")), \
+                self.assertLogs("api", level="ERROR"):
+            audit.write_entries([build_activity_log(task, "updated")])
+
+    def test_merge_changes_drops_net_zero_fields(self):
+        merged = merge_changes([
+            {"title": {"old": "a", "new": "b"}, "status": {"old": "todo", "new": "done"}},
+            {"title": {"old": "b", "new": "c"}, "status": {"old": "done", "new": "todo"}},
+        ])
+        self.assertEqual(merged, {"title": {"old": "a", "new": "c"}})
+        self.assertIsNone(merge_changes([{"title": "c"}]))
+
+    def test_compaction_merges_runs_of_updates(self):
+        day = timezone.now() - timedelta(days=400)
+        common = dict(
+            tenant=self.tenant, project=self.project, actor=self.user, target_type="Task",
+            target_content_type_id=None, target_object_id=1, target_repr="t",
+        )
+        ActivityLogArchive.objects.bulk_create([
+            ActivityLogArchive(action="updated", changed_fields={"title": {"old": "a", "new": "b"}}, created_at=day, **common),
+            ActivityLogArchive(action="updated", changed_fields={"title": {"old": "b", "new": "c"}},
+                               created_at=day + timedelta(minutes=1), **common),
+        ])
+        stats = ActivityArchiveService.compact(timezone.now())
+        self.assertEqual(stats["merged"], 1)
+        entry = ActivityLogArchive.objects.get()
+        self.assertEqual((entry.changed_fields, entry.merged_count), ({"title": {"old": "a", "new": "c"}}, 2))
+
+
+class ActivityLifecycleTests(ProjectsAPITestCase):
+    def entry(self, model, days_ago, action="updated", changes=None, actor=None, target_id=1, **fields):
+        return model.objects.create(
+            tenant=self.tenant, project=self.project, actor=actor or self.user, action=action,
+            target_type="Task", target_object_id=target_id, target_repr="t", changed_fields=changes,
+            created_at=timezone.now() - timedelta(days=days_ago), **fields
+        )
+
+    def rollover(self, **options):
+        options = {"hot_days": 90, "compact_after_days": 0, "retention_days": 0, "batch_size": 1, **options}
+        call_command("rollover_activity_logs", stdout=StringIO(), **options)
+
+    def test_rollover_moves_aged_entries_with_their_ids(self):
+        recent = self.entry(ActivityLog, 10)
+        aged = [self.entry(ActivityLog, 100), self.entry(ActivityLog, 200)]
+        feed_version = get_version("activity", self.project.pk)
+
+        self.rollover()
+
+        self.assertEqual(list(ActivityLog.objects.values_list("id", flat=True)), [recent.pk])
+        self.assertEqual(
+            sorted(ActivityLogArchive.objects.values_list("id", flat=True)), sorted(entry.pk for entry in aged)
+        )
+        self.assertNotEqual(get_version("activity", self.project.pk), feed_version)
+
+    def test_compaction_merges_only_unbroken_runs(self):
+        other = CustomUser.objects.create_user("ops@acme.test", "ops", "pw", tenant=self.tenant)
+
+        def change(old, new):
+            return {"status": {"old": old, "new": new}}
+
+        run = [
+            self.entry(ActivityLogArchive, 400, changes=change("todo", "in_progress")),
+            self.entry(ActivityLogArchive, 400, changes=change("in_progress", "done")),
+        ]
+        by_other = self.entry(ActivityLogArchive, 400, changes=change("done", "todo"), actor=other)
+        net_zero = [
+            self.entry(ActivityLogArchive, 400, changes=change("todo", "done"), target_id=2),
+            self.entry(ActivityLogArchive, 400, changes=change("done", "todo"), target_id=2),
+        ]
+        recent = self.entry(ActivityLogArchive, 10, changes=change("todo", "done"), target_id=3)
+
+        self.rollover(compact_after_days=365)
+
+        remaining = dict(ActivityLogArchive.objects.values_list("id", "changed_fields"))
+        self.assertEqual(set(remaining), {run[1].pk, by_other.pk, recent.pk})
+        self.assertEqual(remaining[run[1].pk], change("todo", "done"))
+        self.assertEqual(ActivityLogArchive.objects.get(pk=run[1].pk).merged_count, 2)
+        self.assertFalse(ActivityLogArchive.objects.filter(pk__in=[e.pk for e in net_zero]).exists())
+        self.assertFalse(ActivityLogArchive.objects.get(pk=recent.pk).compacted)
+
+    def test_retention_purges_archived_entries_and_their_checkpoints(self):
+        self.entry(ActivityLogArchive, 800)
+        kept = self.entry(ActivityLogArchive, 100)
+        content_type = ContentType.objects.get_for_model(Task)
+        for days_ago in (800, 100):
+            ActivityCheckpoint.objects.create(
+                tenant=self.tenant, project=self.project, target_content_type=content_type, target_object_id=1,
+                state={}, taken_at=timezone.now() - timedelta(days=days_ago),
+            )
+
+        self.rollover(retention_days=730)
+
+        self.assertEqual(list(ActivityLogArchive.objects.values_list("id", flat=True)), [kept.pk])
+        self.assertEqual(ActivityCheckpoint.objects.count(), 1)
+
+    def test_retention_shorter_than_the_hot_window_is_rejected(self):
+        with self.assertRaises(CommandError):
+            self.rollover(retention_days=30)
+
+
+class ActivityFeedTests(ProjectsAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f"{API}/project/{self.project.pk}/activity/"
+        self.other = CustomUser.objects.create_user("ops@acme.test", "ops", "pw", tenant=self.tenant)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task = self.make_task(title="Write docs")
+            self.label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+            self.task.status = "done"
+            self.task.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            set_current_user(self.other)
+            try:
+                self.gone = self.make_task(title="Scratch")
+                self.gone.delete()
+            finally:
+                clear_current_user()
+
+    def feed(self, url=None, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_walk_newest_first(self):
+        expected = list(ActivityLog.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        seen, params = [], {"limit": 2}
+        while True:
+            body = self.feed(**params)
+            seen.extend(entry["id"] for entry in body["data"])
+            if not body["meta"]["next_cursor"]:
+                break
+            params = {"limit": 2, "cursor": body["meta"]["next_cursor"]}
+        self.assertEqual(seen, expected)
+
+    def test_filters_and_target_descriptions(self):
+        by_other = self.feed(f"{self.url}user/{self.other.pk}/")["data"]
+        self.assertEqual({entry["action"] for entry in by_other}, {"created", "deleted"})
+        self.assertTrue(all(entry["actor"]["id"] == self.other.pk for entry in by_other))
+
+        on_task = self.feed(f"{self.url}task/{self.task.pk}/")["data"]
+        self.assertEqual([entry["action"] for entry in on_task], ["updated", "created"])
+        self.assertEqual(on_task[0]["target"]["repr"], "Write docs")
+        self.assertEqual(on_task[0]["target"]["board_id"], self.board.pk)
+
+        deleted = self.feed(action="deleted")["data"]
+        self.assertEqual([entry["target"]["exists"] for entry in deleted], [False])
+        self.assertEqual(deleted[0]["target"]["repr"], "Scratch")
+
+        self.assertEqual(self.client.get(self.url, {"target_type": "task"}).status_code, 400)
+
+    def test_targets_load_once_per_content_type(self):
+        rows = list(ActivityFeedService.queryset(self.project.pk, self.tenant).select_related("actor"))
+        ContentType.objects.get_for_models(Task, Label)  # warm the content type cache
+        with self.assertNumQueries(2):  # tasks, labels
+            targets = ActivityFeedService.resolve_targets(rows)
+        self.assertEqual(len(targets), len(rows))
+
+
+class HistoryReconstructionTests(ProjectsAPITestCase):
+    def reconstruct(self, target_type, pk, at):
+        return ActivityHistoryService.reconstruct(target_type, pk, at, self.project.pk)
+
+    def test_task_before_and_after_an_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = self.make_task(title="Draft")
+        before_create = task.created_at - timedelta(seconds=1)
+        created = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            task.title = "Final"
+            task.save()
+        updated = timezone.now()
+
+        self.assertFalse(self.reconstruct("task", task.pk, before_create)["exists"])
+        self.assertEqual(self.reconstruct("task", task.pk, created)["state"]["title"], "Draft")
+        self.assertEqual(self.reconstruct("task", task.pk, updated)["state"]["title"], "Final")
+
+    def test_hard_deleted_label(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            label = Label.objects.create(tenant=self.tenant, project=self.project, name="Bug", color="#f00")
+        label_id = label.pk
+        alive = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            label.delete()
+
+        state = self.reconstruct("label", label_id, alive)
+        self.assertTrue(state["exists"])
+        self.assertEqual(state["state"]["name"], "Bug")
+        self.assertFalse(self.reconstruct("label", label_id, timezone.now())["exists"])
+
+    def retitle(self, task, *titles):
+        """Saves each title in its own transaction; returns the time after each save."""
+        times = []
+        for title in titles:
+            with self.captureOnCommitCallbacks(execute=True):
+                task.title = title
+                task.save()
+            times.append(timezone.now())
+        return times
+
+    def test_replay_starts_from_the_next_checkpoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = self.make_task(title="v0")
+        first, second, third = self.retitle(task, "v1", "v2", "v3")
+
+        out = StringIO()
+        call_command("checkpoint_activity", type=["task"], interval=2, stdout=out)
+        self.assertIn("task: 1 checkpoints", out.getvalue())
+        checkpoint = ActivityCheckpoint.objects.get()
+        self.assertEqual((checkpoint.target_object_id, checkpoint.state["title"]), (task.pk, "v3"))
+        self.retitle(task, "v4")
+
+        state = self.reconstruct("task", task.pk, first)
+        self.assertEqual((state["source"], state["replayed"]), ("checkpoint", 2))
+        self.assertEqual(state["state"]["title"], "v1")
+        self.assertEqual(self.reconstruct("task", task.pk, second)["state"]["title"], "v2")
+
+        state = self.reconstruct("task", task.pk, timezone.now())
+        self.assertEqual((state["source"], state["replayed"], state["state"]["title"]), ("current", 0, "v4"))
+
+    def test_only_objects_with_enough_new_entries_are_checkpointed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            busy, quiet = self.make_task(title="busy"), self.make_task(title="quiet")
+        self.retitle(busy, "a", "b")
+
+        self.assertEqual(list(ActivityHistoryService.due(Task, interval=3)), [busy.pk])
+        call_command("checkpoint_activity", type=["task"], interval=3, stdout=StringIO())
+        self.assertEqual(list(ActivityHistoryService.due(Task, interval=3)), [])
+        self.assertFalse(ActivityCheckpoint.objects.filter(target_object_id=quiet.pk).exists())
+
+        with self.assertRaises(CommandError):
+            call_command("checkpoint_activity", interval=0, stdout=StringIO())
+
+    def test_history_endpoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = self.make_task(title="v0")
+        (first,) = self.retitle(task, "v1")
+        self.retitle(task, "v2")
+
+        url = f"{API}/project/{self.project.pk}/history/task/{task.pk}/"
+        response = self.client.get(url, {"at": first.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual((data["exists"], data["state"]["title"], data["replayed"]), (True, "v1", 1))
+
+        self.assertEqual(self.client.get(url.replace("/task/", "/sprint/"), {"at": first.isoformat()}).status_code, 404)
+
+
+class _InlineThread:
+    """threading.Thread stand-in that runs the target when started."""
+
+    def __init__(self, target, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+class ResponseCacheTests(ProjectsAPITestCase):
+    def test_writes_turn_over_cached_responses(self):
+        url = f"{API}/project/{self.project.pk}/board/"
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.board.name = "Renamed"
+            self.board.save()
+        response = self.client.get(url)
+        self.assertEqual((response["X-Cache"], response.json()["data"][0]["name"]), ("MISS", "Renamed"))
+
+    def test_entries_are_shared_only_by_callers_with_the_same_permissions(self):
+        url = f"{API}/project/{self.project.pk}/board/"
+        viewer = Group.objects.create(name="viewer")
+        viewer.permissions.set(Permission.objects.filter(codename__in=["view_project", "view_board"]))
+        peer = CustomUser.objects.create_user("peer@acme.test", "peer", "pw", tenant=self.tenant)
+        guest = CustomUser.objects.create_user("guest@acme.test", "guest", "pw", tenant=self.tenant)
+        ProjectMember.objects.create(project=self.project, user=peer, role=self.role)
+        ProjectMember.objects.create(project=self.project, user=guest, role=viewer)
+
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        self.login(peer)
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        self.login(guest)
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+
+    def test_stale_entry_is_refreshed_with_a_detached_request(self):
+        url = f"{API}/project/{self.project.pk}/board/"
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        Board.objects.filter(pk=self.board.pk).update(name="Renamed")  # no signal, no version bump
+
+        seen_users = []
+        view = "projects.api.v1.utils.response_cache"
+        later = mock.Mock(time=mock.Mock(return_value=time.time() + 3600))
+        with mock.patch(f"{view}.time", later), \
+                mock.patch(f"{view}.threading.Thread", _InlineThread), \
+                mock.patch(f"{view}.close_old_connections"), \
+                mock.patch(f"{view}.connections") as connections, \
+                mock.patch(f"{view}.set_current_user", side_effect=seen_users.append):
+            stale = self.client.get(url)
+            fresh = self.client.get(url)
 
-# Create your tests here.
+        self.assertEqual((stale["X-Cache"], stale.json()["data"][0]["name"]), ("STALE", "Main"))
+        self.assertEqual((fresh["X-Cache"], fresh.json()["data"][0]["name"]), ("HIT", "Renamed"))
+        self.assertEqual(seen_users, [self.user])
+        connections.close_all.assert_called_once()
+        self.assertIsNone(get_current_user())